@@ -0,0 +1,159 @@
+"""
+Compare aggregating the joined rows for every dashboard view with the materialized cubes.
+
+The cubes are first checked against aggregating the joined rows directly,
+and incremental builds are checked to write the same extracts as full
+rebuilds when the latest season changes, an earlier season changes, a
+season is added and a season is removed. Then, on the scraped data and on
+synthetic joined data at several scales, a full build is timed against an
+incremental build after a change to the latest season, and a dashboard
+refresh that reads the joined CSV and aggregates every view is timed
+against reading the extracts. Run from the repository root:
+
+    python -m benchmarks.benchmark_aggregate_cubes
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import best_time, quiet
+from benchmarks.synthetic_data import write_synthetic_joined
+from src.data_preperation.aggregate_cubes import (
+    CUBES,
+    DIMENSIONS,
+    MEASURES,
+    base_cube,
+    build_cubes,
+)
+
+JOINED_PATH = "data/premier_league_championship_joined.csv"
+
+
+def aggregate_rows(df, dimensions):
+    """
+    Aggregate a view straight from the joined rows, as each dashboard view does.
+    """
+    grouped = df.groupby(dimensions, dropna=False, sort=True)
+    cube = grouped[MEASURES].sum(min_count=1)
+    cube.insert(0, "Players", grouped.size())
+    cube = cube.reset_index()
+    cube["Goals per Player (PL)"] = cube["Goals (PL)"] / cube["Players"]
+    cube["Goal Conversion"] = (cube["Goals (PL)"] / cube["Goals (Champ.)"]).where(
+        cube["Goals (Champ.)"] > 0
+    )
+    return cube
+
+
+def per_view(df):
+    return {name: aggregate_rows(df, dimensions) for name, dimensions in CUBES.items()}
+
+
+def read_extracts(output_dir):
+    extracts = {}
+    for name in CUBES:
+        with open(os.path.join(output_dir, f"{name}.csv")) as file:
+            extracts[name] = file.read()
+    return extracts
+
+
+def change_latest_season(df):
+    df = df.copy()
+    latest = df["Season Start (PL)"] == df["Season Start (PL)"].max()
+    df.loc[latest, "Goals (PL)"] += 1
+    return df
+
+
+def check_against_rows(df, output_dir):
+    cubes = quiet(build_cubes, df, output_dir=output_dir, incremental=False)
+    for name, expected in per_view(df).items():
+        pd.testing.assert_frame_equal(cubes[name], expected, check_dtype=False)
+    base = base_cube(df)
+    expected = aggregate_rows(df, DIMENSIONS)[base.columns]
+    pd.testing.assert_frame_equal(base, expected)
+
+
+def check_incremental(df, output_dir):
+    incremental_dir = os.path.join(output_dir, "incremental")
+    full_dir = os.path.join(output_dir, "full")
+    quiet(build_cubes, df, output_dir=incremental_dir)
+
+    seasons = df["Season Start (PL)"]
+    middle = seasons == seasons.median().round()
+    latest = df[seasons == seasons.max()]
+    changed_middle = df.copy()
+    changed_middle.loc[middle, "Assists (PL)"] += 2
+    added = pd.concat(
+        [df, latest.assign(**{"Season Start (PL)": seasons.max() + 1})],
+        ignore_index=True,
+    )
+    versions = {
+        "latest season changed": change_latest_season(df),
+        "earlier season changed": changed_middle,
+        "season added": added,
+        "season removed": df[~middle],
+        "unchanged": df[~middle],
+    }
+    for label, version in versions.items():
+        quiet(build_cubes, version, output_dir=incremental_dir)
+        quiet(build_cubes, version, output_dir=full_dir, incremental=False)
+        assert read_extracts(incremental_dir) == read_extracts(full_dir), label
+
+
+def benchmark(label, joined_path):
+    df = pd.read_csv(joined_path)
+    print(f"{label}: {len(df)} joined rows")
+    changed = change_latest_season(df)
+    with tempfile.TemporaryDirectory() as output_dir:
+        full_seconds, _ = best_time(
+            lambda: quiet(build_cubes, df, output_dir=output_dir, incremental=False)
+        )
+
+        def update():
+            build_cubes(df, output_dir=output_dir, incremental=False)
+            start = time.perf_counter()
+            build_cubes(changed, output_dir=output_dir)
+            return time.perf_counter() - start
+
+        incremental_seconds = min(quiet(update) for _ in range(3))
+
+        # A dashboard refresh, from the joined rows or from the extracts
+        rows_seconds, _ = best_time(lambda: per_view(pd.read_csv(joined_path)))
+        extracts_seconds, _ = best_time(
+            lambda: {
+                name: pd.read_csv(os.path.join(output_dir, f"{name}.csv"))
+                for name in CUBES
+            }
+        )
+
+    print(f"  full build                    {full_seconds:8.3f} s")
+    print(
+        f"  latest season changed         {incremental_seconds:8.3f} s "
+        f"({full_seconds / incremental_seconds:4.1f}x faster)"
+    )
+    print(f"  refresh from the joined rows  {rows_seconds:8.3f} s")
+    print(
+        f"  refresh from the extracts     {extracts_seconds:8.3f} s "
+        f"({rows_seconds / extracts_seconds:4.1f}x faster)"
+    )
+
+
+def main():
+    df = pd.read_csv(JOINED_PATH)
+    with tempfile.TemporaryDirectory() as output_dir:
+        check_against_rows(df, output_dir)
+        check_incremental(df, output_dir)
+    print("Cubes match the rows and incremental builds match full rebuilds")
+
+    benchmark("Scraped data", JOINED_PATH)
+    for scale in [10, 100]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "joined.csv")
+            write_synthetic_joined(scale, file_path)
+            benchmark(f"Synthetic {scale}x", file_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Compare a per-replicate bootstrap loop with the batched bootstrap of the conversion analysis.
+
+The point estimates are checked against `np.polyfit` and the ratios of the
+column sums. The batched replicates are checked against statistics
+computed one resample at a time from the same row indexes, and are checked
+to be the same for any number of workers. Then, on the scraped data and on
+synthetic joined data, a loop like the notebooks', resampling the rows with
+pandas and fitting each replicate, is timed on a few replicates and
+extrapolated to 100,000, next to the batched bootstrap of 100,000 replicates
+on one and four workers. Run from the repository root:
+
+    python -m benchmarks.benchmark_bootstrap
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import write_synthetic_joined
+from src.analysis.bootstrap import (
+    GROUPS,
+    bootstrap_replicates,
+    conversion_summary,
+)
+
+JOINED_PATH = "data/premier_league_championship_joined.csv"
+REPLICATES = 100_000
+
+
+def resample_statistics(df):
+    """
+    The statistics of one resample, computed directly from its rows.
+    """
+    statistics = {}
+    for group, value in GROUPS.items():
+        rows = df if value is None else df[df["same_team"] == value]
+        slope, intercept = np.polyfit(rows["Goals (Champ.)"], rows["Goals (PL)"], 1)
+        with_assists = rows[rows["Assists (Champ.)"].notna()]
+        statistics["Goal Conversion", group] = (
+            rows["Goals (PL)"].sum() / rows["Goals (Champ.)"].sum()
+        )
+        statistics["Assist Conversion", group] = (
+            with_assists["Assists (PL)"].sum() / with_assists["Assists (Champ.)"].sum()
+        )
+        statistics["Slope", group] = slope
+        statistics["Intercept", group] = intercept
+        statistics["R-squared", group] = (
+            np.corrcoef(rows["Goals (Champ.)"], rows["Goals (PL)"])[0, 1] ** 2
+        )
+    for statistic in ["Goal Conversion", "Assist Conversion", "Slope"]:
+        statistics[statistic, "Difference"] = (
+            statistics[statistic, "With Promoted Team"]
+            - statistics[statistic, "Without Promoted Team"]
+        )
+    return statistics
+
+
+def loop_bootstrap(df, replicates, seed=0):
+    """
+    Resample the rows with pandas and compute each replicate's statistics in turn.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        [
+            resample_statistics(df.sample(n=len(df), replace=True, random_state=rng))
+            for _ in range(replicates)
+        ]
+    )
+
+
+def check(df):
+    summary = conversion_summary(df, replicates=1_000).set_index(["Statistic", "Group"])
+    expected = pd.Series(resample_statistics(df))
+    np.testing.assert_allclose(
+        summary["Estimate"].loc[expected.index], expected, rtol=1e-9
+    )
+    inside = (summary["Lower"] <= summary["Estimate"]) & (
+        summary["Estimate"] <= summary["Upper"]
+    )
+    assert inside.all()
+
+    # One chunk draws the row indexes of all replicates from the first spawned stream
+    replicates = 200
+    stream = np.random.SeedSequence(0).spawn(1)[0]
+    indexes = np.random.default_rng(stream).integers(
+        0, len(df), size=(replicates, len(df))
+    )
+    expected = pd.DataFrame(
+        [resample_statistics(df.iloc[positions]) for positions in indexes]
+    )
+    batched = bootstrap_replicates(df, replicates=replicates)
+    np.testing.assert_allclose(batched[expected.columns], expected, rtol=1e-7)
+
+    one_worker = bootstrap_replicates(df, replicates=20_000, max_workers=1)
+    four_workers = bootstrap_replicates(df, replicates=20_000, max_workers=4)
+    pd.testing.assert_frame_equal(one_worker, four_workers)
+
+
+def benchmark(label, df, loop_replicates=200):
+    start = time.perf_counter()
+    loop_bootstrap(df, loop_replicates)
+    loop_seconds = (time.perf_counter() - start) / loop_replicates * REPLICATES
+
+    print(f"{label}: {len(df)} joined rows, {REPLICATES} replicates")
+    print(f"  per-replicate loop (extrapolated) {loop_seconds:8.1f} s")
+    for max_workers in [1, 4]:
+        start = time.perf_counter()
+        conversion_summary(df, replicates=REPLICATES, max_workers=max_workers)
+        seconds = time.perf_counter() - start
+        print(
+            f"  batched, {max_workers} worker(s)              {seconds:8.2f} s "
+            f"({loop_seconds / seconds:5.0f}x faster)"
+        )
+
+
+def main():
+    df = pd.read_csv(JOINED_PATH)
+    check(df)
+    print(
+        "Estimates match np.polyfit and replicates match per-resample statistics "
+        "for any number of workers"
+    )
+
+    print(f"CPU cores: {os.cpu_count()}")
+    benchmark("Scraped data", df)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        synthetic = write_synthetic_joined(10, os.path.join(temp_dir, "joined.csv"))
+    benchmark("Synthetic 10x", synthetic, loop_replicates=50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Measure the startup time of the command line entry point and check what it imports.
+
+Each command is run in a new interpreter several times and the median wall
+time is reported, next to a bare interpreter and to importing the modules the
+join script imported before doing any work. `python -X importtime` checks that
+`--help` imports no third party package, and that `join` and `aggregate`, run in
+a copy of the data, import neither requests nor BeautifulSoup. Run from the
+repository root:
+
+    python -m benchmarks.benchmark_cli_startup
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import copy_data
+
+RUNS = 10
+HELP_LIMIT = 0.1
+
+HELP_COMMANDS = [
+    ["--help"],
+    ["scrape", "--help"],
+    ["combine", "--help"],
+    ["join", "--help"],
+    ["aggregate", "--help"],
+]
+THIRD_PARTY = ["pandas", "numpy", "pyarrow", "polars", "yaml", "requests", "bs4"]
+SCRAPE_ONLY = ["requests", "bs4"]
+
+# What the join script imported at the top before the command line entry point
+SCRIPT_IMPORTS = (
+    "import yaml, requests, bs4; "
+    "import src.data_preperation.join_pl_championship_data, "
+    "src.data_preperation.columnar_storage, "
+    "src.data_preperation.player_ids"
+)
+
+
+def environment():
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    env.pop("PIPELINE_TRACE", None)
+    return env
+
+
+def median_seconds(args, runs=RUNS):
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            env=environment(),
+        )
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def imported_packages(args, cwd=None):
+    """
+    Top level packages imported by a command, from `python -X importtime`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=environment(),
+    )
+    packages = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            module = line.rsplit("|", 1)[1].strip()
+            packages.add(module.split(".")[0])
+    return packages
+
+
+def check_imports():
+    for command in HELP_COMMANDS:
+        imported = imported_packages(["-m", "src.cli", *command])
+        assert not imported & set(THIRD_PARTY), (command, imported & set(THIRD_PARTY))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        copy_data(data_dir)
+        for command in [["join"], ["aggregate"]]:
+            imported = imported_packages(["-m", "src.cli", *command], cwd=data_dir)
+            assert "pandas" in imported, command
+            assert not imported & set(SCRAPE_ONLY), (
+                command,
+                imported & set(SCRAPE_ONLY),
+            )
+
+
+def main():
+    check_imports()
+    print(
+        "--help imports no third party package, join and aggregate skip requests and bs4"
+    )
+
+    baselines = {
+        "python -c pass": ["-c", "pass"],
+        "join script imports": ["-c", SCRIPT_IMPORTS],
+    }
+    for label, args in baselines.items():
+        print(f"  {label:<28} {median_seconds(args) * 1e3:7.1f} ms")
+
+    for command in HELP_COMMANDS:
+        seconds = median_seconds(["-m", "src.cli", *command])
+        print(f"  {'cli ' + ' '.join(command):<28} {seconds * 1e3:7.1f} ms")
+        assert seconds < HELP_LIMIT, f"{command} took {seconds * 1e3:.1f} ms"
+
+
+if __name__ == "__main__":
+    main()
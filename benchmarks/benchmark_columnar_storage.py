@@ -0,0 +1,124 @@
+"""
+Compare load time and on-disk size of the CSV and Parquet league data.
+
+Writes the Parquet datasets to a temporary directory from the committed
+per-season CSVs. Each read is compared with the CSV read giving the same
+dtypes: plain `pd.read_csv` for the default dtypes, and the compact read
+the join uses for categoricals and small integers. Run from the
+repository root:
+
+    python -m benchmarks.benchmark_columnar_storage
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks.fixtures import best_time
+from src.cli import LEAGUE_METRICS
+from src.data_preperation.columnar_storage import (
+    league_metric_dataset_path,
+    read_joined_parquet,
+    read_league_metric,
+    write_joined_parquet,
+    write_league_metric_parquet,
+)
+from src.data_preperation.join_pl_championship_data import (
+    compact_dtypes,
+    read_combined_csv,
+)
+
+JOINED_CSV = "data/premier_league_championship_joined.csv"
+
+
+def directory_size(path):
+    """
+    Return the total size in bytes of all files under `path`.
+    """
+    return sum(
+        os.path.getsize(os.path.join(root, filename))
+        for root, _, files in os.walk(path)
+        for filename in files
+    )
+
+
+def report(label, csv_time, parquet_time, csv_bytes, parquet_bytes):
+    print(
+        f"{label:<32} load {csv_time * 1000:7.1f} ms -> {parquet_time * 1000:6.1f} ms "
+        f"({csv_time / parquet_time:4.1f}x), size {csv_bytes / 1024:7.0f} KiB -> "
+        f"{parquet_bytes / 1024:5.0f} KiB"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        for league_metric in LEAGUE_METRICS:
+            csv_path = f"data/{league_metric}/combined_seasons/{league_metric}.csv"
+            write_league_metric_parquet(league_metric, root=root)
+
+            csv_time, csv_df = best_time(lambda: pd.read_csv(csv_path))
+            parquet_time, parquet_df = best_time(
+                lambda: read_league_metric(league_metric, compact=False, root=root)
+            )
+            compact_csv_time, compact_csv_df = best_time(
+                lambda: read_combined_csv(csv_path, compact=True)
+            )
+            compact_time, compact_df = best_time(
+                lambda: compact_dtypes(read_league_metric(league_metric, root=root))
+            )
+            pruned_time, _ = best_time(
+                lambda: read_league_metric(
+                    league_metric,
+                    columns=["Player", "Country", "season_start"],
+                    seasons=(2014, 2023),
+                    compact=True,
+                    root=root,
+                )
+            )
+            assert parquet_df.equals(
+                csv_df
+            ), f"Parquet data differs for {league_metric}"
+            pd.testing.assert_frame_equal(
+                compact_df, compact_csv_df, check_categorical=False
+            )
+
+            parquet_bytes = directory_size(
+                league_metric_dataset_path(league_metric, root=root)
+            )
+            csv_bytes = os.path.getsize(csv_path)
+            report(league_metric, csv_time, parquet_time, csv_bytes, parquet_bytes)
+            report(
+                "  compact dtypes",
+                compact_csv_time,
+                compact_time,
+                csv_bytes,
+                parquet_bytes,
+            )
+            report(
+                "  3 columns, 2014-2023",
+                compact_csv_time,
+                pruned_time,
+                csv_bytes,
+                parquet_bytes,
+            )
+
+        joined_parquet = os.path.join(root, "joined.parquet")
+        joined_df = pd.read_csv(JOINED_CSV)
+        write_joined_parquet(joined_df, joined_parquet)
+        csv_time, _ = best_time(lambda: pd.read_csv(JOINED_CSV))
+        parquet_time, parquet_df = best_time(
+            lambda: read_joined_parquet(joined_parquet)
+        )
+        assert parquet_df.equals(joined_df), "Parquet joined data differs"
+        report(
+            "premier_league_championship_joined",
+            csv_time,
+            parquet_time,
+            os.path.getsize(JOINED_CSV),
+            os.path.getsize(joined_parquet),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Compare combining season CSVs in one DataFrame with streaming them in parallel.
+
+The previous combine read every file in `os.listdir` order, concatenated
+them and wrote the result. `write_combined_csv` reads chunks of files on a
+thread pool and writes them one chunk at a time in season order. The outputs are checked
+against the concatenated files in season order: on the scraped data, with
+`os.listdir` returning files in reverse, for incremental updates that
+change a season or its column types (float counts, which also fail
+validation), and on synthetic data. Synthetic
+league metrics are written as one file per season and as one file per
+matchday, then combined with both approaches. Run from the repository root:
+
+    python -m benchmarks.benchmark_combine_csvs
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import measure
+from benchmarks.synthetic_data import generate_league_data, write_season_csvs
+from src.cli import LEAGUE_METRICS
+from src.data_preperation import load_pl_championship_data
+from src.data_preperation.load_pl_championship_data import (
+    season_csv_paths,
+    update_combined_csv,
+    write_combined_csv,
+)
+
+MATCHDAYS = 38
+
+
+def combine_in_memory(directory_path, csv_save_path):
+    """
+    The previous combine: every file read one after another, concatenated and written.
+    """
+    data_frames = []
+    for filename in os.listdir(directory_path):
+        if filename.endswith(".csv"):
+            data_frames.append(pd.read_csv(os.path.join(directory_path, filename)))
+    combined_df = pd.concat(data_frames, ignore_index=True)
+    combined_df["season_start"] = combined_df["Season"].str[:4].astype(int)
+    combined_df.to_csv(csv_save_path, index=False)
+
+
+def expected_output(directory_path):
+    combined_df = pd.concat(
+        [pd.read_csv(file_path) for file_path in season_csv_paths(directory_path)],
+        ignore_index=True,
+    )
+    combined_df["season_start"] = combined_df["Season"].str[:4].astype(int)
+    return combined_df.to_csv(index=False)
+
+
+def read_text(file_path):
+    with open(file_path) as file:
+        return file.read()
+
+
+def check_scraped(output_dir):
+    listdir = os.listdir
+    for league_metric in LEAGUE_METRICS:
+        directory_path = os.path.join("data", league_metric)
+        csv_save_path = os.path.join(output_dir, f"{league_metric}.csv")
+        expected = expected_output(directory_path)
+
+        write_combined_csv(directory_path, csv_save_path)
+        assert read_text(csv_save_path) == expected, league_metric
+        with mock.patch.object(
+            load_pl_championship_data.os,
+            "listdir",
+            lambda path: sorted(listdir(path), reverse=True),
+        ):
+            write_combined_csv(directory_path, csv_save_path)
+        assert read_text(csv_save_path) == expected, league_metric
+
+
+def check_incremental(output_dir):
+    directory_path = os.path.join(output_dir, "seasons")
+    shutil.copytree("data/championship_assists", directory_path)
+    shutil.rmtree(os.path.join(directory_path, "combined_seasons"))
+    csv_save_path = os.path.join(output_dir, "combined.csv")
+    manifest_path = os.path.join(output_dir, "manifest.json")
+
+    def update(valid=True):
+        combined = update_combined_csv(directory_path, csv_save_path, manifest_path)
+        # Written as the seasons say, with the checks left to the validate stage
+        passed = all(check["passed"] for check in combined["checks"])
+        assert passed == valid
+        assert combined["rows"] == len(pd.read_csv(csv_save_path))
+        assert read_text(csv_save_path) == expected_output(directory_path)
+
+    update()
+    # A changed season in the middle, then a season whose assists become
+    # floats, which fails the integer count check, then the season restored
+    file_path = os.path.join(directory_path, "2018-2019.csv")
+    df = pd.read_csv(file_path)
+    df.loc[0, "Assists"] += 1
+    df.to_csv(file_path, index=False)
+    update()
+    df["Assists"] = df["Assists"] + 0.5
+    df.to_csv(file_path, index=False)
+    update(valid=False)
+    df["Assists"] = (df["Assists"] - 0.5).astype(int)
+    df.to_csv(file_path, index=False)
+    update()
+    update()
+
+
+def write_matchday_csvs(df, directory_path):
+    """
+    Write a league metric as one CSV per matchday, named in season and matchday order.
+    """
+    os.makedirs(directory_path, exist_ok=True)
+    matchdays = np.random.default_rng(0).integers(1, MATCHDAYS + 1, len(df))
+    for (season, matchday), matchday_df in df.groupby(["Season", matchdays]):
+        matchday_df.drop(columns=["season_start"]).to_csv(
+            os.path.join(directory_path, f"{season}-{matchday:02d}.csv"), index=False
+        )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as output_dir:
+        check_scraped(output_dir)
+        check_incremental(output_dir)
+    print("Streamed outputs match the concatenated seasons in season order")
+
+    for scale in [1, 10, 100]:
+        df = generate_league_data(scale)["premier_league_goals"]
+        print(f"{len(df)} rows")
+        for layout, write in [
+            ("season", write_season_csvs),
+            ("matchday", write_matchday_csvs),
+        ]:
+            with tempfile.TemporaryDirectory() as output_dir:
+                directory_path = os.path.join(output_dir, "premier_league_goals")
+                write(df, directory_path)
+                n_files = len(season_csv_paths(directory_path))
+                old_path = os.path.join(output_dir, "old.csv")
+                new_path = os.path.join(output_dir, "new.csv")
+
+                old_time, old_memory, _ = measure(
+                    lambda: combine_in_memory(directory_path, old_path)
+                )
+                new_time, new_memory, _ = measure(
+                    lambda: write_combined_csv(directory_path, new_path)
+                )
+                assert read_text(new_path) == expected_output(directory_path)
+                print(
+                    f"  {n_files:4d} {layout} files: in memory {old_time:6.3f} s "
+                    f"{old_memory / 1024**2:7.1f} MiB, streamed {new_time:6.3f} s "
+                    f"{new_memory / 1024**2:7.1f} MiB ({old_time / new_time:4.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the peak memory of the join script's steps with default and compact dtypes.
+
+Synthetic combined CSVs are written at several scales, then read, processed,
+joined and formatted once with the default dtypes and once in compact mode,
+with categorical text columns and nullable small integer counts. Both runs
+must write the same CSV. Run from the repository root:
+
+    python -m benchmarks.benchmark_compact_dtypes
+"""
+
+import os
+import tempfile
+import yaml
+
+from benchmarks.fixtures import LEAGUES, measure
+from benchmarks.synthetic_data import generate_league_data, with_missing_keys
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    compact_dtypes,
+    format_joined_data,
+    join_pl_champ_data,
+    process_league_data,
+    read_combined_csv,
+)
+from src.data_preperation.player_ids import PlayerIds
+
+
+def write_combined_csvs(data, directory_path):
+    file_paths = {}
+    for league_metric, df in data.items():
+        file_paths[league_metric] = os.path.join(directory_path, f"{league_metric}.csv")
+        df.to_csv(file_paths[league_metric], index=False)
+    return file_paths
+
+
+def run(file_paths, rename_lookup, compact, player_ids=None):
+    """
+    Read, process, join and format the combined CSVs and return the output CSV text.
+    """
+    combined = {
+        league_metric: read_combined_csv(file_path, compact=compact)
+        for league_metric, file_path in file_paths.items()
+    }
+    processed = {
+        league: process_league_data(
+            combined[f"{league}_goals"],
+            combined[f"{league}_assists"],
+            rename_lookup,
+            player_ids=player_ids,
+        )
+        for league in LEAGUES
+    }
+    joined = join_pl_champ_data(processed["premier_league"], processed["championship"])
+    return format_joined_data(joined).to_csv(index=False)
+
+
+def input_memory(file_paths, compact):
+    return sum(
+        read_combined_csv(file_path, compact=compact).memory_usage(deep=True).sum()
+        for file_path in file_paths.values()
+    )
+
+
+def check_same_output(data, rename_lookup, directory_path):
+    file_paths = write_combined_csvs(data, directory_path)
+    ids_path = os.path.join(directory_path, "player_ids.csv")
+    default = run(file_paths, rename_lookup, False)
+    assert run(file_paths, rename_lookup, True) == default
+    assert run(file_paths, rename_lookup, True, PlayerIds(ids_path)) == default
+
+    # As read from Parquet, with only Team and Country categorical
+    combined = {
+        league_metric: compact_dtypes(
+            read_combined_csv(file_path).astype(
+                {"Team": "category", "Country": "category"}
+            )
+        )
+        for league_metric, file_path in file_paths.items()
+    }
+    processed = {
+        league: process_league_data(
+            combined[f"{league}_goals"], combined[f"{league}_assists"], rename_lookup
+        )
+        for league in LEAGUES
+    }
+    joined = join_pl_champ_data(processed["premier_league"], processed["championship"])
+    assert format_joined_data(joined).to_csv(index=False) == default
+
+
+def main():
+    with open("conf/duplicated_player_names.yaml", "r") as file:
+        rename_lookup = build_rename_lookup(yaml.safe_load(file))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_same_output(
+            with_missing_keys(generate_league_data(1)), rename_lookup, temp_dir
+        )
+        print("Missing keys: compact output matches default output")
+
+        for scale in [1, 10, 100]:
+            data = generate_league_data(scale)
+            file_paths = write_combined_csvs(data, temp_dir)
+            print(f"{sum(len(df) for df in data.values())} rows")
+
+            results = {}
+            for compact in [False, True]:
+                mode = "compact" if compact else "default"
+                seconds, peak_memory, results[mode] = measure(
+                    lambda: run(file_paths, rename_lookup, compact)
+                )
+                print(
+                    f"  {mode:<8} inputs {input_memory(file_paths, compact) / 1024**2:7.1f} MiB, "
+                    f"peak {peak_memory / 1024**2:7.1f} MiB, {seconds:7.3f} s"
+                )
+            assert results["compact"] == results["default"], "Outputs differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare sequential and concurrent season scraping against a local stub server.
+
+The stub server adds a fixed latency to every response to stand in for the
+round trip to worldfootball.net. Run from the repository root:
+
+    python -m benchmarks.benchmark_concurrent_fetch [latency_seconds]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import (
+    load_season_pages,
+    read_outputs,
+    start_stub_server,
+    working_directory,
+)
+from src.cli import LEAGUE_METRICS
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    create_session,
+    get_all_season_data,
+    get_all_season_data_concurrent,
+)
+
+
+def scrape_into(output_dir, jobs, concurrent, max_workers=8):
+    """
+    Scrape every job into `output_dir` and return the elapsed seconds.
+    """
+    with working_directory(output_dir):
+        for league_metric, _ in jobs:
+            os.makedirs(f"data/{league_metric}", exist_ok=True)
+
+        session = create_session(pool_maxsize=max_workers)
+        rate_limiter = HostRateLimiter(requests_per_second=1000, max_in_flight=4)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for league_metric, seasons in jobs:
+                league, metric = league_metric.rsplit("_", 1)
+                if concurrent:
+                    get_all_season_data_concurrent(
+                        seasons=seasons,
+                        league=league,
+                        metric=metric,
+                        session=session,
+                        rate_limiter=rate_limiter,
+                        max_workers=max_workers,
+                    )
+                else:
+                    get_all_season_data(
+                        seasons=seasons, league=league, metric=metric, sleep_time=0.01
+                    )
+        return time.perf_counter() - start
+
+
+def main(latency=0.3):
+    pages = {}
+    jobs = []
+    for league_metric in LEAGUE_METRICS:
+        seasons = {}
+        for season, page in load_season_pages(league_metric).items():
+            path = f"/{league_metric}/{season}/"
+            pages[path] = page
+            seasons[season] = path
+        jobs.append((league_metric, seasons))
+
+    server = start_stub_server(pages, latency=latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    jobs = [
+        (league_metric, {season: base_url + path for season, path in seasons.items()})
+        for league_metric, seasons in jobs
+    ]
+
+    try:
+        with tempfile.TemporaryDirectory() as sequential_dir, tempfile.TemporaryDirectory() as concurrent_dir:
+            sequential_time = scrape_into(sequential_dir, jobs, concurrent=False)
+            concurrent_time = scrape_into(concurrent_dir, jobs, concurrent=True)
+            assert read_outputs(sequential_dir) == read_outputs(
+                concurrent_dir
+            ), "Concurrent output differs from sequential output"
+    finally:
+        server.shutdown()
+
+    n_pages = len(pages)
+    print(f"Pages fetched: {n_pages} (stub latency {latency * 1000:.0f} ms)")
+    print(
+        f"Sequential: {sequential_time:.2f}s ({n_pages / sequential_time:.1f} pages/s)"
+    )
+    print(
+        f"Concurrent: {concurrent_time:.2f}s ({n_pages / concurrent_time:.1f} pages/s)"
+    )
+    print(f"Speedup: {sequential_time / concurrent_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,111 @@
+"""
+Compare row-wise and vectorized formatting in format_joined_data at scale.
+
+The joined Premier League and Championship data is rebuilt from the combined
+CSVs and replicated to the requested number of rows, once keeping today's
+player names and once making every copy's names distinct (the worst case for
+formatting once per distinct name). Run from the repository root:
+
+    python -m benchmarks.benchmark_format_joined_data [rows]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.data_preperation.join_pl_championship_data import (
+    format_joined_data,
+    format_player_season,
+    format_season,
+    join_pl_champ_data,
+    process_league_data,
+)
+
+
+def format_joined_data_rowwise(pl_champ_merged):
+    """
+    The original implementation using `apply` per element and per row.
+    """
+    pl_champ_merged.loc[
+        pl_champ_merged["Season Start (Champ.)"] < 2014, "Assists (Champ.)"
+    ] = None
+    pl_champ_merged["Season (PL)"] = pl_champ_merged["Season (PL)"].apply(format_season)
+    pl_champ_merged["Season (Champ.)"] = pl_champ_merged["Season (Champ.)"].apply(
+        format_season
+    )
+    pl_champ_merged["Player (PL Season) - Full Name"] = (
+        pl_champ_merged["Player"] + " (" + pl_champ_merged["Season (PL)"] + ")"
+    )
+    pl_champ_merged["Player (PL Season)"] = pl_champ_merged.apply(
+        format_player_season, axis=1
+    )
+    pl_champ_merged = pl_champ_merged.sort_values(["Season Start (PL)", "Player"])
+    pl_champ_merged["Team (PL)"] = pl_champ_merged["Team (PL)"].str.rstrip(" FC")
+    pl_champ_merged["Team (Champ.)"] = pl_champ_merged["Team (Champ.)"].str.rstrip(
+        " FC"
+    )
+    return pl_champ_merged
+
+
+def load_joined_data():
+    """
+    Rebuild the unformatted joined data from the combined CSVs.
+    """
+    with open("conf/duplicated_player_names.yaml", "r") as file:
+        duplicated_player_names = yaml.safe_load(file)
+
+    leagues = {}
+    for league in ["premier_league", "championship"]:
+        leagues[league] = process_league_data(
+            goals_df=pd.read_csv(
+                f"data/{league}_goals/combined_seasons/{league}_goals.csv"
+            ),
+            assists_df=pd.read_csv(
+                f"data/{league}_assists/combined_seasons/{league}_assists.csv"
+            ),
+            duplicated_player_names=duplicated_player_names,
+        )
+    return join_pl_champ_data(
+        pl_df=leagues["premier_league"], champ_df=leagues["championship"]
+    )
+
+
+def scale_rows(df, n_rows, distinct_names):
+    """
+    Replicate `df` to `n_rows` rows, optionally suffixing player names per copy.
+    """
+    copies = -(-n_rows // len(df))
+    scaled = pd.concat([df] * copies, ignore_index=True).head(n_rows)
+    if distinct_names:
+        copy_number = np.repeat(np.arange(copies), len(df))[:n_rows]
+        scaled["Player"] = scaled["Player"] + pd.Series(copy_number).map(" {}".format)
+    return scaled
+
+
+def main(n_rows=1_000_000):
+    joined = load_joined_data()
+
+    for distinct_names in [False, True]:
+        scaled = scale_rows(joined, n_rows, distinct_names)
+
+        start = time.perf_counter()
+        expected = format_joined_data_rowwise(scaled.copy())
+        rowwise_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = format_joined_data(scaled.copy())
+        vectorized_time = time.perf_counter() - start
+
+        assert result.equals(expected), "Vectorized formatting output differs"
+        print(
+            f"{n_rows} rows, {scaled['Player'].nunique():>7} distinct players: "
+            f"row-wise {rowwise_time:.2f}s, vectorized {vectorized_time:.2f}s "
+            f"({rowwise_time / vectorized_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
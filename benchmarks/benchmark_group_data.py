@@ -0,0 +1,93 @@
+"""
+Compare the lambda aggregation of group_data with the vectorized team label path.
+
+Synthetic merged frames are built with the columns `process_league_data`
+passes to `group_data`, including players appearing for several teams in a
+season. Run from the repository root:
+
+    python -m benchmarks.benchmark_group_data [rows ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_preperation.join_pl_championship_data import group_data
+
+
+def group_data_lambda(merged_df):
+    """
+    The original implementation, aggregating Team with a Python lambda per group.
+    """
+    return (
+        merged_df.groupby(["Player", "Season", "Country", "season_start"])
+        .agg(
+            {
+                "Team": lambda x: " / ".join(sorted(set(x))),
+                "Assists": "sum",
+                "Goals": "sum",
+            }
+        )
+        .reset_index()
+    )
+
+
+def make_merged_frame(n_rows, seed=0):
+    """
+    Build a synthetic merged goals/assists frame with `n_rows` rows.
+    """
+    rng = np.random.default_rng(seed)
+    n_players = max(n_rows // 8, 1)
+    teams = np.array([f"Team {i} FC" for i in range(60)], dtype=object)
+    countries = np.array([f"Country {i}" for i in range(80)], dtype=object)
+
+    player_ids = rng.integers(0, n_players, n_rows)
+    season_start = rng.integers(1999, 2024, n_rows)
+    return pd.DataFrame(
+        {
+            "Player": pd.Series(player_ids)
+            .map("Player {}".format)
+            .to_numpy(dtype=object),
+            "Country": countries[player_ids % len(countries)],
+            # Most rows share a team with their player's other rows in a season
+            "Team": teams[
+                (player_ids + season_start + (rng.random(n_rows) < 0.1)) % len(teams)
+            ],
+            "Assists": rng.integers(0, 15, n_rows).astype(float),
+            "Season": pd.Series(season_start)
+            .map(lambda year: f"{year}-{year + 1}")
+            .to_numpy(dtype=object),
+            "season_start": season_start,
+            "Goals": rng.integers(0, 30, n_rows).astype(float),
+        }
+    )
+
+
+def main(row_counts=(100_000, 1_000_000, 3_000_000)):
+    for n_rows in row_counts:
+        merged_df = make_merged_frame(n_rows)
+
+        start = time.perf_counter()
+        expected = group_data_lambda(merged_df)
+        lambda_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = group_data(merged_df)
+        vectorized_time = time.perf_counter() - start
+
+        assert result.to_csv(index=False) == expected.to_csv(
+            index=False
+        ), "Vectorized group_data output differs"
+        print(
+            f"{n_rows:>9} rows, {len(result):>8} groups: lambda {lambda_time:6.2f}s, "
+            f"vectorized {vectorized_time:5.2f}s ({lambda_time / vectorized_time:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main()
@@ -0,0 +1,184 @@
+"""
+Check the raw HTML archive and time re-parsing it on a process pool.
+
+Every season of the four league metrics is scraped from a local stub server
+with an archive. The archive is checked to hold one record per page, to
+append nothing when the same pages are scraped again and one record when a
+page changes, and to rebuild its index by scanning the records, dropping a
+record cut short. With the server shut down, the per-season CSVs rebuilt
+from the archive are checked to be identical to the scraped CSVs, and the
+re-parse is timed in one process and on process pools of one, two and four
+workers, in pages per second. Run from the repository root:
+
+    python -m benchmarks.benchmark_html_archive
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.fixtures import (
+    load_season_pages,
+    season_csvs,
+    start_stub_server,
+    working_directory,
+)
+from src.cli import LEAGUE_METRICS
+from src.data_preperation.html_archive import (
+    HTMLArchive,
+    reparse_archive,
+    reparse_page,
+)
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    create_session,
+    get_all_season_data_concurrent,
+)
+
+REPEATS = 3
+
+
+def scrape(server, archive):
+    """
+    Scrape every league metric from the server into "data" in the current directory.
+    """
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    session = create_session()
+    rate_limiter = HostRateLimiter(requests_per_second=1000)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for league_metric in LEAGUE_METRICS:
+            league, metric = league_metric.rsplit("_", 1)
+            os.makedirs(f"data/{league_metric}", exist_ok=True)
+            prefix = f"/{league_metric}/"
+            not_saved = get_all_season_data_concurrent(
+                seasons={
+                    path[len(prefix) :].strip("/"): base_url + path
+                    for path in server.pages
+                    if path.startswith(prefix)
+                },
+                league=league,
+                metric=metric,
+                session=session,
+                rate_limiter=rate_limiter,
+                archive=archive,
+            )
+            assert not_saved == []
+
+
+def reparse(archive_dir, max_workers=None):
+    """
+    Re-parse the archive into "data" in the current directory, returning the report.
+    """
+    shutil.rmtree("data", ignore_errors=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return reparse_archive(archive_dir, max_workers=max_workers)
+
+
+def reparse_in_process(archive):
+    """
+    Re-parse every archived page in the current process, returning the seconds taken.
+    """
+    shutil.rmtree("data", ignore_errors=True)
+    pages = archive.pages()
+    for page in pages:
+        os.makedirs(f"data/{page['league']}_{page['metric']}", exist_ok=True)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page in pages:
+            reparse_page(archive.pages_path, page)
+    return time.perf_counter() - start
+
+
+def check_archive(server, archive_dir):
+    archive = HTMLArchive(archive_dir)
+    assert len(archive.pages()) == len(server.pages)
+    size = os.path.getsize(archive.pages_path)
+
+    # Scraping the same pages again appends nothing
+    scrape(server, archive)
+    assert os.path.getsize(archive.pages_path) == size
+
+    # A changed page appends one record, which is read from then on
+    path = next(iter(server.pages))
+    league_metric, season = path.strip("/").split("/")
+    league, metric = league_metric.rsplit("_", 1)
+    original = server.pages[path]
+    server.pages[path] = original.replace("</body>", "<!-- changed --></body>")
+    scrape(server, archive)
+    server.pages[path] = original
+    assert len(archive.pages()) == len(server.pages)
+    assert "<!-- changed -->" in archive.read(league, metric, season)
+    changed_size = os.path.getsize(archive.pages_path)
+    assert changed_size > size
+
+    # The index is rebuilt from the records, and a record cut short is dropped
+    assert HTMLArchive(archive_dir).scan() == archive.entries
+    os.remove(archive.index_path)
+    assert HTMLArchive(archive_dir).entries == archive.entries
+    with open(archive.pages_path, "ab") as file:
+        file.write(b"\x1f\x8b\x08\x00partial")
+    assert HTMLArchive(archive_dir).entries == archive.entries
+    assert os.path.getsize(archive.pages_path) == changed_size
+
+    # Restore the original page, so the archive matches the scraped CSVs again
+    scrape(server, archive)
+    assert archive.read(league, metric, season) == original
+
+
+def main():
+    pages = {
+        f"/{league_metric}/{season}/": page
+        for league_metric in LEAGUE_METRICS
+        for season, page in load_season_pages(league_metric).items()
+    }
+    html_bytes = sum(len(page.encode("utf-8")) for page in pages.values())
+
+    with tempfile.TemporaryDirectory() as temp_dir, working_directory(temp_dir):
+        archive_dir = os.path.join(temp_dir, "html_archive")
+        server = start_stub_server(pages, latency=0)
+        server.pages = pages
+        try:
+            scrape(server, HTMLArchive(archive_dir))
+            expected = season_csvs("data")
+            check_archive(server, archive_dir)
+        finally:
+            server.shutdown()
+            server.server_close()
+        archive_bytes = os.path.getsize(os.path.join(archive_dir, "pages.gz"))
+        print(
+            f"Archived {len(pages)} pages: {html_bytes / 1024**2:.1f} MiB of HTML "
+            f"in {archive_bytes / 1024**2:.2f} MiB ({html_bytes / archive_bytes:.0f}x smaller)"
+        )
+
+        # No server from here on, the CSVs come from the archive alone
+        report = reparse(archive_dir)
+        assert report["pages"] == len(pages)
+        assert season_csvs("data") == expected
+        print(
+            "Appending skips unchanged pages, the index is rebuilt from the records, "
+            "and re-parsed CSVs match the scraped CSVs"
+        )
+
+        print(f"CPU cores: {os.cpu_count()}")
+        archive = HTMLArchive(archive_dir)
+        seconds = min(reparse_in_process(archive) for _ in range(REPEATS))
+        print(
+            f"  in process        {seconds:6.2f} s {len(pages) / seconds:7.1f} pages/s"
+        )
+        for max_workers in [1, 2, 4]:
+            report = min(
+                (reparse(archive_dir, max_workers) for _ in range(REPEATS)),
+                key=lambda report: report["seconds"],
+            )
+            assert season_csvs("data") == expected
+            print(
+                f"  {max_workers} process(es)     {report['seconds']:6.2f} s "
+                f"{report['pages_per_second']:7.1f} pages/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
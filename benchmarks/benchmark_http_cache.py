@@ -0,0 +1,91 @@
+"""
+Count network requests made by repeated scrapes through the on-disk HTTP cache.
+
+Scrapes every Premier League goals season from a local stub server three
+times: a cold run, a warm re-run, and a re-run after one new in-progress
+season is added. Run from the repository root:
+
+    python -m benchmarks.benchmark_http_cache
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import load_season_pages, start_stub_server, working_directory
+from src.data_preperation.http_cache import HTTPCache
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    create_session,
+    get_all_season_data_concurrent,
+)
+
+
+def scrape(seasons, cache):
+    """
+    Scrape the seasons through the cache and return the elapsed seconds.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        get_all_season_data_concurrent(
+            seasons=seasons,
+            league="premier_league",
+            metric="goals",
+            session=create_session(),
+            rate_limiter=HostRateLimiter(requests_per_second=1000),
+            cache=cache,
+        )
+    cache.flush()
+    return time.perf_counter() - start
+
+
+def main(latency=0.3):
+    pages = {
+        f"/{season}/": page
+        for season, page in load_season_pages("premier_league_goals").items()
+    }
+    server = start_stub_server(pages, latency=latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    seasons = {path.strip("/"): base_url + path for path in pages}
+
+    # An in-progress season, which is revalidated rather than cached permanently
+    new_season = f"{time.localtime().tm_year}-{time.localtime().tm_year + 1}"
+    new_page = next(iter(pages.values()))
+
+    try:
+        with tempfile.TemporaryDirectory() as output_dir, working_directory(output_dir):
+            os.makedirs("data/premier_league_goals")
+            runs = []
+            for label in ["cold", "warm", "one new season"]:
+                if label == "one new season":
+                    pages[f"/{new_season}/"] = new_page
+                    seasons[new_season] = f"{base_url}/{new_season}/"
+
+                cache = HTTPCache(cache_dir="data/http_cache")
+                requests_before = server.request_count
+                elapsed = scrape(seasons, cache)
+                runs.append(
+                    (
+                        label,
+                        elapsed,
+                        server.request_count - requests_before,
+                        cache.stats(),
+                    )
+                )
+    finally:
+        server.shutdown()
+
+    print(f"Seasons: {len(seasons)} (stub latency {latency * 1000:.0f} ms)")
+    for label, elapsed, network_requests, stats in runs:
+        print(
+            f"{label:>15}: {elapsed:.2f}s, {network_requests} requests, "
+            f"{stats['hits']} hits, {stats['revalidated']} revalidated, {stats['misses']} misses"
+        )
+    assert runs[1][2] == 0, "Warm run of closed seasons should make no requests"
+    assert runs[2][2] == 1, "Adding one season should make exactly one request"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Check that an incremental join gives the same joined data as a full rebuild, and time both.
+
+In a copy of the data with per-season CSVs, the latest season is held back
+and the data combined and joined incrementally, which joins every season
+as there is no manifest yet. Then the season lands, a Championship season
+changes, a row of a Premier League season is removed, nothing changes, and the
+renames change. After each, the combine and the incremental join are run
+and the joined CSV is checked to be byte-identical to one from a full
+rebuild, with only the affected Premier League seasons joined. The same is
+checked with Parquet storage, merging into the joined Parquet file. Then
+landing the latest season is timed as a full uncached join and as an
+incremental join on today's data and synthetic data at 10x and 100x.
+Run from the repository root:
+
+    python -m benchmarks.benchmark_incremental_join
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import time
+from unittest import mock
+
+import pandas as pd
+
+from benchmarks.fixtures import data_copy, write_season_files
+from benchmarks.synthetic_data import write_synthetic_seasons
+from src.cli import LEAGUE_METRICS, combine, join
+from src.data_preperation import incremental_join
+from src.data_preperation.columnar_storage import read_joined_parquet
+from src.data_preperation.incremental_join import JOINED_PATHS
+
+REPEATS = 3
+LATEST = "2023-2024"
+
+
+def run(storage="csv", incremental=True, combine_seasons=True):
+    """
+    Combine the seasons that changed, unless `combine_seasons` is False, and join.
+
+    Returns the Premier League seasons joined, None if every season was,
+    and the seconds taken by the join.
+    """
+    affected = []
+    affected_seasons = incremental_join.affected_seasons
+
+    def record(old, new):
+        affected.append(affected_seasons(old, new))
+        return affected[-1]
+
+    with mock.patch.object(incremental_join, "affected_seasons", record):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if combine_seasons:
+                combine(parquet=storage == "parquet")
+            start = time.perf_counter()
+            join(storage=storage, cache=False, incremental=incremental)
+            seconds = time.perf_counter() - start
+    # Without a matching manifest every season is joined
+    return (affected[0] if affected else None), seconds
+
+
+def read_output(storage):
+    if storage == "parquet":
+        return read_joined_parquet(JOINED_PATHS["parquet"])
+    with open(JOINED_PATHS["csv"], "rb") as file:
+        return file.read()
+
+
+def full_output(storage):
+    """
+    The joined output of a full rebuild, leaving the incremental output in place.
+    """
+    saved = {path: f"{path}.saved" for path in JOINED_PATHS.values()}
+    for path, copy in saved.items():
+        if os.path.exists(path):
+            shutil.copy(path, copy)
+    with contextlib.redirect_stdout(io.StringIO()):
+        join(storage=storage, cache=False)
+    expected = read_output(storage)
+    for path, copy in saved.items():
+        if os.path.exists(copy):
+            os.replace(copy, path)
+    return expected
+
+
+def check_matches_full(storage, expected_seasons, combine_seasons=True):
+    seasons, _ = run(storage, combine_seasons=combine_seasons)
+    assert seasons == expected_seasons, (seasons, expected_seasons)
+    incremental = read_output(storage)
+    expected = full_output(storage)
+    if storage == "parquet":
+        pd.testing.assert_frame_equal(incremental, expected)
+    else:
+        assert incremental == expected
+    return seasons
+
+
+def hold_back(league_metric, season):
+    os.rename(
+        f"data/{league_metric}/{season}.csv", f"data/{league_metric}/{season}.csv.bak"
+    )
+
+
+def land(league_metric, season):
+    os.rename(
+        f"data/{league_metric}/{season}.csv.bak", f"data/{league_metric}/{season}.csv"
+    )
+
+
+def check_scenarios(storage):
+    for league_metric in LEAGUE_METRICS:
+        hold_back(league_metric, LATEST)
+    check_matches_full(storage, None)
+
+    for league_metric in LEAGUE_METRICS:
+        land(league_metric, LATEST)
+    seasons = check_matches_full(storage, [2023, 2024])
+    print(f"  {storage}: season {LATEST} lands, joined {seasons}")
+
+    path = "data/championship_goals/2015-2016.csv"
+    season = pd.read_csv(path)
+    season.assign(Goals=season["Goals"] + (season.index == 0)).to_csv(path, index=False)
+    seasons = check_matches_full(storage, [2016])
+    print(f"  {storage}: Championship 2015-2016 changes, joined {seasons}")
+
+    path = "data/premier_league_goals/2010-2011.csv"
+    pd.read_csv(path).iloc[1:].to_csv(path, index=False)
+    seasons = check_matches_full(storage, [2010])
+    print(f"  {storage}: a Premier League 2010-2011 row removed, joined {seasons}")
+
+    seasons = check_matches_full(storage, [])
+    print(f"  {storage}: nothing changes, joined {seasons}")
+
+    if storage == "csv":
+        # The combined rows are hashed when a full combine leaves the combine manifest behind
+        with contextlib.redirect_stdout(io.StringIO()):
+            combine(full=True, parquet=False)
+        seasons = check_matches_full(
+            storage, list(range(1999, 2025)), combine_seasons=False
+        )
+        print(f"  {storage}: full combine, joined {len(seasons)} seasons from the rows")
+
+    with open("conf/duplicated_player_names.yaml", "a") as file:
+        file.write("- Player: Andy Hunt\n  Team: Charlton Athletic\n  Rename: A Hunt\n")
+    check_matches_full(storage, None)
+    print(f"  {storage}: renames change, joined every season")
+
+
+def benchmark(scale):
+    with data_copy():
+        if scale == 1:
+            for league_metric in LEAGUE_METRICS:
+                write_season_files(league_metric)
+        else:
+            write_synthetic_seasons(scale)
+
+        full, incremental = [], []
+        for _ in range(REPEATS):
+            for league_metric in LEAGUE_METRICS:
+                hold_back(league_metric, LATEST)
+            run()
+            for league_metric in LEAGUE_METRICS:
+                land(league_metric, LATEST)
+            seasons, seconds = run()
+            assert seasons == [2023, 2024]
+            incremental.append(seconds)
+            expected = read_output("csv")
+            full.append(run(incremental=False)[1])
+            assert read_output("csv") == expected
+        rows = len(pd.read_csv(JOINED_PATHS["csv"]))
+
+    print(f"{'Today' if scale == 1 else f'Synthetic {scale}x'}: {rows} joined rows")
+    print(f"  full join           {min(full):7.2f} s")
+    print(
+        f"  incremental join    {min(incremental):7.2f} s "
+        f"({min(full) / min(incremental):.1f}x faster)"
+    )
+
+
+def main():
+    print("Incremental join vs full rebuild:")
+    for storage in ["csv", "parquet"]:
+        with data_copy():
+            for league_metric in LEAGUE_METRICS:
+                write_season_files(league_metric)
+            check_scenarios(storage)
+    print("Every incremental join matches a full rebuild")
+
+    print("Latest season landing, join time:")
+    for scale in [1, 10, 100]:
+        benchmark(scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measure the cost of pipeline instrumentation and show a traced scrape.
+
+The per-call cost of an instrumented function is timed with instrumentation
+disabled and enabled. Then every season page is scraped from a local stub
+server and combined with instrumentation enabled, printing the stage summary
+and writing a Chrome trace. Run from the repository root:
+
+    python -m benchmarks.benchmark_instrumentation
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import (
+    ROOT,
+    load_season_pages,
+    start_stub_server,
+    working_directory,
+)
+from src.cli import LEAGUE_METRICS
+from src.data_preperation import instrumentation
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    combine_save_csvs,
+    create_session,
+    get_all_season_data_concurrent,
+)
+
+
+def per_call_seconds(func, n_calls=1_000_000):
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        func()
+    return (time.perf_counter() - start) / n_calls
+
+
+def noop():
+    return None
+
+
+def main():
+    instrumented_noop = instrumentation.stage("noop")(noop)
+
+    instrumentation.disable()
+    plain = per_call_seconds(noop)
+    disabled = per_call_seconds(instrumented_noop)
+    instrumentation.enable()
+    enabled = per_call_seconds(instrumented_noop, n_calls=100_000)
+    instrumentation.disable()
+    instrumentation.reset()
+    print(
+        f"Per call: plain {plain * 1e9:.0f} ns, disabled {disabled * 1e9:.0f} ns, "
+        f"enabled {enabled * 1e6:.1f} us"
+    )
+
+    pages = {}
+    jobs = []
+    for league_metric in LEAGUE_METRICS:
+        seasons = {}
+        for season, page in load_season_pages(league_metric).items():
+            path = f"/{league_metric}/{season}/"
+            pages[path] = page
+            seasons[season] = path
+        jobs.append((league_metric, seasons))
+
+    server = start_stub_server(pages, latency=0.05)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    trace_path = os.path.join(ROOT, "benchmarks", "results", "scrape.trace.json")
+    os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+    try:
+        with tempfile.TemporaryDirectory() as output_dir, working_directory(output_dir):
+            session = create_session(pool_maxsize=8)
+            rate_limiter = HostRateLimiter(requests_per_second=1000, max_in_flight=4)
+
+            instrumentation.enable()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for league_metric, seasons in jobs:
+                    league, metric = league_metric.rsplit("_", 1)
+                    os.makedirs(f"data/{league_metric}/combined_seasons")
+                    get_all_season_data_concurrent(
+                        seasons={
+                            season: base_url + path for season, path in seasons.items()
+                        },
+                        league=league,
+                        metric=metric,
+                        session=session,
+                        rate_limiter=rate_limiter,
+                        max_workers=8,
+                    )
+                    combine_save_csvs(league_metric)
+            instrumentation.report(trace_path)
+    finally:
+        instrumentation.disable()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
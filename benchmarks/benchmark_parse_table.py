@@ -0,0 +1,72 @@
+"""
+Compare the BeautifulSoup and streaming table parsers over saved HTML pages.
+
+Pages are rendered from the combined season CSVs and saved to a temporary
+directory, or read from an existing directory of saved pages (for example
+`data/http_cache/objects`) when one is given. Run from the repository root:
+
+    python -m benchmarks.benchmark_parse_table [html_dir]
+"""
+
+import glob
+import os
+import sys
+import tempfile
+
+from benchmarks.fixtures import load_season_pages, measure
+from src.data_preperation.load_pl_championship_data import (
+    parse_table,
+    parse_table_soup,
+)
+
+HEADERS = ["#", "Player", "", "Country", "Team", "Value"]
+
+
+def save_fixture_pages(html_dir):
+    """
+    Render a page for every league metric season and save it to `html_dir`.
+    """
+    for league_metric in [
+        "premier_league_goals",
+        "premier_league_assists",
+        "championship_goals",
+        "championship_assists",
+    ]:
+        for season, page in load_season_pages(league_metric).items():
+            path = os.path.join(html_dir, f"{league_metric}_{season}.html")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(page)
+
+
+def main(html_dir=None):
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        if html_dir is None:
+            html_dir = fixture_dir
+            save_fixture_pages(html_dir)
+
+        pages = []
+        for path in sorted(glob.glob(os.path.join(html_dir, "*.html"))):
+            with open(path, "r", encoding="utf-8") as file:
+                pages.append(file.read())
+
+    results = {}
+    for name, parser in [
+        ("beautifulsoup", parse_table_soup),
+        ("streaming", parse_table),
+    ]:
+        elapsed, peak, frames = measure(
+            lambda: [parser(html=page, headers=HEADERS) for page in pages]
+        )
+        results[name] = frames
+        print(
+            f"{name:>13}: {len(pages) / elapsed:8.1f} pages/s, "
+            f"peak memory {peak / 1024**2:6.1f} MiB"
+        )
+
+    for old, new in zip(results["beautifulsoup"], results["streaming"]):
+        assert old.equals(new), "Streaming parser output differs from BeautifulSoup"
+    print(f"Outputs identical across {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
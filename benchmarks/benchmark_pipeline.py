@@ -0,0 +1,230 @@
+"""
+Time each pipeline stage on synthetic data at multiples of today's size.
+
+`combine_csvs`, `process_league_data`, `join_pl_champ_data`,
+`format_joined_data` and `parse_table` (through `parse_season_html`) are run
+on data from `benchmarks.synthetic_data`. Throughput in input rows per second
+and peak traced memory are written as JSON for tracking regressions, along
+with the commit and library versions. Run from the repository root:
+
+    python -m benchmarks.benchmark_pipeline --scales 1 10 100
+
+The 1000x scale generates around 25 million rows and needs tens of GB of memory.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from benchmarks.fixtures import LEAGUES, render_season_page
+from benchmarks.synthetic_data import SCALES, generate_league_data, write_season_csvs
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    format_joined_data,
+    join_pl_champ_data,
+    process_league_data,
+)
+from src.data_preperation.load_pl_championship_data import (
+    combine_csvs,
+    parse_season_html,
+)
+
+
+def measure(run, setup, repeat, memory):
+    """
+    Best wall time of `run(*setup())` over `repeat` runs, and its peak traced memory.
+
+    Setup is excluded from both measurements. Memory is traced in a separate
+    run as tracing slows the code down.
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        result = run(*args)
+        times.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if memory:
+        args = setup()
+        tracemalloc.start()
+        run(*args)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(times), peak_memory, result
+
+
+def run_combine_csvs(directories):
+    return [combine_csvs(directory_path) for directory_path in directories]
+
+
+def run_process_league_data(league_frames, rename_lookup):
+    return {
+        league: process_league_data(goals_df, assists_df, rename_lookup)
+        for league, (goals_df, assists_df) in league_frames.items()
+    }
+
+
+def run_parse_table(page, season):
+    return parse_season_html(page, season, "goals")
+
+
+def benchmark_scale(scale, rename_lookup, repeat, memory, seed):
+    """
+    Benchmark every stage at one scale and return a result record per stage.
+    """
+    data = generate_league_data(scale, seed=seed)
+    records = []
+
+    def record(stage, input_rows, run, setup):
+        seconds, peak_memory, result = measure(run, setup, repeat, memory)
+        records.append(
+            {
+                "stage": stage,
+                "scale": scale,
+                "input_rows": int(input_rows),
+                "seconds": seconds,
+                "rows_per_second": input_rows / seconds,
+                "peak_memory_bytes": peak_memory,
+            }
+        )
+        print(
+            f"{scale:>5}x {stage:<20} {input_rows:>10} rows {seconds:9.3f} s "
+            f"{input_rows / seconds:>12,.0f} rows/s"
+            + (f" {peak_memory / 1024**2:9.1f} MiB" if memory else "")
+        )
+        return result
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        directories = []
+        for league_metric, df in data.items():
+            directory_path = os.path.join(data_dir, league_metric)
+            write_season_csvs(df, directory_path)
+            directories.append(directory_path)
+        record(
+            "combine_csvs",
+            sum(len(df) for df in data.values()),
+            run_combine_csvs,
+            lambda: (directories,),
+        )
+
+    processed = record(
+        "process_league_data",
+        sum(len(df) for df in data.values()),
+        run_process_league_data,
+        lambda: (
+            {
+                league: (
+                    data[f"{league}_goals"].copy(),
+                    data[f"{league}_assists"].copy(),
+                )
+                for league in LEAGUES
+            },
+            rename_lookup,
+        ),
+    )
+
+    joined = record(
+        "join_pl_champ_data",
+        sum(len(df) for df in processed.values()),
+        join_pl_champ_data,
+        lambda: (
+            processed["premier_league"].copy(),
+            processed["championship"].copy(),
+        ),
+    )
+
+    record(
+        "format_joined_data",
+        len(joined),
+        format_joined_data,
+        lambda: (joined.copy(),),
+    )
+
+    # One page holding the latest Premier League season at this scale
+    goals_df = data["premier_league_goals"]
+    season = goals_df["Season"].iloc[-1]
+    page = render_season_page(goals_df[goals_df["Season"] == season], "goals")
+    record(
+        "parse_table",
+        (goals_df["Season"] == season).sum(),
+        run_parse_table,
+        lambda: (page, season),
+    )
+    return records
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help=f"Multiples of today's size to run (any of {SCALES})",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the traced memory run"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument(
+        "--output",
+        default="benchmarks/results/pipeline.json",
+        help="Path of the JSON results",
+    )
+    args = parser.parse_args()
+
+    with open("conf/duplicated_player_names.yaml", "r") as file:
+        rename_lookup = build_rename_lookup(yaml.safe_load(file))
+
+    results = []
+    for scale in args.scales:
+        results.extend(
+            benchmark_scale(
+                scale, rename_lookup, args.repeat, not args.no_memory, args.seed
+            )
+        )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
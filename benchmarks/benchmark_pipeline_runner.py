@@ -0,0 +1,91 @@
+"""
+Compare the task graph run with one worker against four workers.
+
+The load and join stages are run end to end against a local stub server
+serving every season page. One worker runs the tasks in the same order as
+the two scripts; the outputs of the parallel run must match it byte for
+byte. Run from the repository root:
+
+    python -m benchmarks.benchmark_pipeline_runner
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.fixtures import (
+    load_season_pages,
+    read_outputs,
+    start_stub_server,
+    working_directory,
+)
+from src.cli import LEAGUE_METRICS
+from src.data_preperation.pipeline import build_pipeline
+
+
+def run_into(output_dir, urls, workers):
+    """
+    Run the whole pipeline in `output_dir` and return the elapsed seconds.
+    """
+    shutil.copytree("conf", os.path.join(output_dir, "conf"))
+    with working_directory(output_dir):
+        for league_metric in LEAGUE_METRICS:
+            os.makedirs(f"data/{league_metric}/combined_seasons")
+        pipeline = build_pipeline(urls=urls, requests_per_second=1000)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline.run(workers=workers)
+        return time.perf_counter() - start
+
+
+def main(latency=0.1):
+    pages = {}
+    urls = {}
+    for league_metric in LEAGUE_METRICS:
+        urls[league_metric] = {}
+        for season, page in load_season_pages(league_metric).items():
+            path = f"/{league_metric}/{season}/"
+            pages[path] = page
+            urls[league_metric][season] = path
+
+    server = start_stub_server(pages, latency=latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = {
+        league_metric: {season: base_url + path for season, path in seasons.items()}
+        for league_metric, seasons in urls.items()
+    }
+
+    try:
+        outputs = {}
+        for workers in [1, 4]:
+            with tempfile.TemporaryDirectory() as output_dir:
+                elapsed = run_into(output_dir, urls, workers)
+                # Parquet files embed writer metadata, so compare the CSVs
+                outputs[workers] = {
+                    path: content
+                    for path, content in read_outputs(
+                        os.path.join(output_dir, "data")
+                    ).items()
+                    if path.endswith(".csv")
+                }
+            print(f"{workers} worker(s): {elapsed:6.2f} s")
+
+        sequential = outputs[1]
+        assert (
+            "premier_league_championship_joined.csv" in sequential
+        ), "The joined CSV was not written"
+        for workers, output in outputs.items():
+            assert (
+                output == sequential
+            ), f"Output of {workers} workers differs from one worker"
+        print(f"Outputs match ({len(sequential)} CSV files)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
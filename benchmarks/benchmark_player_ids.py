@@ -0,0 +1,156 @@
+"""
+Compare string key merges and groupbys with integer player ID keys.
+
+`process_league_data` and `join_pl_champ_data` are run on synthetic data at
+several scales, once on the string columns and once with a `PlayerIds`
+dictionary, checking the results are the same. The merge, group and join
+steps are also timed on their own, with the dictionary loaded from a
+previous run as in the join script. Run from the repository root:
+
+    python -m benchmarks.benchmark_player_ids
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+import yaml
+
+from benchmarks.fixtures import LEAGUES, measure
+from benchmarks.synthetic_data import generate_league_data, with_missing_keys
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    fill_missing_values,
+    group_by_player_id,
+    group_data,
+    join_pl_champ_data,
+    merge_by_player_id,
+    process_league_data,
+)
+from src.data_preperation.player_ids import PlayerIds
+
+
+def run(data, rename_lookup, player_ids):
+    processed = {
+        league: process_league_data(
+            data[f"{league}_goals"].copy(),
+            data[f"{league}_assists"].copy(),
+            rename_lookup,
+            player_ids=player_ids,
+        )
+        for league in LEAGUES
+    }
+    joined = join_pl_champ_data(processed["premier_league"], processed["championship"])
+    return processed, joined
+
+
+def check_equal(data, rename_lookup, file_path):
+    string_processed, string_joined = run(data, rename_lookup, None)
+    id_processed, id_joined = run(data, rename_lookup, PlayerIds(file_path))
+    for league in LEAGUES:
+        pd.testing.assert_frame_equal(
+            id_processed[league].drop(columns=["player_id"]), string_processed[league]
+        )
+    pd.testing.assert_frame_equal(id_joined, string_joined)
+
+
+def merge_strings(goals_df, assists_df):
+    """
+    The merge step of `process_league_data` on the string columns.
+    """
+    merged_df = pd.merge(
+        assists_df,
+        goals_df,
+        on=["Player", "Country", "Team", "Season", "season_start"],
+        how="outer",
+    )
+    merged_df = fill_missing_values(merged_df)
+    return merged_df[
+        ["Player", "Country", "Team", "Assists", "Season", "season_start", "Goals"]
+    ]
+
+
+def report(step, string_result, id_result):
+    (string_time, string_memory), (id_time, id_memory) = string_result, id_result
+    print(
+        f"  {step:<10} strings {string_time:7.3f} s {string_memory / 1024**2:7.1f} MiB, "
+        f"player IDs {id_time:7.3f} s {id_memory / 1024**2:7.1f} MiB "
+        f"({string_time / id_time:4.1f}x)"
+    )
+
+
+def main():
+    with open("conf/duplicated_player_names.yaml", "r") as file:
+        rename_lookup = build_rename_lookup(yaml.safe_load(file))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "player_ids.csv")
+        check_equal(
+            with_missing_keys(generate_league_data(1)), rename_lookup, file_path
+        )
+        print("Missing keys: integer keys match string keys")
+
+        for scale in [1, 10, 100]:
+            data = generate_league_data(scale)
+            print(f"{sum(len(df) for df in data.values())} rows")
+
+            # A dictionary saved by an earlier run, as in the join script
+            player_ids = PlayerIds(file_path)
+            run(data, rename_lookup, player_ids)
+            player_ids.save()
+            load_time, load_memory, player_ids = measure(lambda: PlayerIds(file_path))
+            player_ids.ranks()
+            print(
+                f"  {'load IDs':<10} {load_time:7.3f} s {load_memory / 1024**2:7.1f} MiB"
+            )
+
+            goals_df = data["premier_league_goals"]
+            assists_df = data["premier_league_assists"]
+            string_time, string_memory, string_merged = measure(
+                lambda: merge_strings(goals_df, assists_df)
+            )
+            id_time, id_memory, id_merged = measure(
+                lambda: merge_by_player_id(goals_df, assists_df, player_ids)
+            )
+            report("merge", (string_time, string_memory), (id_time, id_memory))
+
+            string_time, string_memory, _ = measure(lambda: group_data(string_merged))
+            id_time, id_memory, _ = measure(
+                lambda: group_by_player_id(*id_merged, player_ids)
+            )
+            report("group", (string_time, string_memory), (id_time, id_memory))
+
+            string_processed, _ = run(data, rename_lookup, None)
+            id_processed, _ = run(data, rename_lookup, player_ids)
+            string_time, string_memory, string_joined = measure(
+                lambda: join_pl_champ_data(
+                    string_processed["premier_league"],
+                    string_processed["championship"],
+                )
+            )
+            id_time, id_memory, id_joined = measure(
+                lambda: join_pl_champ_data(
+                    id_processed["premier_league"], id_processed["championship"]
+                )
+            )
+            report("join", (string_time, string_memory), (id_time, id_memory))
+
+            string_time, string_memory, _ = measure(
+                lambda: run(data, rename_lookup, None)
+            )
+            id_time, id_memory, _ = measure(
+                lambda: run(data, rename_lookup, PlayerIds(file_path))
+            )
+            report("end to end", (string_time, string_memory), (id_time, id_memory))
+            os.remove(file_path)
+
+            for league in LEAGUES:
+                pd.testing.assert_frame_equal(
+                    id_processed[league].drop(columns=["player_id"]),
+                    string_processed[league],
+                )
+            pd.testing.assert_frame_equal(id_joined, string_joined)
+
+
+if __name__ == "__main__":
+    main()
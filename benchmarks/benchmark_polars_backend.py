@@ -0,0 +1,178 @@
+"""
+Compare the pandas join with the same join run as one lazy Polars query.
+
+The outputs are first checked to match: on the scraped data, on synthetic
+data with missing keys (from pandas DataFrames, including compact dtypes,
+and from a Parquet dataset), and with a season range pushed down to the
+scans. Then the join script's steps are timed end to end at several scales,
+from reading the combined CSVs to the formatted result. Polars allocates
+outside the Python heap, so each run is made in a new process and its peak
+memory is the increase in peak RSS. Run from the repository root:
+
+    python -m benchmarks.benchmark_polars_backend
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import LEAGUES
+from benchmarks.synthetic_data import (
+    generate_league_data,
+    with_missing_keys,
+    write_season_csvs,
+)
+from src.cli import load_rename_lookup
+from src.data_preperation import polars_backend
+from src.data_preperation.columnar_storage import write_league_metric_parquet
+from src.data_preperation.join_pl_championship_data import (
+    compact_dtypes,
+    format_joined_data,
+    join_pl_champ_data,
+    process_league_data,
+    read_combined_csv,
+)
+
+
+def join_pandas(leagues, rename_lookup):
+    processed = {
+        league: process_league_data(
+            leagues[f"{league}_goals"].copy(),
+            leagues[f"{league}_assists"].copy(),
+            rename_lookup,
+        )
+        for league in LEAGUES
+    }
+    joined = join_pl_champ_data(processed["premier_league"], processed["championship"])
+    return format_joined_data(joined)
+
+
+def join_polars(leagues, rename_lookup, seasons=None):
+    return polars_backend.collect_joined(
+        polars_backend.build_query(leagues, rename_lookup, seasons=seasons)
+    )
+
+
+def write_combined(data, data_dir):
+    for league_metric, df in data.items():
+        directory_path = os.path.join(data_dir, league_metric, "combined_seasons")
+        os.makedirs(directory_path, exist_ok=True)
+        df.to_csv(os.path.join(directory_path, f"{league_metric}.csv"), index=False)
+
+
+def check_equal(rename_lookup):
+    expected = open("data/premier_league_championship_joined.csv").read()
+    output = polars_backend.join_league_metrics(rename_lookup).to_csv(index=False)
+    assert output == expected, "Polars output differs from the scraped data output"
+
+    data = with_missing_keys(generate_league_data(1))
+    pandas_df = join_pandas(data, rename_lookup)
+    polars_df = join_polars(data, rename_lookup)
+    pd.testing.assert_frame_equal(polars_df, pandas_df.reset_index(drop=True))
+    compact = {
+        league_metric: compact_dtypes(df.copy()) for league_metric, df in data.items()
+    }
+    pd.testing.assert_frame_equal(join_polars(compact, rename_lookup), polars_df)
+
+    in_range = pandas_df["Season Start (PL)"].between(2005, 2010)
+    pd.testing.assert_frame_equal(
+        join_polars(data, rename_lookup, seasons=(2005, 2010)),
+        pandas_df[in_range].reset_index(drop=True),
+    )
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for league_metric, df in data.items():
+            write_season_csvs(df, os.path.join(data_dir, league_metric))
+            write_league_metric_parquet(
+                league_metric,
+                data_dir=data_dir,
+                root=os.path.join(data_dir, "parquet"),
+            )
+        parquet_df = polars_backend.join_league_metrics(
+            rename_lookup, storage="parquet", data_dir=data_dir
+        )
+    pd.testing.assert_frame_equal(parquet_df, polars_df)
+
+
+def run_once(backend, data_dir):
+    """
+    Join the combined CSVs in `data_dir` and print the seconds and peak RSS increase as JSON.
+    """
+    rename_lookup = load_rename_lookup()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if backend == "polars":
+        df = polars_backend.join_league_metrics(rename_lookup, data_dir=data_dir)
+    else:
+        leagues = {
+            league_metric: read_combined_csv(
+                os.path.join(
+                    data_dir, league_metric, "combined_seasons", f"{league_metric}.csv"
+                )
+            )
+            for league_metric in polars_backend.LEAGUE_METRICS
+        }
+        df = join_pandas(leagues, rename_lookup)
+    seconds = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {
+                "seconds": seconds,
+                "peak_memory": (peak - baseline) * 1024,
+                "rows": len(df),
+            }
+        )
+    )
+
+
+def measure(backend, data_dir):
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.benchmark_polars_backend"]
+        + ["--run", backend, data_dir],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--run", nargs=2, metavar=("BACKEND", "DATA_DIR"))
+    args = parser.parse_args()
+    if args.run:
+        run_once(*args.run)
+        return
+
+    check_equal(load_rename_lookup())
+    print("Polars outputs match pandas outputs")
+
+    for scale in [1, 10, 100]:
+        data = generate_league_data(scale)
+        print(f"{sum(len(df) for df in data.values())} rows")
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_combined(data, data_dir)
+            results = {
+                backend: measure(backend, data_dir) for backend in ["pandas", "polars"]
+            }
+        for backend, result in results.items():
+            print(
+                f"  {backend:<7} {result['seconds']:7.3f} s, "
+                f"peak RSS +{result['peak_memory'] / 1024**2:7.1f} MiB "
+                f"({results['pandas']['seconds'] / result['seconds']:4.1f}x)"
+            )
+        assert results["polars"]["rows"] == results["pandas"]["rows"]
+
+
+if __name__ == "__main__":
+    main()
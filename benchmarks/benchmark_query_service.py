@@ -0,0 +1,271 @@
+"""
+Load test the query service on the joined data, against reading the CSV for every query.
+
+The service's answers are first checked against pandas filters on the
+scraped data, and a rewritten joined file is checked to be picked up by the
+watcher, after an unreadable one is skipped. Then, for the scraped data and
+synthetic joined data at several scales, the Python API latency of each
+query type is compared with reading the CSV in full and filtering it, as
+the dashboard does, and the HTTP endpoint is load tested with keep-alive
+clients on several threads. Run from the repository root:
+
+    python -m benchmarks.benchmark_query_service
+"""
+
+import http.client
+import os
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import wait_for
+from benchmarks.synthetic_data import write_synthetic_joined
+from src.data_preperation.query_service import (
+    JOINED_PATH,
+    TEAM_SEPARATOR,
+    QueryService,
+    make_server,
+)
+
+LOAD_TEST_SECONDS = 2.0
+
+
+def records(df):
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def has_team(df, column, name):
+    return (
+        df[column]
+        .str.split(TEAM_SEPARATOR)
+        .apply(lambda teams: isinstance(teams, list) and name in teams)
+    )
+
+
+def expected_answer(df, query, params):
+    if query == "player":
+        return records(df[df["Player"] == params["name"]])
+    if query == "team":
+        column = "Team (PL)" if params["league"] == "pl" else "Team (Champ.)"
+        return records(df[has_team(df, column, params["name"])])
+    if query == "seasons":
+        column = (
+            "Season Start (PL)" if params["league"] == "pl" else "Season Start (Champ.)"
+        )
+        in_range = df[column].between(params["first"], params["last"])
+        return records(df[in_range].sort_values(column, kind="stable"))
+    in_range = df["Season Start (Champ.)"].between(params["first"], params["last"])
+    ranked = (
+        df[in_range]
+        .sort_values("Season Start (Champ.)", kind="stable")
+        .dropna(subset=[params["column"]])
+        .sort_values(params["column"], ascending=False, kind="stable")
+    )
+    return records(ranked.head(params["n"]))
+
+
+def answer(service, query, params):
+    if query == "player":
+        return service.player(params["name"])
+    if query == "team":
+        return service.team(params["name"], params["league"])
+    if query == "seasons":
+        return service.seasons_between(
+            params["first"], params["last"], params["league"]
+        )
+    return service.top(params["first"], params["last"], params["column"], params["n"])
+
+
+def sample_queries(df, n_queries, seed=0):
+    """
+    Random queries of each type on players, teams and seasons that appear in the data.
+    """
+    rng = np.random.default_rng(seed)
+    players = df["Player"].unique()
+    teams = {
+        "pl": df["Team (PL)"].str.split(TEAM_SEPARATOR).explode().dropna().unique(),
+        "champ": df["Team (Champ.)"]
+        .str.split(TEAM_SEPARATOR)
+        .explode()
+        .dropna()
+        .unique(),
+    }
+    first_season = df["Season Start (Champ.)"].min()
+    last_season = df["Season Start (PL)"].max()
+
+    queries = {"player": [], "team": [], "seasons": [], "top": []}
+    for _ in range(n_queries):
+        league = str(rng.choice(["pl", "champ"]))
+        first = int(rng.integers(first_season, last_season - 2))
+        queries["player"].append({"name": str(rng.choice(players))})
+        queries["team"].append(
+            {"name": str(rng.choice(teams[league])), "league": league}
+        )
+        queries["seasons"].append({"first": first, "last": first + 2, "league": league})
+        queries["top"].append(
+            {
+                "first": first,
+                "last": first + 4,
+                "column": str(rng.choice(["Goals (Champ.)", "Assists (Champ.)"])),
+                "n": 10,
+            }
+        )
+    return queries
+
+
+def check_answers():
+    df = pd.read_csv(JOINED_PATH)
+    service = QueryService(JOINED_PATH)
+    for query, params_list in sample_queries(df, 50).items():
+        for params in params_list:
+            assert answer(service, query, params) == expected_answer(
+                df, query, params
+            ), (query, params)
+    assert service.player("No Such Player") == []
+    assert service.team("No Such Team") == []
+
+
+def check_hot_reload(temp_dir):
+    file_path = os.path.join(temp_dir, "joined.csv")
+    shutil.copy(JOINED_PATH, file_path)
+    service = QueryService(file_path)
+    service.watch(interval=0.05)
+    rows = len(service.index)
+
+    # An unreadable file is skipped and the previous data kept
+    open(file_path, "w").close()
+    time.sleep(0.5)
+    assert len(service.index) == rows
+
+    # Written and renamed over the file, as the join does
+    df = pd.read_csv(JOINED_PATH)
+    df.iloc[:-10].to_csv(f"{file_path}.tmp", index=False)
+    os.replace(f"{file_path}.tmp", file_path)
+    assert wait_for(lambda: len(service.index) == rows - 10), "New file not loaded"
+    service.close()
+
+
+def percentiles(latencies):
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def measure_api(service, queries):
+    results = {}
+    for query, params_list in queries.items():
+        latencies = []
+        for params in params_list:
+            start = time.perf_counter()
+            answer(service, query, params)
+            latencies.append(time.perf_counter() - start)
+        results[query] = percentiles(latencies)
+    return results
+
+
+def measure_full_read(file_path, queries, n_queries=5):
+    latencies = []
+    for params in queries["player"][:n_queries]:
+        start = time.perf_counter()
+        df = pd.read_csv(file_path)
+        df[df["Player"] == params["name"]].to_dict("records")
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies)
+
+
+def query_paths(queries):
+    return [
+        f"/{query}?{urlencode(params)}"
+        for query, params_list in queries.items()
+        for params in params_list
+    ]
+
+
+def load_test(port, paths, n_clients, seconds=LOAD_TEST_SECONDS):
+    """
+    Send requests from `n_clients` threads, each on a kept-alive connection, for `seconds`.
+
+    Returns the requests per second and the latencies in seconds.
+    """
+    latencies = [[] for _ in range(n_clients)]
+    stop = threading.Event()
+
+    def client(client_id):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        i = client_id
+        while not stop.is_set():
+            start = time.perf_counter()
+            connection.request("GET", paths[i % len(paths)])
+            response = connection.getresponse()
+            body = response.read()
+            latencies[client_id].append(time.perf_counter() - start)
+            assert response.status == 200, body
+            i += n_clients
+        connection.close()
+
+    threads = [
+        threading.Thread(target=client, args=(client_id,))
+        for client_id in range(n_clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies = np.concatenate([np.asarray(values) for values in latencies])
+    return len(latencies) / seconds, latencies
+
+
+def benchmark(label, file_path):
+    start = time.perf_counter()
+    service = QueryService(file_path)
+    load_seconds = time.perf_counter() - start
+    df = pd.read_csv(file_path)
+    queries = sample_queries(df, 1000)
+    print(f"{label}: {len(df)} rows, loaded and indexed in {load_seconds:.3f} s")
+
+    full_read = measure_full_read(file_path, queries)
+    print(f"  read CSV and filter   {full_read * 1e3:9.3f} ms per query")
+    for query, (p50, p99) in measure_api(service, queries).items():
+        print(
+            f"  API {query:<8}          p50 {p50 * 1e6:8.1f} us, p99 {p99 * 1e6:8.1f} us"
+        )
+
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Range queries over a wide span return most of the data, so load test the point queries
+    paths = query_paths({"player": queries["player"], "team": queries["team"]})
+    for n_clients in [1, 4, 16]:
+        throughput, latencies = load_test(server.server_address[1], paths, n_clients)
+        p50, p99 = percentiles(latencies)
+        print(
+            f"  HTTP {n_clients:2d} clients       {throughput:8.0f} req/s, "
+            f"p50 {p50 * 1e3:6.2f} ms, p99 {p99 * 1e3:6.2f} ms"
+        )
+    server.shutdown()
+    server.server_close()
+    service.close()
+    return full_read
+
+
+def main():
+    check_answers()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        check_hot_reload(temp_dir)
+    print("Answers match pandas filters and a new joined file is hot reloaded")
+
+    benchmark("Scraped data", JOINED_PATH)
+    for scale in [10, 100]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "joined.csv")
+            write_synthetic_joined(scale, file_path)
+            benchmark(f"Synthetic {scale}x", file_path)
+
+
+if __name__ == "__main__":
+    main()
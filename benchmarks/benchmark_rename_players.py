@@ -0,0 +1,65 @@
+"""
+Compare the per-entry rename loop with the vectorized lookup as the rename list grows.
+
+Renames are generated for players in the combined Premier League goals data
+and applied to a frame of roughly today's size. Run from the repository root:
+
+    python -m benchmarks.benchmark_rename_players
+"""
+
+import pandas as pd
+
+from benchmarks.fixtures import best_time
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    rename_duplicated_players,
+)
+
+
+def rename_duplicated_players_loop(df, duplicated_player_names):
+    """
+    The original implementation: one full-column comparison per config entry.
+    """
+    for player_info in duplicated_player_names:
+        condition = (df["Player"] == player_info["Player"]) & (
+            df["Team"] == player_info["Team"]
+        )
+        df.loc[condition, "Player"] = player_info["Rename"]
+    return df
+
+
+def make_renames(df, n_entries):
+    """
+    Build `n_entries` rename entries from (Player, Team) pairs present in `df`.
+    """
+    pairs = df[["Player", "Team"]].drop_duplicates().head(n_entries)
+    return [
+        {"Player": player, "Team": team, "Rename": f"{player} ({team})"}
+        for player, team in pairs.itertuples(index=False)
+    ]
+
+
+def main():
+    df = pd.read_csv(
+        "data/premier_league_goals/combined_seasons/premier_league_goals.csv"
+    )
+    df = pd.concat([df] * 4, ignore_index=True)
+    print(f"Rows: {len(df)}")
+
+    for n_entries in [10, 100, 1000, 4000]:
+        renames = make_renames(df, n_entries)
+        loop_time, loop_df = best_time(
+            lambda: rename_duplicated_players_loop(df.copy(), renames)
+        )
+        lookup_time, lookup_df = best_time(
+            lambda: rename_duplicated_players(df.copy(), build_rename_lookup(renames))
+        )
+        assert loop_df.equals(lookup_df), "Vectorized renames differ from the loop"
+        print(
+            f"{len(renames):>5} entries: loop {loop_time * 1000:9.1f} ms, "
+            f"lookup {lookup_time * 1000:6.1f} ms ({loop_time / lookup_time:6.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
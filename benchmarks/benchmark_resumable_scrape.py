@@ -0,0 +1,118 @@
+"""
+Time a scrape with retries against a flaky local stub server.
+
+The stub server serves every Premier League goals season and injects
+timeouts and 5xx responses into some of them. A scrape with retries saves
+every season in one run, and is timed against a scrape of a healthy server.
+Retrying, resuming after a killed run and giving up on permanent failures
+are tested in `tests/unit/data_prep/test_resumable_scrape.py`. Run from the
+repository root:
+
+    python -m benchmarks.benchmark_resumable_scrape
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import (
+    load_season_pages,
+    season_csvs,
+    start_stub_server,
+    working_directory,
+)
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    RetryPolicy,
+    create_session,
+    get_all_season_data_concurrent,
+)
+
+LATENCY = 0.02
+TIMEOUT = 0.2
+STALL = 0.5
+
+
+def scrape(server, output_dir, retry):
+    """
+    Scrape every season from the server into `output_dir`.
+
+    Returns the seasons not saved, the requests made and the elapsed seconds.
+    """
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    seasons = {path.strip("/"): base_url + path for path in server.pages}
+    with working_directory(output_dir):
+        os.makedirs("data/premier_league_goals", exist_ok=True)
+        requests_before = server.request_count
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            not_saved = get_all_season_data_concurrent(
+                seasons=seasons,
+                league="premier_league",
+                metric="goals",
+                session=create_session(),
+                rate_limiter=HostRateLimiter(requests_per_second=1000),
+                retry=retry,
+                timeout=TIMEOUT,
+            )
+        elapsed = time.perf_counter() - start
+        return not_saved, server.request_count - requests_before, elapsed
+
+
+def start_server(pages, faults=None):
+    server = start_stub_server(pages, latency=LATENCY, faults=faults, stall=STALL)
+    server.pages = pages
+    return server
+
+
+def check_retries(pages, expected, healthy_seconds):
+    paths = list(pages)
+    faults = {
+        path: ["timeout", 503] if position % 2 else [500]
+        for position, path in enumerate(paths)
+        if position % 4 == 0 or position % 7 == 0
+    }
+    injected = sum(len(path_faults) for path_faults in faults.values())
+    server = start_server(pages, faults)
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            not_saved, requests, elapsed = scrape(
+                server, output_dir, RetryPolicy(retries=3, base_delay=0.05, seed=0)
+            )
+            assert not_saved == []
+            assert requests == len(pages) + injected, requests
+            assert season_csvs(output_dir) == expected
+    finally:
+        server.shutdown()
+    print(
+        f"  with retries: every season saved after {injected} injected faults "
+        f"on {len(faults)} seasons, {requests} requests, {elapsed:.2f}s "
+        f"(healthy server {healthy_seconds:.2f}s)"
+    )
+
+
+def main():
+    pages = {
+        f"/{season}/": page
+        for season, page in load_season_pages("premier_league_goals").items()
+    }
+    server = start_server(pages)
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            not_saved, _, healthy_seconds = scrape(server, output_dir, RetryPolicy())
+            assert not_saved == []
+            expected = season_csvs(output_dir)
+    finally:
+        server.shutdown()
+
+    print(
+        f"Seasons: {len(pages)} (stub latency {LATENCY * 1000:.0f} ms, "
+        f"client timeout {TIMEOUT * 1000:.0f} ms)"
+    )
+    check_retries(pages, expected, healthy_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Compare cold and warm joins through the stage cache of processed leagues and joins.
+
+In a copy of the data, the cached join is checked to return the same data
+as an uncached join when cold, when warm, after a Championship file
+changes (only the Championship is processed again), after the duplicated
+player names config changes (everything is processed again), and after the
+player ID dictionary is deleted (cached leagues whose IDs no longer hold
+are processed again). The size cap is checked to evict the least recently
+used results. Then, on the scraped data and on synthetic combined data, an
+uncached join is timed against cold and warm cached joins. Run from the
+repository root:
+
+    python -m benchmarks.benchmark_stage_cache
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import data_copy
+from benchmarks.synthetic_data import write_synthetic_combined
+from src.cli import LEAGUE_METRICS, join_pandas
+from src.data_preperation.player_ids import PlayerIds
+from src.data_preperation.stage_cache import StageCache
+
+
+def run_join(cache):
+    """
+    Join in the current directory and return the result, the seconds taken and the cache counters.
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        df = join_pandas(cache=cache)
+    seconds = time.perf_counter() - start
+    stats = [line for line in output.getvalue().splitlines() if "Stage cache" in line]
+    return df, seconds, stats[-1] if stats else None
+
+
+def stats_of(line):
+    return eval(line.split(": ", 1)[1])
+
+
+def check_invalidation():
+    with data_copy():
+        expected, _, _ = run_join(cache=False)
+
+        df, _, stats = run_join(cache=True)
+        pd.testing.assert_frame_equal(df, expected)
+        assert stats_of(stats)["misses"] == 3
+        df, _, stats = run_join(cache=True)
+        pd.testing.assert_frame_equal(df, expected)
+        assert stats_of(stats)["hits"] == 1 and stats_of(stats)["misses"] == 0
+
+        # Only the Championship is processed again
+        champ_path = "data/championship_goals/combined_seasons/championship_goals.csv"
+        champ = pd.read_csv(champ_path)
+        champ.loc[0, "Goals"] += 1
+        champ.to_csv(champ_path, index=False)
+        expected, _, _ = run_join(cache=False)
+        df, _, stats = run_join(cache=True)
+        pd.testing.assert_frame_equal(df, expected)
+        assert stats_of(stats)["hits"] == 1 and stats_of(stats)["misses"] == 2
+
+        # The IDs of the cached Premier League no longer hold once the
+        # dictionary is rebuilt with the Championship players first
+        champ.loc[0, "Goals"] += 1
+        champ.to_csv(champ_path, index=False)
+        os.remove("data/player_ids.csv")
+        player_ids = PlayerIds("data/player_ids.csv")
+        player_ids.encode(champ["Player"], champ["Country"])
+        player_ids.save()
+        expected, _, _ = run_join(cache=False)
+        df, _, stats = run_join(cache=True)
+        pd.testing.assert_frame_equal(df, expected)
+        assert stats_of(stats)["invalid"] == 1 and stats_of(stats)["misses"] == 2
+
+        # Everything is processed again after a config change
+        with open("conf/duplicated_player_names.yaml", "a") as file:
+            file.write("\n")
+        df, _, stats = run_join(cache=True)
+        pd.testing.assert_frame_equal(df, expected)
+        assert stats_of(stats)["hits"] == 0 and stats_of(stats)["misses"] == 3
+
+
+def check_eviction():
+    frame = pd.DataFrame({"value": range(10_000)})
+    with tempfile.TemporaryDirectory() as cache_dir:
+        one_entry = StageCache(cache_dir)
+        one_entry.store("size", frame)
+        size = one_entry.stats()["bytes"]
+
+        cache = StageCache(cache_dir, max_bytes=3 * size)
+        for key in ["a", "b", "c"]:
+            cache.store(key, frame)
+        cache.load("a")
+        cache.store("d", frame)
+        assert set(cache.entries) == {"a", "c", "d"}, set(cache.entries)
+        assert cache.stats()["bytes"] <= 3 * size
+        assert sorted(os.listdir(cache_dir)) == [
+            "a.arrow",
+            "c.arrow",
+            "d.arrow",
+            "index.json",
+        ]
+        pd.testing.assert_frame_equal(StageCache(cache_dir).load("a"), frame)
+
+
+def benchmark(label, scale=None):
+    with data_copy():
+        if scale is not None:
+            write_synthetic_combined(scale)
+
+        uncached = min(run_join(cache=False)[1] for _ in range(3))
+        cold = []
+        for _ in range(3):
+            shutil.rmtree("data/stage_cache", ignore_errors=True)
+            cold.append(run_join(cache=True)[1])
+        warm = min(run_join(cache=True)[1] for _ in range(3))
+        rows = sum(
+            len(
+                pd.read_csv(
+                    f"data/{league_metric}/combined_seasons/{league_metric}.csv"
+                )
+            )
+            for league_metric in LEAGUE_METRICS
+        )
+        size = StageCache("data/stage_cache").stats()["bytes"]
+
+    print(f"{label}: {rows} combined rows, {size / 1024**2:.1f} MiB cached")
+    print(f"  uncached join   {uncached:7.3f} s")
+    print(f"  cold cache      {min(cold):7.3f} s")
+    print(f"  warm cache      {warm:7.3f} s ({uncached / warm:5.1f}x faster)")
+
+
+def main():
+    check_invalidation()
+    check_eviction()
+    print(
+        "Cached joins match uncached joins after data, config and ID changes, "
+        "and the least recently used results are evicted"
+    )
+    benchmark("Scraped data")
+    for scale in [10, 100]:
+        benchmark(f"Synthetic {scale}x", scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compare one merge per transition with the shared key index transition join.
+
+Every transition between the Premier League and the Championship for lags of
+1 to 3 seasons is computed both ways on the processed league data, scaled up
+by repeating it under renamed players. Run from the repository root:
+
+    python -m benchmarks.benchmark_transition_join
+"""
+
+import pandas as pd
+import yaml
+
+from benchmarks.fixtures import LEAGUES, best_time
+from src.data_preperation.join_pl_championship_data import (
+    join_transitions,
+    process_league_data,
+)
+
+LAGS = [1, 2, 3]
+
+
+def load_league(league, duplicated_player_names):
+    goals_df = pd.read_csv(f"data/{league}_goals/combined_seasons/{league}_goals.csv")
+    assists_df = pd.read_csv(
+        f"data/{league}_assists/combined_seasons/{league}_assists.csv"
+    )
+    return process_league_data(goals_df, assists_df, duplicated_player_names)
+
+
+def scale_league(df, copies):
+    """
+    Repeat `df` `copies` times with distinct player names in each copy.
+    """
+    frames = []
+    for copy in range(copies):
+        frame = df.copy()
+        frame["Player"] = frame["Player"] + f" {copy}"
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def merge_transition(source_df, destination_df, source, destination, lag):
+    """
+    One full-frame merge per transition on a lagged copy of the source seasons.
+    """
+    source_df = source_df.copy()
+    source_df["lagged_season_start"] = source_df["season_start"] + lag
+    suffixes = (f"_{destination}", f"_{source}")
+    if source == destination:
+        suffixes = (f"_{destination}", f"_{source}_lag_{lag}")
+    merged_df = pd.merge(
+        destination_df,
+        source_df,
+        left_on=["Player", "Country", "season_start"],
+        right_on=["Player", "Country", "lagged_season_start"],
+        suffixes=suffixes,
+        how="inner",
+    )
+    return merged_df.drop(columns=["lagged_season_start"])
+
+
+def main():
+    with open("conf/duplicated_player_names.yaml", "r") as file:
+        duplicated_player_names = yaml.safe_load(file)
+    base_leagues = {
+        league: load_league(league, duplicated_player_names) for league in LEAGUES
+    }
+    transitions = [
+        (source, destination, LAGS) for source in LEAGUES for destination in LEAGUES
+    ]
+
+    for copies in [1, 10, 50]:
+        leagues = {
+            league: scale_league(df, copies) for league, df in base_leagues.items()
+        }
+
+        def merge_all():
+            return {
+                (source, destination, lag): merge_transition(
+                    leagues[source], leagues[destination], source, destination, lag
+                )
+                for source, destination, lags in transitions
+                for lag in lags
+            }
+
+        merge_time, merged = best_time(merge_all)
+        index_time, joined = best_time(lambda: join_transitions(leagues, transitions))
+
+        for key, merged_df in merged.items():
+            pd.testing.assert_frame_equal(joined[key], merged_df)
+
+        rows = sum(len(df) for df in leagues.values())
+        print(
+            f"{rows:>9} rows, {len(merged)} transitions: merges {merge_time * 1000:8.1f} ms, "
+            f"key index {index_time * 1000:7.1f} ms ({merge_time / index_time:4.1f}x)"
+        )
+
+    # Players listed twice in a season take the merge fallback
+    leagues = {
+        "premier_league": base_leagues["premier_league"],
+        "championship": pd.concat(
+            [base_leagues["championship"], base_leagues["championship"].head(50)],
+            ignore_index=True,
+        ),
+    }
+    joined = join_transitions(leagues, [("championship", "premier_league", 1)])
+    pd.testing.assert_frame_equal(
+        joined[("championship", "premier_league", 1)],
+        merge_transition(
+            leagues["championship"],
+            leagues["premier_league"],
+            "championship",
+            "premier_league",
+            1,
+        ),
+    )
+    print("Duplicate keys: matches pd.merge")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Check that the validation stage catches broken data, and time what it adds to the pipeline.
+
+In a copy of the data, faults are injected one at a time into the season
+CSVs (a repeated row, a negative count, a mislabelled season, a missing
+season, text in a count column) and into the joined data (a repeated key, a
+wrong season pair, a fourth promoted team, a promoted flag that disagrees
+with the teams). Each is checked to make the validation stage after the
+combine or join raise `ValidationError` naming the failing check, and to
+save a report saying so. Then a full combine and an uncached join of
+synthetic data at 1x, 10x and 100x are timed with and without the checks.
+Run from the repository root:
+
+    python -m benchmarks.benchmark_validation
+"""
+
+import contextlib
+import io
+import json
+import os
+import time
+from unittest import mock
+
+import pandas as pd
+
+from benchmarks.fixtures import data_copy, write_season_files
+from benchmarks.synthetic_data import write_synthetic_seasons
+from src.cli import JOINED_PATH, LEAGUE_METRICS, combine, join
+from src.data_preperation import load_pl_championship_data
+from src.data_preperation.validation import ValidationError, validate_joined
+
+REPEATS = 3
+LEAGUE_METRIC = "championship_goals"
+SEASON_PATH = f"data/{LEAGUE_METRIC}/2010-2011.csv"
+COMBINED_PATH = f"data/{LEAGUE_METRIC}/combined_seasons/{LEAGUE_METRIC}.csv"
+
+
+def expect_failure(check, run, dataset):
+    """
+    Run and check that it raises for `check`, with a saved report saying so.
+
+    Returns the result of the failing check.
+    """
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+    except ValidationError as error:
+        failed = [c["check"] for c in error.report["checks"] if not c["passed"]]
+        assert failed == [check], failed
+        with open(f"data/validation/{dataset}.json", "r") as file:
+            saved = json.load(file)
+        assert not saved["passed"] and saved["checks"] == error.report["checks"]
+        return next(c for c in error.report["checks"] if not c["passed"])
+    raise AssertionError(f"{check} did not fail")
+
+
+def check_combine_faults():
+    season = pd.read_csv(SEASON_PATH)
+    faults = {
+        "unique_keys": pd.concat([season, season.iloc[[3]]]),
+        "non_negative_counts": season.assign(
+            Goals=season["Goals"].where(season.index != 5, -1)
+        ),
+        "season_labels": season.assign(
+            Season=season["Season"].where(season.index != 7, "2010-2012")
+        ),
+        "schema": season.assign(Goals=season["Goals"].astype(str) + " (2)"),
+    }
+    with open(COMBINED_PATH, "rb") as file:
+        combined = file.read()
+
+    def run_combine(full):
+        combine(league_metrics=[LEAGUE_METRIC], full=full, parquet=False)
+
+    for check, broken in faults.items():
+        for full in [True, False]:
+            broken.to_csv(SEASON_PATH, index=False)
+            failure = expect_failure(check, lambda: run_combine(full), LEAGUE_METRIC)
+            season.to_csv(SEASON_PATH, index=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_combine(full)
+        print(f"  combine: {check} caught, e.g. {failure['examples'][:1]}")
+
+    os.rename(SEASON_PATH, f"{SEASON_PATH}.bak")
+    failure = expect_failure(
+        "season_continuity", lambda: run_combine(True), LEAGUE_METRIC
+    )
+    assert failure["examples"] == [2010]
+    os.rename(f"{SEASON_PATH}.bak", SEASON_PATH)
+    print("  combine: season_continuity caught, missing [2010]")
+
+    # An incremental combine reports the checks kept for the seasons it did not rewrite
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_combine(False)
+    with open(COMBINED_PATH, "rb") as file:
+        assert file.read() == combined
+
+
+def check_join_faults():
+    joined = pd.read_csv(JOINED_PATH)
+    validate_joined(joined)
+    promoted = joined.index[joined["same_team"] == 1][0]
+    season = joined.loc[promoted, "Season Start (Champ.)"]
+    other = joined.index[
+        (joined["Season Start (Champ.)"] == season) & (joined["same_team"] == 0)
+    ][0]
+    faults = {
+        "unique_keys": pd.concat([joined, joined.iloc[[10]]]),
+        "season_lag": joined.assign(
+            **{
+                "Season Start (PL)": joined["Season Start (PL)"].where(
+                    joined.index != 10, joined["Season Start (PL)"] + 1
+                )
+            }
+        ),
+        "promoted_teams": joined.assign(
+            **{
+                "Team (PL)": joined["Team (PL)"].where(
+                    joined.index != other, "Newly Promoted FC"
+                ),
+                "Team (Champ.)": joined["Team (Champ.)"].where(
+                    joined.index != other, "Newly Promoted FC"
+                ),
+                "same_team": joined["same_team"].where(joined.index != other, 1),
+            }
+        ),
+        "non_negative_counts": joined.assign(
+            **{"Goals (PL)": joined["Goals (PL)"].where(joined.index != 10, -2)}
+        ),
+    }
+    flag = joined.copy()
+    flag.loc[promoted, "same_team"] = 0
+    faults["promoted_teams (flag)"] = flag
+
+    for name, broken in faults.items():
+        check = name.split(" ")[0]
+        failure = expect_failure(
+            check, lambda: validate_joined(broken), "premier_league_championship_joined"
+        )
+        print(f"  join: {name} caught, e.g. {failure['examples'][:1]}")
+
+
+def run_pipeline(checks=True):
+    """
+    Combine every league metric in full and join without the cache, returning the seconds taken.
+    """
+    patches = contextlib.ExitStack()
+    if not checks:
+        patches.enter_context(
+            mock.patch.object(
+                load_pl_championship_data, "combined_checks", lambda df: []
+            )
+        )
+        patches.enter_context(
+            mock.patch(
+                "src.data_preperation.validation.validate_league_metric",
+                lambda *args: None,
+            )
+        )
+        patches.enter_context(
+            mock.patch(
+                "src.data_preperation.validation.validate_joined", lambda df: None
+            )
+        )
+    with patches, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        combine(full=True, parquet=False)
+        join(cache=False)
+        return time.perf_counter() - start
+
+
+def benchmark(scale):
+    with data_copy():
+        write_synthetic_seasons(scale)
+        run_pipeline()
+
+        # Alternate the runs, so both see the same cache and machine state
+        times = {True: [], False: []}
+        for _ in range(REPEATS):
+            for checks in [False, True]:
+                times[checks].append(run_pipeline(checks))
+        checked, unchecked = min(times[True]), min(times[False])
+
+        cpu_seconds = 0.0
+        for dataset in [*LEAGUE_METRICS, "premier_league_championship_joined"]:
+            with open(f"data/validation/{dataset}.json", "r") as file:
+                cpu_seconds += json.load(file)["cpu_seconds"]
+        rows = sum(
+            len(pd.read_csv(f"data/{lm}/combined_seasons/{lm}.csv"))
+            for lm in LEAGUE_METRICS
+        )
+
+    print(f"Synthetic {scale}x: {rows} combined rows, full combine and uncached join")
+    print(f"  without checks  {unchecked:7.2f} s")
+    print(
+        f"  with checks     {checked:7.2f} s "
+        f"({(checked - unchecked) / unchecked:+.1%} wall time, "
+        f"checks took {cpu_seconds:.2f} CPU s = {cpu_seconds / unchecked:.1%})"
+    )
+
+
+def main():
+    with data_copy():
+        write_season_files(LEAGUE_METRIC)
+        with contextlib.redirect_stdout(io.StringIO()):
+            combine(league_metrics=[LEAGUE_METRIC], parquet=False)
+        print("Injected faults:")
+        check_combine_faults()
+        check_join_faults()
+    print("Every fault raises ValidationError with a saved report")
+
+    for scale in [1, 10, 100]:
+        benchmark(scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Shared harness of the benchmarks: timing, working copies of the data and scrape outputs.
+
+The season pages and the stub server are the test fixtures of
+`tests/conftest.py`, so the scrape benchmarks serve the same pages the tests do.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic_data import write_season_csvs
+from src.cli import LEAGUE_METRICS
+from tests.conftest import (  # noqa: F401
+    load_season_pages,
+    render_season_page,
+    start_stub_server,
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+LEAGUES = ["premier_league", "championship"]
+
+
+def quiet(func, *args, **kwargs):
+    """
+    Call `func` with its printed output discarded and return its result.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def best_time(func, repeat=3):
+    """
+    Return the best wall time of `repeat` calls to `func` and its last result.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def measure(func):
+    """
+    Return the wall time of a call to `func`, the peak traced memory of another, and the result.
+
+    Memory is traced in a separate call, as tracing slows down small
+    allocations a lot.
+    """
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak_memory, result
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def copy_data(data_dir):
+    """
+    Copy the files read by `join` and `aggregate` to `data_dir`.
+
+    The player IDs are not copied, so each copy builds its own dictionary.
+    """
+    shutil.copytree(os.path.join(ROOT, "conf"), os.path.join(data_dir, "conf"))
+    os.makedirs(os.path.join(data_dir, "data"))
+    shutil.copy(
+        os.path.join(ROOT, "data", "premier_league_championship_joined.csv"),
+        os.path.join(data_dir, "data"),
+    )
+    for league_metric in LEAGUE_METRICS:
+        combined_dir = os.path.join("data", league_metric, "combined_seasons")
+        os.makedirs(os.path.join(data_dir, combined_dir))
+        shutil.copy(
+            os.path.join(ROOT, combined_dir, f"{league_metric}.csv"),
+            os.path.join(data_dir, combined_dir),
+        )
+
+
+@contextlib.contextmanager
+def data_copy():
+    """
+    Run in a temporary directory holding a copy of the data, from `copy_data`.
+    """
+    with tempfile.TemporaryDirectory() as data_dir, working_directory(data_dir):
+        copy_data(data_dir)
+        yield data_dir
+
+
+def write_season_files(league_metric):
+    """
+    Write season CSVs from the combined data in "data", as the scrape writes them.
+    """
+    write_season_csvs(
+        pd.read_csv(f"data/{league_metric}/combined_seasons/{league_metric}.csv"),
+        f"data/{league_metric}",
+    )
+
+
+def read_outputs(output_dir):
+    """
+    Read every file written under `output_dir` keyed by relative path.
+    """
+    outputs = {}
+    for root, _, files in os.walk(output_dir):
+        for filename in files:
+            path = os.path.join(root, filename)
+            with open(path, "rb") as file:
+                outputs[os.path.relpath(path, output_dir)] = file.read()
+    return outputs
+
+
+def season_csvs(output_dir):
+    """
+    The CSVs of `read_outputs`.
+    """
+    return {
+        path: content
+        for path, content in read_outputs(output_dir).items()
+        if path.endswith(".csv")
+    }
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
@@ -0,0 +1,346 @@
+"""
+Synthetic league data in the schema emitted by `combine_csvs`, at multiples of today's size.
+
+Players have multi-season careers and move between the Premier League and
+the Championship, a few appear for a second team in a season, three teams
+are promoted and relegated each season, and goals and assists follow the
+skewed distributions of the scraped data, so the data passes the checks of
+`validate_combined` and `validate_joined`. Rows per season
+grow with the scale while the seasons covered stay the same.
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+SCALES = [1, 10, 100, 1000]
+
+FIRST_SEASON = 1999
+LAST_SEASON = 2023
+
+# Roughly today's rows per season and mean value of each league metric
+LEAGUE_METRIC_PROFILES = {
+    "premier_league_goals": {"rows_per_season": 263, "mean": 3.8, "first": 1999},
+    "premier_league_assists": {"rows_per_season": 256, "mean": 2.7, "first": 1999},
+    "championship_goals": {"rows_per_season": 354, "mean": 3.9, "first": 1999},
+    "championship_assists": {"rows_per_season": 356, "mean": 2.7, "first": 2014},
+}
+TEAMS_PER_SEASON = {"premier_league": 20, "championship": 24}
+PROMOTED_TEAMS = 3
+
+FIRST_NAMES = (
+    "Aaron Adam Alan Alex Andy Ben Callum Chris Conor Craig Daniel Danny David Dean "
+    "Dwight Eden Emile Frank Gareth Harry Ian Jack Jamie Jordan José Kevin Lee Luis "
+    "Marcus Mark Matt Michael Mohamed Nathan Nicolas Paul Peter Raheem Robbie Ryan "
+    "Sadio Scott Sébastien Son Steven Thierry Tom Wayne Wilfried Yaya"
+).split()
+LAST_NAMES = (
+    "Adams Alonso Anderson Bailey Baker Barnes Bell Brooks Brown Campbell Carter "
+    "Clarke Cole Cooper Davies Dixon Edwards Evans Fernandes Fletcher Ford Gray Green "
+    "Hall Harris Hughes Hunt Jackson James Johnson Jones Kane King Lewis Martin "
+    "Martínez Mitchell Moore Morgan Murphy Müller Nolan Owen Palmer Parker Phillips "
+    "Price Reid Roberts Robinson Rodríguez Scott Shaw Silva Smith Stewart Taylor "
+    "Thomas Thompson Turner Walker Ward Watson White Williams Wilson Wood Wright "
+    "Young"
+).split()
+COUNTRIES = [
+    "England",
+    "Scotland",
+    "Wales",
+    "Ireland",
+    "Northern Ireland",
+    "France",
+    "Spain",
+    "Netherlands",
+    "Belgium",
+    "Portugal",
+    "Germany",
+    "Brazil",
+    "Argentina",
+    "Nigeria",
+    "Senegal",
+    "Ghana",
+    "Jamaica",
+    "Denmark",
+    "Norway",
+    "Sweden",
+    "Italy",
+    "Côte d'Ivoire",
+    "United States",
+    "Australia",
+    "Iceland",
+]
+TOWNS = (
+    "Ashford Barnfield Bramley Carlton Castleford Dunmore Eastwick Fairhaven Glenbury "
+    "Hadley Hartwell Kingsbridge Langley Marston Millbrook Newbury Northam Oakridge "
+    "Pembury Queensport Redcliffe Rothwell Southam Stanmore Thornbury Upton Wexford "
+    "Whitby Winslow Yarmouth"
+).split()
+TEAM_SUFFIXES = ["FC", "United", "City", "Athletic", "Rovers", "Town"]
+
+
+def player_names(n_players):
+    """
+    Distinct player names; beyond every first and last name pair a number is appended.
+    """
+    ids = np.arange(n_players)
+    first = np.asarray(FIRST_NAMES, dtype=object)[ids % len(FIRST_NAMES)]
+    last = np.asarray(LAST_NAMES, dtype=object)[
+        (ids // len(FIRST_NAMES)) % len(LAST_NAMES)
+    ]
+    names = first + " " + last
+    repeat = ids // (len(FIRST_NAMES) * len(LAST_NAMES))
+    numbered = repeat > 0
+    names[numbered] = names[numbered] + " " + (repeat[numbered] + 1).astype(str)
+    return names
+
+
+def team_names():
+    """
+    Every town and suffix combination, e.g. "Ashford United".
+    """
+    return np.asarray(
+        [f"{town} {suffix}" for suffix in TEAM_SUFFIXES for town in TOWNS],
+        dtype=object,
+    )
+
+
+def generate_league_data(scale=1, seed=0):
+    """
+    Generate goals and assists for the Premier League and the Championship.
+
+    Parameters
+    ----------
+    scale : int, optional
+        Multiple of today's rows per season (default is 1).
+    seed : int, optional
+        Seed of the random number generator (default is 0).
+
+    Returns
+    -------
+    dict
+        League metric names (e.g., "premier_league_goals") mapped to DataFrames
+        with 'Player', 'Country', 'Team', 'Goals' or 'Assists', 'Season' and
+        'season_start' columns, in season order.
+    """
+    rng = np.random.default_rng(seed)
+    seasons = np.arange(FIRST_SEASON, LAST_SEASON + 1)
+    mean_career = 5
+
+    # Players on a league's books in a season, more than appear in either table
+    roster_sizes = {
+        league: int(
+            1.3
+            * scale
+            * max(
+                LEAGUE_METRIC_PROFILES[f"{league}_{metric}"]["rows_per_season"]
+                for metric in ["goals", "assists"]
+            )
+        )
+        for league in TEAMS_PER_SEASON
+    }
+    active_per_season = int(1.5 * sum(roster_sizes.values()))
+
+    # Careers of a few seasons, starting before the first season or during the period
+    n_players = active_per_season * (len(seasons) + mean_career) // mean_career
+    names = player_names(n_players)
+    country_weights = 1 / np.arange(1, len(COUNTRIES) + 1) ** 1.2
+    countries = rng.choice(
+        np.asarray(COUNTRIES, dtype=object),
+        size=n_players,
+        p=country_weights / country_weights.sum(),
+    )
+    career_start = rng.integers(
+        FIRST_SEASON - mean_career, LAST_SEASON + 1, size=n_players
+    )
+    career_end = career_start + rng.geometric(1 / mean_career, size=n_players)
+    teams = team_names()
+
+    # Teams of each league, three of which go up and three down every season
+    order = rng.permutation(len(teams))
+    n_pl, n_champ = TEAMS_PER_SEASON["premier_league"], TEAMS_PER_SEASON["championship"]
+    pl_teams, champ_teams, other_teams = (
+        order[:n_pl],
+        order[n_pl : n_pl + n_champ],
+        order[n_pl + n_champ :],
+    )
+
+    frames = {league_metric: [] for league_metric in LEAGUE_METRIC_PROFILES}
+    for season_start in seasons:
+        season = f"{season_start}-{season_start + 1}"
+        active = np.flatnonzero(
+            (career_start <= season_start) & (career_end > season_start)
+        )
+        active = rng.permutation(active)
+
+        if season_start > FIRST_SEASON:
+            relegated = rng.permutation(n_pl)[:PROMOTED_TEAMS]
+            moved_up = rng.permutation(n_champ)[: 2 * PROMOTED_TEAMS]
+            promoted, moved_down = moved_up[:PROMOTED_TEAMS], moved_up[PROMOTED_TEAMS:]
+            joined = rng.permutation(len(other_teams))[:PROMOTED_TEAMS]
+            pl_teams, champ_teams, other_teams = (
+                np.concatenate([np.delete(pl_teams, relegated), champ_teams[promoted]]),
+                np.concatenate(
+                    [
+                        np.delete(champ_teams, moved_up),
+                        pl_teams[relegated],
+                        other_teams[joined],
+                    ]
+                ),
+                np.concatenate(
+                    [np.delete(other_teams, joined), champ_teams[moved_down]]
+                ),
+            )
+
+        offset = 0
+        for league, league_team_ids in [
+            ("premier_league", pl_teams),
+            ("championship", champ_teams),
+        ]:
+            n_teams = len(league_team_ids)
+            roster = active[offset : offset + roster_sizes[league]]
+            offset += len(roster)
+            league_teams = teams[league_team_ids]
+            roster_team_ids = rng.integers(0, n_teams, size=len(roster))
+            roster_teams = league_teams[roster_team_ids]
+
+            for metric in ["goals", "assists"]:
+                profile = LEAGUE_METRIC_PROFILES[f"{league}_{metric}"]
+                if season_start < profile["first"]:
+                    continue
+
+                n_rows = min(profile["rows_per_season"] * scale, len(roster))
+                picked = rng.choice(len(roster), size=n_rows, replace=False)
+                player_teams = roster_teams[picked]
+
+                # A few players also appear for a second team after a mid-season move
+                moved = rng.random(n_rows) < 0.03
+                second_teams = (
+                    roster_team_ids[picked[moved]]
+                    + rng.integers(1, n_teams, size=moved.sum())
+                ) % n_teams
+                picked = np.concatenate([picked, picked[moved]])
+                player_teams = np.concatenate(
+                    [player_teams, league_teams[second_teams]]
+                )
+                values = rng.geometric(1 / profile["mean"], size=len(picked))
+
+                players = roster[picked]
+                frame = pd.DataFrame(
+                    {
+                        "Player": names[players],
+                        "Country": countries[players],
+                        "Team": player_teams,
+                        metric.capitalize(): values,
+                        "Season": season,
+                        "season_start": season_start,
+                    }
+                )
+                # Tables are listed from the highest value down
+                frame = frame.sort_values(
+                    metric.capitalize(), ascending=False, kind="stable"
+                )
+                frames[f"{league}_{metric}"].append(frame)
+
+    return {
+        league_metric: pd.concat(league_frames, ignore_index=True)
+        for league_metric, league_frames in frames.items()
+    }
+
+
+def write_season_csvs(df, directory_path):
+    """
+    Write a league metric as one CSV per season, as `save_season_data` does.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Output of `generate_league_data` for one league metric.
+    directory_path : str
+        Directory to write the season CSVs to.
+    """
+    os.makedirs(directory_path, exist_ok=True)
+    for season, season_df in df.groupby("Season", sort=True):
+        season_df.drop(columns=["season_start"]).to_csv(
+            os.path.join(directory_path, f"{season}.csv"), index=False
+        )
+
+
+def write_synthetic_seasons(scale):
+    """
+    Replace the season CSVs of every league metric in "data" with synthetic ones.
+
+    Parameters
+    ----------
+    scale : int
+        Multiple of today's rows per season.
+    """
+    for league_metric, df in generate_league_data(scale).items():
+        shutil.rmtree(f"data/{league_metric}")
+        write_season_csvs(df, f"data/{league_metric}")
+        os.makedirs(f"data/{league_metric}/combined_seasons")
+
+
+def write_synthetic_combined(scale):
+    """
+    Replace the combined CSV of every league metric in "data" with synthetic data.
+
+    Parameters
+    ----------
+    scale : int
+        Multiple of today's rows per season.
+    """
+    for league_metric, df in generate_league_data(scale).items():
+        df.to_csv(
+            f"data/{league_metric}/combined_seasons/{league_metric}.csv", index=False
+        )
+
+
+def write_synthetic_joined(scale, file_path):
+    """
+    Join synthetic data with the Polars backend and write it as the joined CSV.
+
+    Parameters
+    ----------
+    scale : int
+        Multiple of today's rows per season.
+    file_path : str
+        Path of the joined CSV to write.
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined data.
+    """
+    from src.cli import load_rename_lookup
+    from src.data_preperation import polars_backend
+
+    df = polars_backend.collect_joined(
+        polars_backend.build_query(generate_league_data(scale), load_rename_lookup())
+    )
+    df.to_csv(file_path, index=False)
+    return df
+
+
+def with_missing_keys(data):
+    """
+    Copy of league data with some missing Country, Team and Season values.
+
+    Parameters
+    ----------
+    data : dict
+        Output of `generate_league_data`.
+
+    Returns
+    -------
+    dict
+        The same league metrics, copied.
+    """
+    data = {league_metric: df.copy() for league_metric, df in data.items()}
+    for offset, df in enumerate(data.values()):
+        df.loc[df.index[offset::97], "Country"] = np.nan
+        df.loc[df.index[offset::89], "Team"] = np.nan
+        df.loc[df.index[offset::211], "Season"] = np.nan
+    return data
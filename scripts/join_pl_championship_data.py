@@ -1,46 +1,28 @@
-import pandas as pd
-from src.data_preperation.join_pl_championship_data import (
-    process_league_data,
-    join_pl_champ_data,
-    format_joined_data,
-)
-import yaml
+from src.cli import join
+from src.data_preperation.instrumentation import report
 
-# Load the YAML file showing duplicate player names
-file_path = "conf/duplicated_player_names.yaml"
-with open(file_path, "r") as file:
-    duplicated_player_names = yaml.safe_load(file)
+# Input from CSV or from the partitioned Parquet dataset, compact dtypes for
+# the pandas join, the join run on pandas or as one lazy Polars query, reuse
+# of the processed leagues and join cached by an earlier run, joining only
+# the seasons that changed since the last incremental join, and building the
+# aggregate extracts of the joined data
+storage = "csv"
+compact = False
+backend = "pandas"
+cache = False
+incremental = False
+cubes = False
 
-premier_league_goals = pd.read_csv(
-    "data/premier_league_goals/combined_seasons/premier_league_goals.csv"
-)
-premier_league_assists = pd.read_csv(
-    "data/premier_league_assists/combined_seasons/premier_league_assists.csv"
-)
-championship_goals = pd.read_csv(
-    "data/championship_goals/combined_seasons/championship_goals.csv"
-)
-championship_assists = pd.read_csv(
-    "data/championship_assists/combined_seasons/championship_assists.csv"
-)
+if __name__ == "__main__":
+    # Join, check, format and save the data
+    join(
+        storage=storage,
+        compact=compact,
+        backend=backend,
+        cache=cache,
+        incremental=incremental,
+        cubes=cubes,
+    )
 
-# Join PL and Championship data individualy
-premier_league_merged = process_league_data(
-    goals_df=premier_league_goals,
-    assists_df=premier_league_assists,
-    duplicated_player_names=duplicated_player_names,
-)
-championship_merged = process_league_data(
-    goals_df=championship_goals,
-    assists_df=championship_assists,
-    duplicated_player_names=duplicated_player_names,
-)
-
-# Join PL and Championship data
-pl_champ_merged = join_pl_champ_data(
-    pl_df=premier_league_merged, champ_df=championship_merged
-)
-pl_champ_merged = format_joined_data(pl_champ_merged)
-
-# Save as csv
-pl_champ_merged.to_csv("data/premier_league_championship_joined.csv", index=False)
+    # Print the stage summary when run with PIPELINE_TRACE set
+    report()
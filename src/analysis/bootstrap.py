@@ -0,0 +1,287 @@
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+JOINED_PATH = "data/premier_league_championship_joined.csv"
+
+# The 'same_team' column is shown as "With Promoted Team" on the dashboard
+GROUPS = {
+    "All": None,
+    "With Promoted Team": 1,
+    "Without Promoted Team": 0,
+}
+
+# Championship assists are recorded from the 2014/15 season
+FIRST_ASSISTS_SEASON = 2014
+
+# Resampled row indexes held at once by each chunk of replicates
+CHUNK_ELEMENTS = 2**22
+
+
+def sum_columns(df):
+    """
+    Per-row values whose sums give every statistic, for each group.
+
+    A resample's statistics only depend on how many times each row was
+    drawn, so they are computed from the sums of these columns weighted by
+    the counts. Rows outside a group are zero in its columns, and rows
+    without Championship assists, before 2014/15, are zero in the assists
+    columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data, as returned by `join_pl_champ_data` or `format_joined_data`.
+
+    Returns
+    -------
+    tuple
+        The column names, as (group, name) pairs, and an array with one row
+        per joined row and one column per name.
+    """
+    goals_champ = df["Goals (Champ.)"].to_numpy(dtype=np.float64)
+    goals_pl = df["Goals (PL)"].to_numpy(dtype=np.float64)
+    assists_champ = df["Assists (Champ.)"].to_numpy(dtype=np.float64)
+    # The join fills them with 0 and formatting removes them
+    has_assists = ~np.isnan(assists_champ) & (
+        df["Season Start (Champ.)"].to_numpy() >= FIRST_ASSISTS_SEASON
+    )
+    assists_champ = np.where(has_assists, assists_champ, 0.0)
+    assists_pl = np.where(has_assists, df["Assists (PL)"].to_numpy(np.float64), 0.0)
+    same_team = df["same_team"].to_numpy()
+
+    names, columns = [], []
+    for group, value in GROUPS.items():
+        in_group = np.ones(len(df)) if value is None else (same_team == value) * 1.0
+        for name, column in [
+            ("n", in_group),
+            ("x", goals_champ),
+            ("y", goals_pl),
+            ("xx", goals_champ**2),
+            ("xy", goals_champ * goals_pl),
+            ("yy", goals_pl**2),
+            ("assists_champ", assists_champ),
+            ("assists_pl", assists_pl),
+        ]:
+            names.append((group, name))
+            columns.append(in_group * column)
+    return names, np.column_stack(columns)
+
+
+def statistics_from_sums(names, sums):
+    """
+    Conversion ratios and the regression of Goals (PL) on Goals (Champ.) from column sums.
+
+    Parameters
+    ----------
+    names : list
+        Column names from `sum_columns`.
+    sums : np.ndarray
+        Sums of the columns, one row per sample.
+
+    Returns
+    -------
+    dict
+        (statistic, group) pairs mapped to an array with one value per
+        sample, missing where a ratio has no denominator. The "Difference"
+        group is "With Promoted Team" minus "Without Promoted Team".
+    """
+    sums = {name: sums[:, position] for position, name in enumerate(names)}
+    statistics = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for group in GROUPS:
+            n, x, y = sums[group, "n"], sums[group, "x"], sums[group, "y"]
+            sxx = n * sums[group, "xx"] - x**2
+            sxy = n * sums[group, "xy"] - x * y
+            syy = n * sums[group, "yy"] - y**2
+            slope = sxy / sxx
+            statistics["Goal Conversion", group] = y / x
+            statistics["Assist Conversion", group] = (
+                sums[group, "assists_pl"] / sums[group, "assists_champ"]
+            )
+            statistics["Slope", group] = slope
+            statistics["Intercept", group] = (y - slope * x) / n
+            statistics["R-squared", group] = sxy**2 / (sxx * syy)
+
+    for statistic in ["Goal Conversion", "Assist Conversion", "Slope"]:
+        statistics[statistic, "Difference"] = (
+            statistics[statistic, "With Promoted Team"]
+            - statistics[statistic, "Without Promoted Team"]
+        )
+    return statistics
+
+
+def resample_sums(values, replicates, seed=0, chunk_size=None, max_workers=4):
+    """
+    Sum the columns of bootstrap resamples of the rows, a chunk of replicates at a time.
+
+    Each chunk draws the row indexes of all its replicates in one call,
+    counts how many times each row was drawn with one `np.bincount`, and
+    sums every column of every replicate with one matrix product of the
+    counts and the values. Each chunk has its own random stream spawned
+    from `seed`, so the result does not depend on `max_workers`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        One row per sampled unit and one column per value summed.
+    replicates : int
+        Number of bootstrap replicates.
+    seed : int, optional
+        Seed of the resampling (default is 0).
+    chunk_size : int, optional
+        Replicates per chunk (default keeps about four million drawn indexes per chunk).
+    max_workers : int, optional
+        Chunks resampled at the same time on a thread pool (default is 4).
+
+    Returns
+    -------
+    np.ndarray
+        The column sums of each replicate, one row per replicate.
+    """
+    n_rows = len(values)
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // n_rows)
+    starts = range(0, replicates, chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(len(starts))
+    sums = np.empty((replicates, values.shape[1]))
+
+    def resample(start, stream):
+        size = min(chunk_size, replicates - start)
+        indexes = np.random.default_rng(stream).integers(0, n_rows, size=(size, n_rows))
+        # Offset each replicate's indexes so one bincount counts them all
+        indexes += np.arange(size)[:, None] * n_rows
+        counts = np.bincount(indexes.ravel(), minlength=size * n_rows)
+        np.matmul(
+            counts.reshape(size, n_rows).astype(np.float64),
+            values,
+            out=sums[start : start + size],
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [
+            executor.submit(resample, start, stream)
+            for start, stream in zip(starts, streams)
+        ]:
+            future.result()
+    return sums
+
+
+def bootstrap_replicates(df, replicates=10_000, seed=0, max_workers=4):
+    """
+    Every statistic of each bootstrap resample of the joined rows.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data, as returned by `join_pl_champ_data` or `format_joined_data`.
+    replicates : int, optional
+        Number of bootstrap replicates (default is 10,000).
+    seed : int, optional
+        Seed of the resampling (default is 0).
+    max_workers : int, optional
+        Chunks of replicates resampled at the same time (default is 4).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per replicate and one column per (statistic, group) pair.
+    """
+    names, values = sum_columns(df)
+    sums = resample_sums(values, replicates, seed=seed, max_workers=max_workers)
+    return pd.DataFrame(statistics_from_sums(names, sums))
+
+
+def conversion_summary(df, replicates=10_000, confidence=0.95, seed=0, max_workers=4):
+    """
+    Estimate how Championship goals and assists carry over to the next Premier League season.
+
+    For all players, and split by whether they stayed with the promoted
+    team, this estimates the goal and assist conversion (Premier League
+    goals or assists per Championship goal or assist of the season before,
+    assists from 2014/15 when they were first recorded), and the slope,
+    intercept and R-squared of a least squares regression of Goals (PL) on
+    Goals (Champ.), with percentile bootstrap confidence intervals.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data, as returned by `join_pl_champ_data` or `format_joined_data`.
+    replicates : int, optional
+        Number of bootstrap replicates (default is 10,000).
+    confidence : float, optional
+        Confidence level of the intervals (default is 0.95).
+    seed : int, optional
+        Seed of the resampling (default is 0).
+    max_workers : int, optional
+        Chunks of replicates resampled at the same time (default is 4).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per statistic and group, with the 'Estimate' on the joined
+        rows, the 'Lower' and 'Upper' bounds of the interval, and the
+        bootstrap 'Std. Error'.
+    """
+    names, values = sum_columns(df)
+    estimates = statistics_from_sums(names, values.sum(axis=0, keepdims=True))
+    samples = bootstrap_replicates(
+        df, replicates=replicates, seed=seed, max_workers=max_workers
+    ).to_numpy()
+
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+    summary = pd.DataFrame(
+        {
+            "Statistic": [statistic for statistic, _ in estimates],
+            "Group": [group for _, group in estimates],
+            "Estimate": [estimate[0] for estimate in estimates.values()],
+            "Lower": lower,
+            "Upper": upper,
+            "Std. Error": np.nanstd(samples, axis=0, ddof=1),
+        }
+    )
+    return summary.sort_values(["Statistic", "Group"], kind="stable", ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Bootstrap how Championship goals and assists carry over to the Premier League."
+    )
+    parser.add_argument("--file", default=JOINED_PATH, help="Joined CSV to analyse")
+    parser.add_argument(
+        "--replicates", type=int, default=10_000, help="Bootstrap replicates"
+    )
+    parser.add_argument(
+        "--confidence", type=float, default=0.95, help="Confidence level"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the resampling")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Chunks of replicates resampled at the same time",
+    )
+    parser.add_argument("--output", help="CSV to save the summary to")
+    args = parser.parse_args()
+
+    summary = conversion_summary(
+        pd.read_csv(args.file),
+        replicates=args.replicates,
+        confidence=args.confidence,
+        seed=args.seed,
+        max_workers=args.workers,
+    )
+    with pd.option_context("display.width", 120, "display.max_rows", None):
+        print(summary.round(3).to_string(index=False))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        summary.to_csv(args.output, index=False)
+        print(f"Summary saved to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,756 @@
+"""
+Command line entry point for the data preparation steps.
+
+    python -m src.cli scrape
+    python -m src.cli reparse
+    python -m src.cli combine
+    python -m src.cli join
+    python -m src.cli format
+    python -m src.cli aggregate
+    python -m src.cli pipeline
+
+Only the standard library is imported at startup. Each subcommand imports the
+modules it needs when it runs, so `--help` does not import pandas, and only
+`scrape` imports requests and BeautifulSoup.
+"""
+
+import argparse
+
+LEAGUE_METRICS = [
+    "premier_league_goals",
+    "premier_league_assists",
+    "championship_goals",
+    "championship_assists",
+]
+JOINED_PATH = "data/premier_league_championship_joined.csv"
+DUPLICATED_PLAYER_NAMES_PATH = "conf/duplicated_player_names.yaml"
+
+
+def load_rename_lookup(file_path=DUPLICATED_PLAYER_NAMES_PATH):
+    """
+    Read the duplicated player names config and index its renames.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Path of the YAML config (default is "conf/duplicated_player_names.yaml").
+
+    Returns
+    -------
+    pd.Series
+        Lookup built with `build_rename_lookup`.
+    """
+    import yaml
+
+    from src.data_preperation.join_pl_championship_data import build_rename_lookup
+
+    with open(file_path, "r") as file:
+        return build_rename_lookup(yaml.safe_load(file))
+
+
+def scrape(
+    league_metrics=LEAGUE_METRICS,
+    end_season=2024,
+    max_workers=8,
+    requests_per_second=10,
+    max_in_flight=4,
+    retries=3,
+    timeout=30,
+    resume=False,
+):
+    """
+    Fetch every season page of the league metrics and save the per-season CSVs.
+
+    Every season saved is recorded in "data/scrape_checkpoint.json", so a
+    scrape that stopped part way through can be resumed, and every page
+    fetched is appended to "data/html_archive", so the CSVs can be rebuilt
+    with `reparse` after a parsing fix.
+
+    Parameters
+    ----------
+    league_metrics : list, optional
+        League metric names to scrape (default is all four).
+    end_season : int, optional
+        The season after the last season to scrape (default is 2024).
+    max_workers : int, optional
+        Seasons fetched at the same time (default is 8).
+    requests_per_second : float, optional
+        Requests per second allowed to each host (default is 10).
+    max_in_flight : int, optional
+        Concurrent requests allowed to each host (default is 4).
+    retries : int, optional
+        Retries of a request after a timeout or server error (default is 3).
+    timeout : float, optional
+        Seconds to wait for the server before retrying (default is 30).
+    resume : bool, optional
+        Only fetch the seasons not yet in the checkpoint (default is False).
+
+    Returns
+    -------
+    dict
+        League metric names mapped to the seasons that were not saved.
+    """
+    from src.data_preperation.load_pl_championship_data import league_metric_urls
+    from src.data_preperation.pipeline import scrape_clients, scrape_league_metric
+
+    # One pooled session, per-host rate limit and cache shared by every league metric
+    urls = league_metric_urls(end_season=end_season)
+    clients = scrape_clients(
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        max_in_flight=max_in_flight,
+    )
+    not_saved = {}
+    for league_metric in league_metrics:
+        seasons = scrape_league_metric(
+            league_metric,
+            urls[league_metric],
+            max_workers=max_workers,
+            retries=retries,
+            timeout=timeout,
+            resume=resume,
+            **clients,
+        )
+        if seasons:
+            not_saved[league_metric] = seasons
+    print(f"HTTP cache: {clients['cache'].stats()}")
+    if not_saved:
+        missing = sum(len(seasons) for seasons in not_saved.values())
+        print(
+            f"{missing} season pages were not saved: {not_saved}. "
+            "Run again with --resume to fetch only these."
+        )
+    return not_saved
+
+
+def reparse(league_metrics=LEAGUE_METRICS, max_workers=None):
+    """
+    Rebuild the per-season CSVs from the pages archived by `scrape`, without the network.
+
+    Parameters
+    ----------
+    league_metrics : list, optional
+        League metric names to re-parse (default is all four).
+    max_workers : int, optional
+        Number of worker processes (default is the number of CPUs).
+
+    Returns
+    -------
+    dict
+        'pages', 'rows', 'seconds' and 'pages_per_second'.
+    """
+    from src.data_preperation.html_archive import reparse_archive
+
+    return reparse_archive(
+        archive_dir="data/html_archive",
+        league_metrics=league_metrics,
+        max_workers=max_workers,
+    )
+
+
+def combine(league_metrics=LEAGUE_METRICS, full=False, parquet=True):
+    """
+    Combine the per-season CSVs of the league metrics, check them and save a Parquet copy.
+
+    The checks of each league metric are saved as a report in
+    "data/validation", and a failed check stops before its Parquet copy is
+    written.
+
+    Parameters
+    ----------
+    league_metrics : list, optional
+        League metric names to combine (default is all four).
+    full : bool, optional
+        Rewrite every season instead of only the seasons that changed (default is False).
+    parquet : bool, optional
+        Also write the Parquet dataset partitioned by league, metric and season
+        (default is True).
+
+    Raises
+    ------
+    ValidationError
+        If the combined data of a league metric fails a check.
+    """
+    from src.data_preperation.load_pl_championship_data import combine_save_csvs
+    from src.data_preperation.validation import validate_league_metric
+
+    for league_metric in league_metrics:
+        combined = combine_save_csvs(league_metric=league_metric, incremental=not full)
+        validate_league_metric(league_metric, combined)
+        if parquet:
+            from src.data_preperation.columnar_storage import (
+                write_league_metric_parquet,
+            )
+
+            write_league_metric_parquet(league_metric=league_metric)
+
+
+def join(
+    storage="csv",
+    compact=False,
+    backend="pandas",
+    cache=False,
+    incremental=False,
+    cubes=False,
+    unformatted=False,
+):
+    """
+    Join the Premier League and Championship data, format it and save it.
+
+    The joined data is checked with `validate_joined` before anything is
+    written, and the report saved in "data/validation". The pandas join is
+    checked as returned by `join_pl_champ_data`, before it is formatted; the
+    Polars and incremental joins format in the same step, so their
+    formatted output is checked.
+
+    Parameters
+    ----------
+    storage : str, optional
+        "csv" to read the combined CSVs or "parquet" to read the partitioned
+        Parquet dataset and also write the joined data to Parquet (default is "csv").
+    compact : bool, optional
+        Join with categorical text and small integer counts to cut peak
+        memory, with the same output (default is False).
+    backend : str, optional
+        "pandas", or "polars" to run the join as one lazy query plan (default is "pandas").
+    cache : bool, optional
+        Reuse the processed leagues and the join from "data/stage_cache"
+        when the combined data, the duplicated player names config and the
+        join code have not changed (default is False). Only used by the
+        pandas backend.
+    incremental : bool, optional
+        Only join the Premier League seasons affected by seasons of the
+        combined data that changed since the last incremental join, and merge
+        them into the saved joined data, with the same result as joining
+        every season (default is False). Only used by the pandas backend,
+        instead of the stage cache.
+    cubes : bool, optional
+        Also build the aggregate extracts of the joined data (default is False).
+    unformatted : bool, optional
+        Save the checked join to
+        "data/premier_league_championship_unformatted.parquet" without
+        formatting it, for `format_joined` to format and write (default is
+        False). Only the pandas backend without `incremental` can be saved
+        unformatted.
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined and formatted data, or the joined data with `unformatted`.
+
+    Raises
+    ------
+    ValidationError
+        If the joined data fails a check.
+    ValueError
+        If `unformatted` is used with the Polars backend or `incremental`.
+    """
+    from src.data_preperation.pipeline import write_joined
+    from src.data_preperation.validation import validate_joined
+
+    if unformatted and (backend == "polars" or incremental):
+        raise ValueError(
+            "Only the pandas join without incremental can be saved unformatted"
+        )
+
+    # Stop before writing anything if the joined data fails a check
+    manifest = None
+    if backend == "polars":
+        from src.data_preperation.polars_backend import join_league_metrics
+
+        pl_champ_merged = join_league_metrics(load_rename_lookup(), storage=storage)
+        validate_joined(pl_champ_merged)
+    elif incremental:
+        pl_champ_merged, manifest = join_incremental(storage=storage, compact=compact)
+        validate_joined(pl_champ_merged)
+    else:
+        from src.data_preperation.join_pl_championship_data import format_joined_data
+
+        joined = join_pandas(storage=storage, compact=compact, cache=cache)
+        validate_joined(joined)
+        if unformatted:
+            from src.data_preperation.pipeline import write_unformatted
+
+            write_unformatted(joined)
+            return joined
+        pl_champ_merged = format_joined_data(joined)
+
+    write_joined(pl_champ_merged, storage=storage)
+    if manifest is not None:
+        from src.data_preperation.incremental_join import (
+            JOINED_PATHS,
+            save_join_manifest,
+        )
+
+        # Record the seasons joined, for the next incremental join
+        save_join_manifest(manifest, JOINED_PATHS[storage])
+
+    if cubes:
+        from src.data_preperation.aggregate_cubes import build_cubes
+
+        # Precompute the dashboard aggregates, only for the seasons that changed
+        build_cubes(pl_champ_merged)
+    return pl_champ_merged
+
+
+def format_joined(storage="csv", cubes=False):
+    """
+    Format the join saved by `join` with `unformatted` and write it.
+
+    Parameters
+    ----------
+    storage : str, optional
+        "csv", or "parquet" to also write the joined data to Parquet (default is "csv").
+    cubes : bool, optional
+        Also build the aggregate extracts of the joined data (default is False).
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined and formatted data.
+    """
+    from src.data_preperation.join_pl_championship_data import format_joined_data
+    from src.data_preperation.pipeline import read_unformatted, write_joined
+
+    pl_champ_merged = format_joined_data(read_unformatted())
+    write_joined(pl_champ_merged, storage=storage)
+    if cubes:
+        from src.data_preperation.aggregate_cubes import build_cubes
+
+        build_cubes(pl_champ_merged)
+    return pl_champ_merged
+
+
+def join_incremental(storage="csv", compact=False):
+    """
+    Join only the seasons that changed since the last incremental join with pandas.
+
+    See `update_joined_data`.
+
+    Parameters
+    ----------
+    storage : str, optional
+        "csv" or "parquet" input, and the saved joined file merged into
+        (default is "csv").
+    compact : bool, optional
+        Join with categorical text and small integer counts (default is False).
+
+    Returns
+    -------
+    tuple
+        The joined and formatted data, and the manifest to save once it is written.
+    """
+    from src.data_preperation.incremental_join import update_joined_data
+    from src.data_preperation.player_ids import PlayerIds
+
+    return update_joined_data(
+        duplicated_player_names=load_rename_lookup(),
+        player_ids=PlayerIds("data/player_ids.csv"),
+        storage=storage,
+        compact=compact,
+    )
+
+
+def join_pandas(storage="csv", compact=False, cache=False):
+    """
+    Process each league and join them with pandas, memoizing both steps.
+
+    Each processed league is cached under a hash of its combined goals and
+    assists data, the duplicated player names config, the options and the
+    source of the modules they run, and the join under the keys of both leagues. A
+    re-run with nothing changed loads the join from the cache without
+    reading the combined data.
+
+    Parameters
+    ----------
+    storage : str, optional
+        "csv" or "parquet" input (default is "csv").
+    compact : bool, optional
+        Join with categorical text and small integer counts (default is False).
+    cache : bool, optional
+        Use the stage cache (default is False).
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined data from `join_pl_champ_data`, not yet formatted.
+    """
+    from src.data_preperation.join_pl_championship_data import (
+        join_pl_champ_data,
+        process_league_data,
+    )
+    from src.data_preperation.pipeline import read_combined
+    from src.data_preperation.player_ids import PlayerIds
+
+    rename_lookup = None
+
+    def process(league, player_ids):
+        nonlocal rename_lookup
+        if rename_lookup is None:
+            rename_lookup = load_rename_lookup()
+        return process_league_data(
+            goals_df=read_combined(f"{league}_goals", storage, compact),
+            assists_df=read_combined(f"{league}_assists", storage, compact),
+            duplicated_player_names=rename_lookup,
+            player_ids=player_ids,
+        )
+
+    leagues = ["premier_league", "championship"]
+
+    def join_leagues(stage_cache=None, process_keys=None):
+        # Integer IDs for each (Player, Country), kept across runs
+        player_ids = PlayerIds("data/player_ids.csv")
+        if stage_cache is None:
+            processed = {league: process(league, player_ids) for league in leagues}
+        else:
+            # Processed leagues from an earlier run are used if their IDs still hold
+            processed = {
+                league: stage_cache.memoize(
+                    process_keys[league],
+                    process,
+                    league,
+                    player_ids,
+                    valid=player_ids.matches,
+                )
+                for league in leagues
+            }
+        player_ids.save()
+        return join_pl_champ_data(
+            pl_df=processed["premier_league"], champ_df=processed["championship"]
+        )
+
+    if not cache:
+        return join_leagues()
+
+    from src.data_preperation.columnar_storage import league_metric_dataset_path
+    from src.data_preperation.stage_cache import (
+        StageCache,
+        inputs_digest,
+        source_digest,
+    )
+
+    stage_cache = StageCache("data/stage_cache")
+    code = source_digest(
+        join_pandas, process_league_data, read_combined, league_metric_dataset_path
+    )
+    config = inputs_digest([DUPLICATED_PLAYER_NAMES_PATH])
+    process_keys = {}
+    for league in leagues:
+        paths = [
+            (
+                league_metric_dataset_path(f"{league}_{metric}")
+                if storage == "parquet"
+                else f"data/{league}_{metric}/combined_seasons/{league}_{metric}.csv"
+            )
+            for metric in ["goals", "assists"]
+        ]
+        process_keys[league] = stage_cache.key(
+            "process_league_data",
+            league,
+            storage,
+            compact,
+            code,
+            config,
+            inputs_digest(paths),
+        )
+    join_key = stage_cache.key("join_pl_champ_data", code, *process_keys.values())
+
+    # Nothing is read or processed when the join itself is cached
+    pl_champ_merged = stage_cache.memoize(
+        join_key, join_leagues, stage_cache, process_keys
+    )
+    print(f"Stage cache: {stage_cache.stats()}")
+    return pl_champ_merged
+
+
+def aggregate(storage="csv"):
+    """
+    Rebuild the outputs derived from the joined CSV without joining again.
+
+    This writes what is built from the saved joined data: the aggregate
+    extracts, and the Parquet copy with `storage` "parquet".
+
+    Parameters
+    ----------
+    storage : str, optional
+        "csv", or "parquet" to also write the joined data to Parquet (default is "csv").
+    """
+    import pandas as pd
+
+    from src.data_preperation.aggregate_cubes import build_cubes
+
+    df = pd.read_csv(JOINED_PATH)
+    if storage == "parquet":
+        from src.data_preperation.columnar_storage import write_joined_parquet
+
+        write_joined_parquet(df)
+    build_cubes(df)
+
+
+def pipeline(
+    stages=("load", "join"), workers=4, storage="csv", compact=False, resume=False
+):
+    """
+    Run the load and join steps as one task graph, with independent tasks at the same time.
+
+    See `build_pipeline`.
+
+    Parameters
+    ----------
+    stages : tuple, optional
+        "load" to scrape and combine, "join" to join, or both (default is both).
+    workers : int, optional
+        Tasks run at the same time (default is 4).
+    storage : str, optional
+        "csv" or "parquet" input for the join (default is "csv").
+    compact : bool, optional
+        Join with categorical text and small integer counts (default is False).
+    resume : bool, optional
+        Only scrape the season pages not saved by a previous run (default is False).
+
+    Returns
+    -------
+    dict
+        Task names mapped to their results.
+    """
+    from src.data_preperation.pipeline import build_pipeline
+
+    results = build_pipeline(
+        stages=stages, storage=storage, compact=compact, resume=resume
+    ).run(workers=workers)
+    not_saved = {
+        name[len("scrape_") :]: seasons
+        for name, seasons in results.items()
+        if name.startswith("scrape_") and seasons
+    }
+    if not_saved:
+        missing = sum(len(seasons) for seasons in not_saved.values())
+        print(
+            f"{missing} season pages were not saved: {not_saved}. "
+            "Run again with --resume to fetch only these."
+        )
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Scrape, combine, join and aggregate the Premier League and Championship data.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scrape_parser = subparsers.add_parser(
+        "scrape", help="Fetch every season page and save the per-season CSVs"
+    )
+    scrape_parser.add_argument(
+        "--league-metrics",
+        nargs="+",
+        choices=LEAGUE_METRICS,
+        default=LEAGUE_METRICS,
+        help="League metrics to scrape (default is all four)",
+    )
+    scrape_parser.add_argument(
+        "--end-season",
+        type=int,
+        default=2024,
+        help="The season after the last season to scrape",
+    )
+    scrape_parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        dest="max_workers",
+        help="Seasons fetched at the same time",
+    )
+    scrape_parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=10,
+        help="Requests per second allowed to each host",
+    )
+    scrape_parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=4,
+        help="Concurrent requests allowed to each host",
+    )
+    scrape_parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries of a request after a timeout or server error",
+    )
+    scrape_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30,
+        help="Seconds to wait for the server before retrying",
+    )
+    scrape_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only fetch the season pages not saved by a previous scrape",
+    )
+
+    reparse_parser = subparsers.add_parser(
+        "reparse",
+        help="Rebuild the per-season CSVs from the archived pages without the network",
+    )
+    reparse_parser.add_argument(
+        "--league-metrics",
+        nargs="+",
+        choices=LEAGUE_METRICS,
+        default=LEAGUE_METRICS,
+        help="League metrics to re-parse (default is all four)",
+    )
+    reparse_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        dest="max_workers",
+        help="Worker processes parsing pages (default is the number of CPUs)",
+    )
+
+    combine_parser = subparsers.add_parser(
+        "combine", help="Combine the per-season CSVs of each league metric"
+    )
+    combine_parser.add_argument(
+        "--league-metrics",
+        nargs="+",
+        choices=LEAGUE_METRICS,
+        default=LEAGUE_METRICS,
+        help="League metrics to combine (default is all four)",
+    )
+    combine_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rewrite every season instead of only the seasons that changed",
+    )
+    combine_parser.add_argument(
+        "--no-parquet",
+        action="store_false",
+        dest="parquet",
+        help="Do not write the Parquet dataset",
+    )
+
+    join_parser = subparsers.add_parser(
+        "join", help="Join, check, format and save the combined data"
+    )
+    join_parser.add_argument(
+        "--storage",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Input read by the join, and a Parquet copy of the output with parquet",
+    )
+    join_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Join with categorical text and small integer counts to cut peak memory",
+    )
+    join_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the processed leagues and join cached by an earlier run",
+    )
+    join_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only join the seasons that changed since the last incremental join",
+    )
+    join_parser.add_argument(
+        "--backend",
+        choices=["pandas", "polars"],
+        default="pandas",
+        help="Engine running the join",
+    )
+    join_parser.add_argument(
+        "--cubes",
+        action="store_true",
+        help="Also build the aggregate extracts of the joined data",
+    )
+    join_parser.add_argument(
+        "--unformatted",
+        action="store_true",
+        help="Save the checked join without formatting it, for the format subcommand",
+    )
+
+    format_parser = subparsers.add_parser(
+        "format", help="Format and save the join saved by join --unformatted"
+    )
+    format_parser.add_argument(
+        "--storage",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Also write the joined data to Parquet with parquet",
+    )
+    format_parser.add_argument(
+        "--cubes",
+        action="store_true",
+        help="Also build the aggregate extracts of the joined data",
+    )
+
+    aggregate_parser = subparsers.add_parser(
+        "aggregate", help="Rebuild the aggregate extracts from the joined CSV"
+    )
+    aggregate_parser.add_argument(
+        "--storage",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Also write the joined data to Parquet with parquet",
+    )
+
+    pipeline_parser = subparsers.add_parser(
+        "pipeline", help="Scrape, combine and join as one task graph"
+    )
+    pipeline_parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=["load", "join"],
+        default=["load", "join"],
+        help="Stages to run (default is both)",
+    )
+    pipeline_parser.add_argument(
+        "--workers", type=int, default=4, help="Tasks run at the same time"
+    )
+    pipeline_parser.add_argument(
+        "--storage",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Input read by the join, and a Parquet copy of the output with parquet",
+    )
+    pipeline_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Join with categorical text and small integer counts to cut peak memory",
+    )
+    pipeline_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only scrape the season pages not saved by a previous run",
+    )
+    return parser
+
+
+COMMANDS = {
+    "scrape": scrape,
+    "reparse": reparse,
+    "combine": combine,
+    "join": join,
+    "format": format_joined,
+    "aggregate": aggregate,
+    "pipeline": pipeline,
+}
+
+
+def main(argv=None):
+    args = vars(build_parser().parse_args(argv))
+    COMMANDS[args.pop("command")](**args)
+
+    from src.data_preperation.instrumentation import report
+
+    # Print the stage summary when run with PIPELINE_TRACE set
+    report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from src.data_preperation.instrumentation import stage
+from src.data_preperation.load_pl_championship_data import save_manifest
+
+# Every grouping of the cubes, aggregated once from the joined rows
+DIMENSIONS = [
+    "Season Start (PL)",
+    "Season (PL)",
+    "Team (PL)",
+    "Team (Champ.)",
+    "Country",
+    "same_team",
+]
+MEASURES = ["Goals (PL)", "Assists (PL)", "Goals (Champ.)", "Assists (Champ.)"]
+SEASON = "Season Start (PL)"
+
+# Cubes without a season are rolled up from one with a season and their dimensions
+CUBES = {
+    "season": ["Season Start (PL)", "Season (PL)"],
+    "team_season": ["Season Start (PL)", "Season (PL)", "Team (PL)"],
+    "champ_team_season": ["Season Start (PL)", "Season (PL)", "Team (Champ.)"],
+    "country": ["Country"],
+    "country_season": ["Season Start (PL)", "Season (PL)", "Country"],
+    "same_team": ["same_team"],
+    "same_team_season": ["Season Start (PL)", "Season (PL)", "same_team"],
+    "team_same_team_season": [
+        "Season Start (PL)",
+        "Season (PL)",
+        "Team (PL)",
+        "same_team",
+    ],
+}
+
+
+def base_cube(df):
+    """
+    Aggregate the joined rows over every dimension of the cubes at once.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined and formatted data.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per combination of `DIMENSIONS` with the number of players
+        and the sums of `MEASURES`, missing if every value is, sorted by the
+        dimensions.
+    """
+    grouped = df.groupby(DIMENSIONS, dropna=False, sort=True)
+    cube = grouped[MEASURES].sum(min_count=1)
+    cube.insert(0, "Players", grouped.size())
+    return cube.reset_index()
+
+
+def roll_up(parent, dimensions):
+    """
+    Aggregate a cube over fewer dimensions and add ratios of the sums.
+
+    Parameters
+    ----------
+    parent : pd.DataFrame
+        Output of `base_cube` or `roll_up`, with every dimension kept.
+    dimensions : list
+        Dimensions kept.
+
+    Returns
+    -------
+    pd.DataFrame
+        The cube, with 'Goals per Player (PL)' and 'Goal Conversion', the
+        Premier League goals per Championship goal of the season before,
+        missing where there were no Championship goals.
+    """
+    cube = (
+        parent.groupby(dimensions, dropna=False, sort=True)[["Players", *MEASURES]]
+        .sum(min_count=1)
+        .reset_index()
+    )
+    cube["Goals per Player (PL)"] = cube["Goals (PL)"] / cube["Players"]
+    cube["Goal Conversion"] = (cube["Goals (PL)"] / cube["Goals (Champ.)"]).where(
+        cube["Goals (Champ.)"] > 0
+    )
+    return cube
+
+
+def roll_up_cubes(base, cubes, built=None):
+    """
+    Roll up cubes, each from the smallest cube already built that has its dimensions.
+
+    Counts and sums add up exactly, so e.g. the 'season' cube is rolled up
+    from the few rows of 'same_team_season' instead of the base cube.
+
+    Parameters
+    ----------
+    base : pd.DataFrame
+        Output of `base_cube`, used for cubes with no smaller parent.
+    cubes : dict
+        Names of the cubes to build mapped to their dimensions, from `CUBES`.
+    built : dict, optional
+        Cubes of `CUBES` already built, that can be rolled up further.
+
+    Returns
+    -------
+    dict
+        Cube names mapped to the cubes, in the order of `cubes`.
+    """
+    built = dict(built or {})
+    for name, dimensions in sorted(cubes.items(), key=lambda item: -len(item[1])):
+        parents = [
+            cube
+            for parent, cube in built.items()
+            if set(dimensions) <= set(CUBES[parent])
+        ]
+        built[name] = roll_up(min(parents, key=len) if parents else base, dimensions)
+    return {name: built[name] for name in cubes}
+
+
+def season_fingerprints(df):
+    """
+    Hash the joined rows of each Premier League season, to find the seasons that changed.
+
+    Only the columns the cubes are built from are hashed.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined and formatted data.
+
+    Returns
+    -------
+    dict
+        Season start years, as strings, mapped to the hex digest of their rows.
+    """
+    hashes = pd.util.hash_pandas_object(
+        df[DIMENSIONS + MEASURES], index=False
+    ).to_numpy()
+    return {
+        str(season): hashlib.sha256(hashes[positions].tobytes()).hexdigest()
+        for season, positions in df.groupby("Season Start (PL)").indices.items()
+    }
+
+
+def write_extract(df, file_path):
+    """
+    Write a cube to CSV if its contents changed.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The cube.
+    file_path : str
+        Path of the extract.
+
+    Returns
+    -------
+    bool
+        Whether the file was written.
+    """
+    content = df.to_csv(index=False)
+    if os.path.exists(file_path):
+        with open(file_path, "r", newline="") as file:
+            if file.read() == content:
+                return False
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w", newline="") as file:
+        file.write(content)
+    os.replace(temp_path, file_path)
+    return True
+
+
+@stage("aggregate")
+def build_cubes(df, output_dir="data/aggregates", incremental=True):
+    """
+    Build the aggregate cubes of the joined data and write each as a CSV extract.
+
+    The joined rows are aggregated once over every dimension into a base
+    cube, and the cubes of `CUBES` are rolled up from it. A cube with a
+    season dimension only depends on the rows of each of its seasons, so
+    with `incremental` these cubes are kept in Parquet files next to a
+    manifest holding a fingerprint of each season's rows, and only the rows
+    of the seasons that changed are aggregated and replaced in them. A change
+    to the latest season aggregates only that season's rows. The other cubes
+    are rolled up from the small seasonal cubes. Extracts whose contents did
+    not change are not rewritten.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined and formatted data.
+    output_dir : str, optional
+        Directory of the extracts (default is "data/aggregates").
+    incremental : bool, optional
+        Only aggregate the seasons that changed since the last build (default is True).
+
+    Returns
+    -------
+    dict
+        Cube names mapped to the cubes, in the order of `CUBES`.
+    """
+    state_dir = os.path.join(output_dir, "state")
+    os.makedirs(state_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    seasonal = {name: dims for name, dims in CUBES.items() if SEASON in dims}
+    state_paths = {
+        name: os.path.join(state_dir, f"{name}.parquet") for name in seasonal
+    }
+    fingerprints = season_fingerprints(df)
+
+    manifest = None
+    if (
+        incremental
+        and os.path.exists(manifest_path)
+        and all(os.path.exists(path) for path in state_paths.values())
+    ):
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+        if manifest["columns"] != DIMENSIONS + MEASURES or manifest["cubes"] != list(
+            seasonal
+        ):
+            manifest = None
+
+    if manifest is None:
+        changed = [int(season) for season in fingerprints]
+        rows = df
+    else:
+        old = manifest["seasons"]
+        changed = [
+            int(season)
+            for season in fingerprints.keys() | old.keys()
+            if fingerprints.get(season) != old.get(season)
+        ]
+        rows = df[df[SEASON].isin(changed)]
+
+    cubes = roll_up_cubes(base_cube(rows), seasonal)
+    if manifest is not None:
+        # Keep the seasons that did not change and put the new rows in order
+        for name, dimensions in seasonal.items():
+            previous = pd.read_parquet(state_paths[name])
+            cubes[name] = pd.concat(
+                [previous[~previous[SEASON].isin(changed)], cubes[name]],
+                ignore_index=True,
+            ).sort_values(dimensions, kind="stable", ignore_index=True)
+    if changed:
+        for name, path in state_paths.items():
+            cubes[name].to_parquet(path, index=False)
+
+    other = {name: dims for name, dims in CUBES.items() if name not in seasonal}
+    cubes.update(roll_up_cubes(None, other, built=cubes))
+    cubes = {name: cubes[name] for name in CUBES}
+    written = [
+        name
+        for name, cube in cubes.items()
+        if write_extract(cube, os.path.join(output_dir, f"{name}.csv"))
+    ]
+
+    manifest = {
+        "columns": DIMENSIONS + MEASURES,
+        "cubes": list(seasonal),
+        "seasons": fingerprints,
+    }
+    save_manifest(manifest, manifest_path)
+    print(f"Wrote {len(written)} of {len(cubes)} aggregate extracts to {output_dir}.")
+    return cubes
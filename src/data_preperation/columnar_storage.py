@@ -0,0 +1,258 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.data_preperation.instrumentation import stage
+from src.data_preperation.load_pl_championship_data import read_season_csv
+
+PARTITION_SCHEMA = pa.schema([("season_start", pa.int16())])
+
+
+def league_metric_schema(metric):
+    """
+    Explicit Parquet schema for a league metric's season files.
+
+    Team and Country are dictionary encoded and counts are small integers.
+    'season_start' is not stored in the files as it is the partition key.
+
+    Parameters
+    ----------
+    metric : str
+        Either 'goals' or 'assists'.
+
+    Returns
+    -------
+    pa.Schema
+        The schema of each season file.
+    """
+    return pa.schema(
+        [
+            ("Player", pa.string()),
+            ("Country", pa.dictionary(pa.int16(), pa.string())),
+            ("Team", pa.dictionary(pa.int16(), pa.string())),
+            (metric.capitalize(), pa.int16()),
+            ("Season", pa.string()),
+        ]
+    )
+
+
+def split_league_metric(league_metric):
+    """
+    Split a league metric name (e.g., "premier_league_goals") into league and metric.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name.
+
+    Returns
+    -------
+    tuple
+        The league (e.g., "premier_league") and metric (e.g., "goals").
+    """
+    league, metric = league_metric.rsplit("_", 1)
+    return league, metric
+
+
+def league_metric_dataset_path(league_metric, root="data/parquet"):
+    """
+    Directory of a league metric's Parquet dataset.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    root : str, optional
+        Root directory of the Parquet datasets (default is "data/parquet").
+
+    Returns
+    -------
+    str
+        The dataset directory, partitioned as `league=<league>/metric=<metric>`.
+    """
+    league, metric = split_league_metric(league_metric)
+    return os.path.join(root, f"league={league}", f"metric={metric}")
+
+
+@stage("write")
+def write_league_metric_parquet(league_metric, data_dir="data", root="data/parquet"):
+    """
+    Write a league metric's per-season CSVs as a Parquet dataset partitioned by season.
+
+    Each season is written to `<root>/league=<league>/metric=<metric>/season_start=<year>/part-0.parquet`,
+    with the year taken from the CSV's filename. Seasons without rows are
+    skipped. The dataset is written to a new directory that then replaces the
+    previous one, so seasons removed or renamed since the last write do not
+    leave their partitions behind.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    data_dir : str, optional
+        Root directory of the per-season CSVs (default is "data").
+    root : str, optional
+        Root directory of the Parquet datasets (default is "data/parquet").
+    """
+    _, metric = split_league_metric(league_metric)
+    schema = league_metric_schema(metric)
+    directory_path = os.path.join(data_dir, league_metric)
+    dataset_path = league_metric_dataset_path(league_metric, root=root)
+    temp_path = f"{dataset_path}.tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+
+    for filename in sorted(os.listdir(directory_path)):
+        if filename.endswith(".csv"):
+            df = read_season_csv(os.path.join(directory_path, filename))
+            if df.empty:
+                continue
+            season_start = int(filename[:4])
+
+            table = pa.Table.from_pandas(
+                df.drop(columns=["season_start"]), schema=schema, preserve_index=False
+            )
+            partition_path = os.path.join(temp_path, f"season_start={season_start}")
+            os.makedirs(partition_path, exist_ok=True)
+            pq.write_table(table, os.path.join(partition_path, "part-0.parquet"))
+
+    shutil.rmtree(dataset_path, ignore_errors=True)
+    os.replace(temp_path, dataset_path)
+
+
+def read_league_metric(
+    league_metric, columns=None, seasons=None, compact=True, root="data/parquet"
+):
+    """
+    Read a league metric's Parquet dataset, the columnar equivalent of `combine_csvs`.
+
+    Only the requested columns are read, and season partitions outside the
+    requested range are skipped without being opened.
+
+    Text is read into categoricals from the dictionary encoded columns. With
+    `compact=False` they are expanded to object strings, which costs more
+    than the whole read, so a full load with the dtypes of `combine_csvs` is
+    slower than reading the combined CSV.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    columns : list, optional
+        Columns to read (default is all columns, including 'season_start').
+    seasons : tuple, optional
+        Inclusive (first, last) range of 'season_start' years to read (default is all seasons).
+    compact : bool, optional
+        Keep Team and Country as categoricals and counts as small integers
+        (default is True). If False, returns the same dtypes as `combine_csvs`.
+    root : str, optional
+        Root directory of the Parquet datasets (default is "data/parquet").
+
+    Returns
+    -------
+    pd.DataFrame
+        The combined data for all matching seasons, in season order.
+    """
+    dataset = ds.dataset(
+        league_metric_dataset_path(league_metric, root=root),
+        format="parquet",
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor="hive"),
+    )
+
+    filter_expression = None
+    if seasons is not None:
+        first, last = seasons
+        filter_expression = (ds.field("season_start") >= first) & (
+            ds.field("season_start") <= last
+        )
+
+    df = dataset.to_table(columns=columns, filter=filter_expression).to_pandas()
+
+    if not compact:
+        df = expand_dtypes(df)
+    return df
+
+
+def expand_dtypes(df):
+    """
+    Convert categorical columns to object strings and small integers to int64.
+
+    This gives the same dtypes as reading the equivalent CSV with `pd.read_csv`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame read from Parquet.
+
+    Returns
+    -------
+    pd.DataFrame
+        The DataFrame with expanded dtypes.
+    """
+    for column, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[column] = df[column].astype("int64")
+    return df
+
+
+def write_joined_parquet(
+    df, file_path="data/premier_league_championship_joined.parquet"
+):
+    """
+    Write the joined dataset to Parquet with dictionary encoded text columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined and formatted DataFrame.
+    file_path : str, optional
+        Path of the Parquet file (default is "data/premier_league_championship_joined.parquet").
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table,
+        file_path,
+        use_dictionary=[
+            column
+            for column in [
+                "Country",
+                "Team (PL)",
+                "Team (Champ.)",
+                "Season (PL)",
+                "Season (Champ.)",
+            ]
+            if column in df.columns
+        ],
+    )
+
+
+def read_joined_parquet(
+    file_path="data/premier_league_championship_joined.parquet",
+    columns=None,
+    filters=None,
+):
+    """
+    Read the joined dataset from Parquet.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Path of the Parquet file (default is "data/premier_league_championship_joined.parquet").
+    columns : list, optional
+        Columns to read (default is all columns).
+    filters : list, optional
+        Row group filters in `pyarrow.parquet.read_table` form, e.g.
+        `[("Season Start (PL)", ">=", 2014)]`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined dataset.
+    """
+    return pq.read_table(file_path, columns=columns, filters=filters).to_pandas()
@@ -0,0 +1,304 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from src.data_preperation.load_pl_championship_data import (
+    parse_season_html,
+    save_season_data,
+)
+
+# Compressed bytes read at a time when scanning the archive
+SCAN_CHUNK_SIZE = 64 * 1024
+
+
+class HTMLArchive:
+    """
+    Append-only compressed archive of every fetched season page, for re-parsing without the network.
+
+    Each page is appended to `pages.gz` as its own gzip member: a JSON header
+    line with the league, metric, season, URL, content hash and fetch time,
+    followed by the HTML. Concatenated gzip members are a valid gzip file,
+    so the whole archive can be read with `gzip.open`. An index maps each
+    (league, metric, season) to the offset and length of its latest record,
+    so one page is read without decompressing the others. A page is only
+    appended when its content differs from its latest record, and complete
+    records are never rewritten.
+
+    Parameters
+    ----------
+    archive_dir : str, optional
+        Directory holding the archive (default is "data/html_archive").
+    """
+
+    def __init__(self, archive_dir="data/html_archive"):
+        self.archive_dir = archive_dir
+        self.pages_path = os.path.join(archive_dir, "pages.gz")
+        self.index_path = os.path.join(archive_dir, "index.json")
+        self.lock = threading.Lock()
+
+        os.makedirs(archive_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as file:
+                self.entries = json.load(file)
+        else:
+            self.entries = {"size": 0, "pages": {}}
+        # Records appended after the index was last saved, e.g. by an interrupted run
+        if self.entries["size"] != self._pages_size():
+            self.entries = self.scan()
+            if self.entries["size"] < self._pages_size():
+                # Drop a record cut short, so new records follow the last complete one
+                with open(self.pages_path, "r+b") as file:
+                    file.truncate(self.entries["size"])
+            self._save_index()
+
+    @staticmethod
+    def key(league, metric, season):
+        return f"{league}/{metric}/{season}"
+
+    def _pages_size(self):
+        return (
+            os.path.getsize(self.pages_path) if os.path.exists(self.pages_path) else 0
+        )
+
+    def _save_index(self):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.index_path)
+
+    def scan(self):
+        """
+        Rebuild the index by reading every record of the archive, a chunk at a time.
+
+        Returns
+        -------
+        dict
+            'size', the archive size covered, and 'pages', keys mapped to
+            the header, offset and length of their latest complete record.
+        """
+        pages = {}
+        offset = 0
+        if os.path.exists(self.pages_path):
+            with open(self.pages_path, "rb") as file:
+                while True:
+                    # Decompress one record at a time from its offset, keeping
+                    # only its header line
+                    file.seek(offset)
+                    decompressor = zlib.decompressobj(wbits=31)
+                    head = b""
+                    read = 0
+                    while not decompressor.eof:
+                        chunk = file.read(SCAN_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        read += len(chunk)
+                        content = decompressor.decompress(chunk)
+                        if b"\n" not in head:
+                            head += content
+                    if not decompressor.eof:
+                        # The end of the archive, or a record cut short by an
+                        # interrupted write
+                        break
+                    length = read - len(decompressor.unused_data)
+                    header = json.loads(head.split(b"\n", 1)[0])
+                    key = self.key(header["league"], header["metric"], header["season"])
+                    pages[key] = {**header, "offset": offset, "length": length}
+                    offset += length
+        return {"size": offset, "pages": pages}
+
+    def append(self, league, metric, season, url, html):
+        """
+        Append a fetched page, unless its latest record has the same content.
+
+        Parameters
+        ----------
+        league : str
+            The league (e.g., "premier_league").
+        metric : str
+            Either 'goals' or 'assists'.
+        season : str
+            Season string in the format "YYYY-YYYY".
+        url : str
+            The URL the page was fetched from.
+        html : str
+            The HTML content of the page.
+
+        Returns
+        -------
+        bool
+            Whether a record was appended.
+        """
+        content = html.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        key = self.key(league, metric, season)
+        header = {
+            "league": league,
+            "metric": metric,
+            "season": season,
+            "url": url,
+            "sha256": digest,
+            "fetched_at": time.time(),
+        }
+        with self.lock:
+            latest = self.entries["pages"].get(key)
+            if latest is not None and latest["sha256"] == digest:
+                return False
+            record = gzip.compress(
+                json.dumps(header).encode("utf-8") + b"\n" + content, mtime=0
+            )
+            offset = self.entries["size"]
+            with open(self.pages_path, "ab") as file:
+                file.write(record)
+            self.entries["pages"][key] = {
+                **header,
+                "offset": offset,
+                "length": len(record),
+            }
+            self.entries["size"] = offset + len(record)
+            self._save_index()
+        return True
+
+    def pages(self):
+        """
+        The latest record of every archived page, in league, metric and season order.
+
+        Returns
+        -------
+        list
+            Dictionaries with 'league', 'metric', 'season', 'url', 'sha256',
+            'fetched_at', 'offset' and 'length' keys.
+        """
+        with self.lock:
+            return [
+                dict(self.entries["pages"][key])
+                for key in sorted(self.entries["pages"])
+            ]
+
+    def read(self, league, metric, season):
+        """
+        Read the latest archived HTML of a season page.
+
+        Parameters
+        ----------
+        league : str
+            The league (e.g., "premier_league").
+        metric : str
+            Either 'goals' or 'assists'.
+        season : str
+            Season string in the format "YYYY-YYYY".
+
+        Returns
+        -------
+        str
+            The HTML content of the page.
+        """
+        with self.lock:
+            entry = self.entries["pages"][self.key(league, metric, season)]
+        return read_record(self.pages_path, entry["offset"], entry["length"])
+
+
+def read_record(pages_path, offset, length):
+    """
+    Read and decompress one archive record, returning its HTML.
+    """
+    with open(pages_path, "rb") as file:
+        file.seek(offset)
+        record = gzip.decompress(file.read(length))
+    return record.split(b"\n", 1)[1].decode("utf-8")
+
+
+def reparse_page(pages_path, page):
+    """
+    Parse an archived page and write its season CSV, as the scrape does.
+
+    Run in the worker processes of `reparse_archive`, which only receive the
+    location of the record rather than its HTML.
+
+    Parameters
+    ----------
+    pages_path : str
+        Path of the archive's records.
+    page : dict
+        Entry of the page from `HTMLArchive.pages`.
+
+    Returns
+    -------
+    int
+        The number of rows parsed.
+    """
+    html = read_record(pages_path, page["offset"], page["length"])
+    season_data = parse_season_html(
+        html=html, season=page["season"], metric=page["metric"]
+    )
+    save_season_data(
+        season_data=season_data,
+        league=page["league"],
+        metric=page["metric"],
+        season=page["season"],
+    )
+    return len(season_data)
+
+
+def reparse_archive(
+    archive_dir="data/html_archive", league_metrics=None, max_workers=None
+):
+    """
+    Rebuild the per-season CSVs from the archived pages on a process pool, without the network.
+
+    Parameters
+    ----------
+    archive_dir : str, optional
+        Directory holding the archive (default is "data/html_archive").
+    league_metrics : list, optional
+        League metric names to re-parse (default is every archived page).
+    max_workers : int, optional
+        Number of worker processes (default is the number of CPUs).
+
+    Returns
+    -------
+    dict
+        'pages', 'rows', 'seconds' and 'pages_per_second'.
+    """
+    archive = HTMLArchive(archive_dir)
+    pages = [
+        page
+        for page in archive.pages()
+        if league_metrics is None
+        or f"{page['league']}_{page['metric']}" in league_metrics
+    ]
+    for page in pages:
+        os.makedirs(f"data/{page['league']}_{page['metric']}", exist_ok=True)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    # A few chunks per worker, so pages are not sent to the processes one at a time
+    chunksize = max(1, len(pages) // (4 * max_workers))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        rows = list(
+            executor.map(
+                reparse_page,
+                [archive.pages_path] * len(pages),
+                pages,
+                chunksize=chunksize,
+            )
+        )
+    seconds = time.perf_counter() - start
+
+    pages_per_second = len(pages) / seconds if seconds else float("inf")
+    print(
+        f"Re-parsed {len(pages)} pages ({sum(rows)} rows) from {archive_dir} "
+        f"in {seconds:.2f}s, {pages_per_second:.1f} pages/s."
+    )
+    return {
+        "pages": len(pages),
+        "rows": sum(rows),
+        "seconds": seconds,
+        "pages_per_second": pages_per_second,
+    }
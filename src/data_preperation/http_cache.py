@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class HTTPCache:
+    """
+    Content-addressed on-disk cache of fetched pages, keyed by URL.
+
+    Page bodies are stored once per content hash under `objects/`, and an
+    index maps each URL to its body hash along with the ETag and
+    Last-Modified validators returned by the server. Entries marked permanent
+    (e.g. closed seasons) are served without any request; other entries are
+    revalidated with a conditional request. The least recently used entries
+    are evicted once the stored bodies exceed `max_bytes`. Access times
+    recorded by cache hits are written to the index by `flush`, which should
+    be called once the run is done.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory holding the cache (default is "data/http_cache").
+    max_bytes : int, optional
+        Maximum total size of stored page bodies (default is 200 MB).
+    """
+
+    def __init__(self, cache_dir="data/http_cache", max_bytes=200 * 1024**2):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self.dirty = False
+
+        # Counters for the lifetime of this cache object
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as file:
+                self.entries = json.load(file)
+        else:
+            self.entries = {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, f"{digest}.html")
+
+    def _save_index(self):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.index_path)
+        self.dirty = False
+
+    def _total_bytes(self):
+        sizes = {entry["digest"]: entry["size"] for entry in self.entries.values()}
+        return sum(sizes.values())
+
+    def _evict(self, keep_url):
+        while self._total_bytes() > self.max_bytes and len(self.entries) > 1:
+            url = min(
+                (url for url in self.entries if url != keep_url),
+                key=lambda url: self.entries[url]["last_access"],
+            )
+            digest = self.entries.pop(url)["digest"]
+
+            # Remove the body only when no other URL shares the same content
+            if all(entry["digest"] != digest for entry in self.entries.values()):
+                os.remove(self._object_path(digest))
+
+    def lookup(self, url):
+        """
+        Return the cache entry for a URL, or None if the URL is not cached.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the page.
+
+        Returns
+        -------
+        dict
+            The entry with 'digest', 'etag', 'last_modified', 'permanent', 'size' and 'last_access' keys.
+        """
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None and not os.path.exists(
+                self._object_path(entry["digest"])
+            ):
+                # The body was removed from disk, so treat the URL as uncached
+                del self.entries[url]
+                return None
+            return entry
+
+    def conditional_headers(self, entry):
+        """
+        Build conditional request headers from a cache entry's validators.
+
+        Parameters
+        ----------
+        entry : dict or None
+            The cache entry returned by `lookup`.
+
+        Returns
+        -------
+        dict
+            'If-None-Match' and/or 'If-Modified-Since' headers, empty if there is nothing to revalidate.
+        """
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, url, permanent=False, revalidated=False):
+        """
+        Read a cached page body and record the access.
+
+        The lookup and the read are one step under the lock, so an entry
+        evicted by another thread is a miss rather than an error.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the page.
+        permanent : bool, optional
+            Mark the entry as permanent so it is no longer revalidated (default is False).
+        revalidated : bool, optional
+            Whether the body is being served after a 304 Not Modified response,
+            counted separately from hits that made no request (default is False).
+
+        Returns
+        -------
+        str
+            The cached HTML content, or None if the URL is not cached.
+        """
+        with self.lock:
+            entry = self.lookup(url)
+            if entry is None:
+                return None
+            with open(
+                self._object_path(entry["digest"]), "r", encoding="utf-8"
+            ) as file:
+                html = file.read()
+            entry["last_access"] = time.time()
+            entry["permanent"] = entry["permanent"] or permanent
+            if revalidated:
+                self.revalidated += 1
+            else:
+                self.hits += 1
+            self.dirty = True
+            return html
+
+    def store(self, url, html, etag=None, last_modified=None, permanent=False):
+        """
+        Store a downloaded page body, evicting least recently used entries if over the size cap.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the page.
+        html : str
+            The HTML content of the page.
+        etag : str, optional
+            ETag header returned with the page.
+        last_modified : str, optional
+            Last-Modified header returned with the page.
+        permanent : bool, optional
+            Whether the page will never change and should not be revalidated (default is False).
+        """
+        content = html.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(digest)
+
+        if not os.path.exists(object_path):
+            temp_path = f"{object_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, object_path)
+
+        with self.lock:
+            previous = self.entries.get(url)
+            self.entries[url] = {
+                "digest": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "permanent": permanent,
+                "size": len(content),
+                "last_access": time.time(),
+            }
+            self.misses += 1
+
+            # Drop the previous body if nothing references it any more
+            if previous is not None and previous["digest"] != digest:
+                if all(
+                    entry["digest"] != previous["digest"]
+                    for entry in self.entries.values()
+                ):
+                    os.remove(self._object_path(previous["digest"]))
+
+            self._evict(keep_url=url)
+            self._save_index()
+
+    def flush(self):
+        """
+        Write the index to disk if cache hits have changed it since it was last saved.
+        """
+        with self.lock:
+            if self.dirty:
+                self._save_index()
+
+    def stats(self):
+        """
+        Return the cache counters and current size.
+
+        Returns
+        -------
+        dict
+            Hits served without a request, revalidated (304) responses, misses,
+            network requests made, number of entries and stored bytes.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "network_requests": self.revalidated + self.misses,
+                "entries": len(self.entries),
+                "bytes": self._total_bytes(),
+            }
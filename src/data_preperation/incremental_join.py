@@ -0,0 +1,448 @@
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+from src.data_preperation.join_pl_championship_data import (
+    COMPACT_DTYPES,
+    build_rename_lookup,
+    compact_dtypes,
+    format_joined_data,
+    join_pl_champ_data,
+    process_league_data,
+    read_combined_csv,
+)
+from src.data_preperation.load_pl_championship_data import file_sha256, save_manifest
+from src.data_preperation.stage_cache import inputs_digest, source_digest
+
+MANIFEST_PATH = "data/join_manifest.json"
+JOINED_PATHS = {
+    "csv": "data/premier_league_championship_joined.csv",
+    "parquet": "data/premier_league_championship_joined.parquet",
+}
+SEASON = "Season Start (PL)"
+
+# Each league, and how many seasons before a Premier League season its rows are
+LEAGUE_LAGS = {"premier_league": 0, "championship": 1}
+
+
+def season_fingerprints(df):
+    """
+    Hash the combined rows of each season, to find the seasons that changed.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The combined data of a league metric.
+
+    Returns
+    -------
+    dict
+        Season start years, as strings, mapped to the hex digest of their rows.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return {
+        str(season): hashlib.sha256(hashes[positions].tobytes()).hexdigest()
+        for season, positions in df.groupby(
+            "season_start", observed=True
+        ).indices.items()
+    }
+
+
+def combined_csv_path(league_metric):
+    return f"data/{league_metric}/combined_seasons/{league_metric}.csv"
+
+
+def load_combine_manifest(league_metric):
+    """
+    Read the manifest of an incremental combine, if it still describes the combined CSV.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+
+    Returns
+    -------
+    dict or None
+        The manifest, or None if there is none, it records no byte offsets,
+        or the combined CSV was written after it, e.g. by a full combine.
+    """
+    csv_path = combined_csv_path(league_metric)
+    manifest_path = os.path.join(os.path.dirname(csv_path), "manifest.json")
+    if not (os.path.exists(manifest_path) and os.path.exists(csv_path)):
+        return None
+    with open(manifest_path, "r") as file:
+        manifest = json.load(file)
+    if (
+        not manifest["offsets"]
+        or manifest["combined_size"] != os.path.getsize(csv_path)
+        or os.path.getmtime(manifest_path) < os.path.getmtime(csv_path)
+    ):
+        return None
+    return manifest
+
+
+def read_csv_seasons(league_metric, manifest, seasons, compact=False):
+    """
+    Read only some seasons of a combined CSV, from the byte offsets in its combine manifest.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    manifest : dict
+        The manifest from `load_combine_manifest`.
+    seasons : list
+        Season start years to read.
+    compact : bool, optional
+        Read the columns in `COMPACT_DTYPES` with their compact dtype (default is False).
+
+    Returns
+    -------
+    pd.DataFrame
+        The combined data of the seasons, with the dtypes of the whole file.
+    """
+    entries = list(manifest["seasons"].items())
+    ends = [entry["offset"] for _, entry in entries[1:]] + [manifest["combined_size"]]
+    with open(combined_csv_path(league_metric), "rb") as file:
+        header = file.readline()
+        parts = [header]
+        for (filename, entry), end in zip(entries, ends):
+            if int(filename[:4]) in seasons:
+                file.seek(entry["offset"])
+                part = file.read(end - entry["offset"])
+                # The first season's rows follow the header
+                parts.append(part[len(header) :] if entry["offset"] == 0 else part)
+
+    # Season files agree on their types when offsets are recorded
+    dtypes = dict(column.rsplit(":", 1) for column in manifest["dtypes"])
+    if compact:
+        dtypes.update(COMPACT_DTYPES)
+    return pd.read_csv(io.BytesIO(b"".join(parts)), dtype=dtypes)
+
+
+def combined_seasons(league_metric, storage="csv", compact=False):
+    """
+    Fingerprint each season of a league metric's combined data, and read only the seasons needed.
+
+    With Parquet storage each season's partition is hashed, and with CSV
+    storage the season file hashes of the combine manifest are used, so no
+    rows are read to find what changed. Without a usable combine manifest
+    the whole combined CSV is read and its rows hashed with `season_fingerprints`.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    storage : str, optional
+        "csv" or "parquet" input (default is "csv").
+    compact : bool, optional
+        Read categorical text and small integer counts (default is False).
+
+    Returns
+    -------
+    tuple
+        Season start years, as strings, mapped to a fingerprint of their
+        data, and a function reading the combined data of a list of season
+        start years, or of every season with None.
+    """
+    if storage == "parquet":
+        from src.data_preperation.columnar_storage import (
+            league_metric_dataset_path,
+            read_league_metric,
+        )
+
+        dataset_path = league_metric_dataset_path(league_metric)
+        fingerprints = {
+            partition.split("=")[1]: inputs_digest(
+                [os.path.join(dataset_path, partition)]
+            )
+            for partition in sorted(os.listdir(dataset_path))
+            if partition.startswith("season_start=")
+        }
+
+        def read(seasons):
+            if seasons is None:
+                df = read_league_metric(league_metric, compact=compact)
+            else:
+                df = read_league_metric(
+                    league_metric, seasons=(min(seasons), max(seasons)), compact=compact
+                )
+                df = df[df["season_start"].isin(seasons).to_numpy(dtype=bool)]
+            return compact_dtypes(df) if compact else df
+
+        return fingerprints, read
+
+    manifest = load_combine_manifest(league_metric)
+    if manifest is not None:
+        fingerprints = {
+            filename[:4]: entry["sha256"]
+            for filename, entry in manifest["seasons"].items()
+        }
+
+        def read(seasons):
+            if seasons is None:
+                return read_combined_csv(combined_csv_path(league_metric), compact)
+            return read_csv_seasons(league_metric, manifest, seasons, compact)
+
+        return fingerprints, read
+
+    df = read_combined_csv(combined_csv_path(league_metric), compact)
+    fingerprints = season_fingerprints(df)
+
+    def read(seasons):
+        if seasons is None:
+            return df
+        in_seasons = df["season_start"].isin(seasons).to_numpy(dtype=bool)
+        return df[in_seasons].reset_index(drop=True)
+
+    return fingerprints, read
+
+
+def join_key(rename_lookup, storage, compact):
+    """
+    Describe what the joined rows depend on besides the combined data.
+
+    A joined dataset built with a different key is not merged into, as any
+    of its rows could differ.
+
+    Parameters
+    ----------
+    rename_lookup : pd.Series
+        Lookup of the player renames from `build_rename_lookup`.
+    storage : str
+        "csv" or "parquet", the input and the joined file merged into.
+    compact : bool
+        Whether the combined data is read with compact dtypes.
+
+    Returns
+    -------
+    dict
+        The digest of the join code and of the renames, the storage and
+        whether dtypes are compact.
+    """
+    from src.data_preperation.columnar_storage import read_joined_parquet
+    from src.data_preperation.player_ids import PlayerIds
+
+    renames = pd.util.hash_pandas_object(rename_lookup.reset_index(), index=False)
+    return {
+        "code": source_digest(update_joined_data, read_joined_parquet, PlayerIds),
+        "renames": hashlib.sha256(renames.to_numpy().tobytes()).hexdigest(),
+        "storage": storage,
+        "compact": compact,
+    }
+
+
+def load_join_manifest(key, joined_path, manifest_path=MANIFEST_PATH):
+    """
+    Read the manifest of the last incremental join, if the joined data still matches it.
+
+    Parameters
+    ----------
+    key : dict
+        The key from `join_key`.
+    joined_path : str
+        Path of the joined file the manifest was saved with.
+    manifest_path : str, optional
+        Path of the manifest (default is "data/join_manifest.json").
+
+    Returns
+    -------
+    dict or None
+        The manifest, or None if there is none, it was built with another key
+        or the joined file was written since (e.g. by a full join of other data).
+    """
+    if not (os.path.exists(manifest_path) and os.path.exists(joined_path)):
+        return None
+    with open(manifest_path, "r") as file:
+        manifest = json.load(file)
+    if manifest["key"] != key or manifest["joined_sha256"] != file_sha256(joined_path):
+        return None
+    return manifest
+
+
+def save_join_manifest(manifest, joined_path, manifest_path=MANIFEST_PATH):
+    """
+    Save the manifest returned by `update_joined_data` once the joined data is written.
+
+    Parameters
+    ----------
+    manifest : dict
+        The manifest from `update_joined_data`.
+    joined_path : str
+        Path of the joined file written.
+    manifest_path : str, optional
+        Path of the manifest (default is "data/join_manifest.json").
+    """
+    manifest["joined_sha256"] = file_sha256(joined_path)
+    save_manifest(manifest, manifest_path)
+
+
+def affected_seasons(old, new):
+    """
+    Find the Premier League seasons whose joined rows depend on a changed season.
+
+    A Premier League season is joined to the previous Championship season,
+    so a changed Championship season affects the Premier League season after it.
+
+    Parameters
+    ----------
+    old : dict
+        League metric names mapped to their `season_fingerprints` at the last join.
+    new : dict
+        League metric names mapped to their current `season_fingerprints`.
+
+    Returns
+    -------
+    list
+        Sorted season start years of the affected Premier League seasons.
+    """
+    seasons = set()
+    for league_metric, fingerprints in new.items():
+        previous = old.get(league_metric, {})
+        lag = next(
+            lag
+            for league, lag in LEAGUE_LAGS.items()
+            if league_metric.startswith(f"{league}_")
+        )
+        seasons |= {
+            int(season) + lag
+            for season in fingerprints.keys() | previous.keys()
+            if fingerprints.get(season) != previous.get(season)
+        }
+    return sorted(seasons)
+
+
+def read_joined(joined_path):
+    """
+    Read the saved joined data from CSV or Parquet.
+    """
+    if joined_path.endswith(".parquet"):
+        from src.data_preperation.columnar_storage import read_joined_parquet
+
+        return read_joined_parquet(joined_path)
+    return pd.read_csv(joined_path)
+
+
+def merge_seasons(previous, joined, seasons):
+    """
+    Replace the rows of some Premier League seasons of the saved joined data.
+
+    Parameters
+    ----------
+    previous : pd.DataFrame
+        The saved joined and formatted data.
+    joined : pd.DataFrame
+        The joined and formatted rows of `seasons`.
+    seasons : list
+        Season start years of the Premier League seasons to replace.
+
+    Returns
+    -------
+    pd.DataFrame
+        The merged rows, sorted by season start and player as `format_joined_data` does.
+    """
+    kept = previous[~previous[SEASON].isin(seasons)]
+    # A few seasons can have no missing counts, where all seasons together do
+    joined = joined.astype(kept.dtypes.to_dict())
+    # Each season's rows come from one side, so a stable sort keeps their order
+    return pd.concat([kept, joined], ignore_index=True).sort_values(
+        [SEASON, "Player"], kind="stable", ignore_index=True
+    )
+
+
+def update_joined_data(
+    duplicated_player_names,
+    player_ids=None,
+    storage="csv",
+    compact=False,
+    manifest_path=MANIFEST_PATH,
+):
+    """
+    Join only the seasons affected by new or changed combined data, and merge them into the saved joined data.
+
+    A manifest saved with each incremental join holds a fingerprint of every
+    season of the four league metrics, from `combined_seasons`. The Premier
+    League seasons whose data changed, and those after a changed
+    Championship season, are read, processed, joined and formatted alone,
+    as each (season, season + 1) transition only depends on the rows of
+    those two seasons. Their rows replace the same seasons of the saved
+    joined data. The result is the same as a full rebuild with
+    `process_league_data`, `join_pl_champ_data` and `format_joined_data`,
+    which is done instead when there is no manifest, the saved joined file
+    was written since, or the join code, renames, storage or dtypes changed.
+
+    Parameters
+    ----------
+    duplicated_player_names : list or pd.Series
+        List of names of duplicated players to rename, or a lookup built once
+        with `build_rename_lookup`.
+    player_ids : PlayerIds, optional
+        Dictionary of player IDs, passed to `process_league_data`.
+    storage : str, optional
+        "csv" or "parquet" input, and the saved joined file to merge into
+        (default is "csv").
+    compact : bool, optional
+        Join with categorical text and small integer counts (default is False).
+    manifest_path : str, optional
+        Path of the manifest (default is "data/join_manifest.json").
+
+    Returns
+    -------
+    tuple
+        The joined and formatted data, and the manifest to save with
+        `save_join_manifest` once the joined data is written.
+    """
+    if not isinstance(duplicated_player_names, pd.Series):
+        duplicated_player_names = build_rename_lookup(duplicated_player_names)
+    joined_path = JOINED_PATHS[storage]
+    key = join_key(duplicated_player_names, storage, compact)
+    sources = {
+        f"{league}_{metric}": combined_seasons(f"{league}_{metric}", storage, compact)
+        for league in LEAGUE_LAGS
+        for metric in ["goals", "assists"]
+    }
+    fingerprints = {
+        league_metric: source[0] for league_metric, source in sources.items()
+    }
+
+    manifest = load_join_manifest(key, joined_path, manifest_path)
+    seasons = None
+    if manifest is not None:
+        seasons = affected_seasons(manifest["seasons"], fingerprints)
+
+    if seasons == []:
+        pl_champ_merged = read_joined(joined_path)
+    else:
+        processed = {}
+        for league, lag in LEAGUE_LAGS.items():
+            league_seasons = None if seasons is None else [s - lag for s in seasons]
+            processed[league] = process_league_data(
+                goals_df=sources[f"{league}_goals"][1](league_seasons),
+                assists_df=sources[f"{league}_assists"][1](league_seasons),
+                duplicated_player_names=duplicated_player_names,
+                player_ids=player_ids,
+            )
+        if player_ids is not None:
+            player_ids.save()
+        pl_champ_merged = format_joined_data(
+            join_pl_champ_data(
+                pl_df=processed["premier_league"], champ_df=processed["championship"]
+            )
+        )
+        if seasons is not None:
+            pl_champ_merged = merge_seasons(
+                read_joined(joined_path), pl_champ_merged, seasons
+            )
+
+    if seasons is None:
+        print("Incremental join: no matching manifest, joined every season.")
+    else:
+        print(
+            f"Incremental join: joined {len(seasons)} changed Premier League "
+            f"season(s) {seasons}, kept the other saved rows."
+        )
+    return pl_champ_merged, {"key": key, "seasons": fingerprints}
@@ -0,0 +1,367 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Set to an output path (or "1" for the summary only) to enable instrumentation
+ENV_VAR = "PIPELINE_TRACE"
+
+# Values of the environment variable that disable it, or only enable the summary
+OFF_VALUES = {"", "0", "false", "no", "off"}
+SUMMARY_VALUES = {"1", "true", "yes", "on"}
+
+
+def trace_setting(value):
+    """
+    Parse the value of the PIPELINE_TRACE environment variable.
+
+    Parameters
+    ----------
+    value : str or None
+        The value, or None if it is not set.
+
+    Returns
+    -------
+    tuple
+        Whether instrumentation is enabled, and the output path, or None
+        for the summary only.
+    """
+    if value is None or value.strip().lower() in OFF_VALUES:
+        return False, None
+    if value.strip().lower() in SUMMARY_VALUES:
+        return True, None
+    return True, value
+
+
+_enabled = trace_setting(os.environ.get(ENV_VAR))[0]
+_records = []
+_lock = threading.Lock()
+_local = threading.local()
+_origin = time.perf_counter()
+
+
+def enable():
+    """
+    Start recording pipeline stages.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Stop recording pipeline stages. Recorded stages are kept until `reset`.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """
+    Whether pipeline stages are being recorded.
+
+    Returns
+    -------
+    bool
+        True if instrumentation is enabled.
+    """
+    return _enabled
+
+
+def reset():
+    """
+    Discard all recorded stages.
+    """
+    global _origin
+    with _lock:
+        _records.clear()
+        _origin = time.perf_counter()
+
+
+def records():
+    """
+    Return a copy of the recorded stages in the order they finished.
+
+    Returns
+    -------
+    list
+        One dictionary per stage with 'name', 'start_s', 'wall_s', 'cpu_s',
+        'max_rss_delta_bytes', 'rows_in', 'rows_out', 'thread', 'depth' and
+        'nested' keys, where 'nested' is whether a stage of the same name
+        encloses it on the same thread.
+    """
+    with _lock:
+        return [dict(record) for record in _records]
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def count_rows(value):
+    """
+    Count the rows of a DataFrame, or of the DataFrames in a tuple, list or dict.
+
+    Parameters
+    ----------
+    value : object
+        The value to count rows of.
+
+    Returns
+    -------
+    int
+        The number of rows, or None if `value` holds no DataFrames.
+    """
+    if hasattr(value, "shape") and hasattr(value, "columns"):
+        return len(value)
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (tuple, list)):
+        counts = [count_rows(item) for item in value]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+class stage:
+    """
+    Record the wall time, CPU time, peak RSS increase and row counts of a pipeline stage.
+
+    Use as a context manager, setting row counts on the returned object, or as
+    a decorator, which counts the rows of DataFrame arguments and results.
+    Nothing is measured while instrumentation is disabled, so an instrumented
+    function costs one flag check per call.
+
+    CPU time is for the whole process, so it includes other threads running
+    at the same time. The RSS increase is how far the stage raised the
+    process's peak resident memory, which is 0 if it stayed below an earlier peak.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage (e.g., "fetch", "merge").
+    rows_in : int, optional
+        Number of input rows.
+
+    Examples
+    --------
+    >>> with stage("merge", rows_in=len(goals_df) + len(assists_df)) as current:
+    ...     merged_df = pd.merge(assists_df, goals_df, how="outer")
+    ...     current.rows_out = len(merged_df)
+
+    >>> @stage("group")
+    ... def group_data(merged_df):
+    ...     ...
+    """
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self._active = False
+
+    def __enter__(self):
+        self._active = _enabled
+        if self._active:
+            if not hasattr(_local, "names"):
+                _local.names = []
+            self._depth = len(_local.names)
+            self._nested = self.name in _local.names
+            _local.names.append(self.name)
+            self._max_rss = _max_rss_bytes()
+            self._cpu = time.process_time()
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._active:
+            return False
+        end = time.perf_counter()
+        cpu = time.process_time() - self._cpu
+        max_rss_delta = _max_rss_bytes() - self._max_rss
+        del _local.names[self._depth :]
+
+        record = {
+            "name": self.name,
+            "start_s": self._start - _origin,
+            "wall_s": end - self._start,
+            "cpu_s": cpu,
+            "max_rss_delta_bytes": max_rss_delta,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "thread": threading.get_ident(),
+            "depth": self._depth,
+            "nested": self._nested,
+        }
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        with _lock:
+            _records.append(record)
+        return False
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with stage(name, rows_in=count_rows([*args, *kwargs.values()])) as current:
+                result = func(*args, **kwargs)
+                current.rows_out = count_rows(result)
+            return result
+
+        return wrapper
+
+
+def summarize():
+    """
+    Aggregate the recorded stages by name, in the order each stage first started.
+
+    A stage inside a stage of the same name, such as a decorated function
+    called by another one recorded as the same stage, is not counted
+    again, so its time is not added twice to the totals.
+
+    Returns
+    -------
+    list
+        One dictionary per stage name with 'name', 'calls', 'wall_s', 'cpu_s',
+        'max_rss_delta_bytes', 'rows_in' and 'rows_out' keys. Times and rows
+        are totals and the RSS increase is the largest of any call.
+    """
+    summary = {}
+    for record in sorted(records(), key=lambda record: record["start_s"]):
+        if record["nested"]:
+            continue
+        row = summary.setdefault(
+            record["name"],
+            {
+                "name": record["name"],
+                "calls": 0,
+                "wall_s": 0.0,
+                "cpu_s": 0.0,
+                "max_rss_delta_bytes": 0,
+                "rows_in": None,
+                "rows_out": None,
+            },
+        )
+        row["calls"] += 1
+        row["wall_s"] += record["wall_s"]
+        row["cpu_s"] += record["cpu_s"]
+        row["max_rss_delta_bytes"] = max(
+            row["max_rss_delta_bytes"], record["max_rss_delta_bytes"]
+        )
+        for key in ["rows_in", "rows_out"]:
+            if record[key] is not None:
+                row[key] = (row[key] or 0) + record[key]
+    return list(summary.values())
+
+
+def format_summary():
+    """
+    Format the aggregated stages as a table.
+
+    Returns
+    -------
+    str
+        One line per stage name with calls, wall and CPU seconds, peak RSS
+        increase in MiB and input and output rows.
+    """
+    lines = [
+        f"{'stage':<12} {'calls':>6} {'wall s':>9} {'cpu s':>9} "
+        f"{'rss +MiB':>9} {'rows in':>11} {'rows out':>11}"
+    ]
+    for row in summarize():
+        rows_in = "-" if row["rows_in"] is None else f"{row['rows_in']:,}"
+        rows_out = "-" if row["rows_out"] is None else f"{row['rows_out']:,}"
+        lines.append(
+            f"{row['name']:<12} {row['calls']:>6} {row['wall_s']:>9.3f} "
+            f"{row['cpu_s']:>9.3f} {row['max_rss_delta_bytes'] / 1024**2:>9.1f} "
+            f"{rows_in:>11} {rows_out:>11}"
+        )
+    return "\n".join(lines)
+
+
+def write_json(file_path):
+    """
+    Write every recorded stage and the per-stage summary to a JSON file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the JSON file.
+    """
+    with open(file_path, "w") as file:
+        json.dump({"stages": records(), "summary": summarize()}, file, indent=2)
+
+
+def write_chrome_trace(file_path):
+    """
+    Write the recorded stages in the Chrome trace event format.
+
+    The file can be opened in chrome://tracing or https://ui.perfetto.dev,
+    showing each thread's stages on a timeline.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the trace file.
+    """
+    pid = os.getpid()
+    events = [
+        {
+            "name": record["name"],
+            "ph": "X",
+            "ts": record["start_s"] * 1e6,
+            "dur": record["wall_s"] * 1e6,
+            "pid": pid,
+            "tid": record["thread"],
+            "args": {
+                key: record[key]
+                for key in ["cpu_s", "max_rss_delta_bytes", "rows_in", "rows_out"]
+            },
+        }
+        for record in records()
+    ]
+    with open(file_path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+def report(file_path=None):
+    """
+    Print the summary table and write the recorded stages, if instrumentation is enabled.
+
+    Paths ending in ".trace.json" are written as a Chrome trace and other
+    paths as JSON.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Output path (default is the value of the PIPELINE_TRACE environment
+        variable, if it is a path rather than a flag such as "1").
+    """
+    if not _enabled:
+        return
+
+    print(format_summary())
+
+    if file_path is None:
+        file_path = trace_setting(os.environ.get(ENV_VAR))[1]
+        if file_path is None:
+            return
+    if file_path.endswith(".trace.json"):
+        write_chrome_trace(file_path)
+    else:
+        write_json(file_path)
+    print(f"Pipeline trace saved to {file_path}.")
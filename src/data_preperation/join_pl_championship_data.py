@@ -1,32 +1,187 @@
 import pandas as pd
 import numpy as np
 
+from src.data_preperation.instrumentation import stage
 
+
+def build_rename_lookup(duplicated_player_names):
+    """
+    Build an indexed lookup of player renames from the duplicated player names config.
+
+    Config entries are applied in order, so a player renamed by one entry can be
+    matched again by a later entry for the same team. Each original (Player, Team)
+    pair is resolved here to the name it ends up with.
+
+    Parameters:
+    duplicated_player_names (list): Entries with 'Player', 'Team' and 'Rename' keys.
+
+    Returns:
+    pd.Series: Final player names indexed by the original ('Player', 'Team').
+    """
+    # Original (Player, Team) pairs grouped by the (Team, name) they currently have
+    originals_by_name = {}
+    seen = set()
+    for player_info in duplicated_player_names:
+        player, team = player_info["Player"], player_info["Team"]
+
+        matched = originals_by_name.pop((team, player), [])
+        if (player, team) not in seen:
+            # Rows still carrying their original name are matched too
+            seen.add((player, team))
+            matched.append((player, team))
+        originals_by_name.setdefault((team, player_info["Rename"]), []).extend(matched)
+
+    renames = {
+        original: name
+        for (_, name), originals in originals_by_name.items()
+        for original in originals
+        if original[0] != name
+    }
+    index = pd.MultiIndex.from_tuples(list(renames), names=["Player", "Team"])
+    return pd.Series(list(renames.values()), index=index, dtype=object, name="Rename")
+
+
+@stage("rename")
 def rename_duplicated_players(df, duplicated_player_names):
     """
     Rename players in the DataFrame based on duplicated player names.
 
+    The renames are applied in a single vectorized lookup on ('Player', 'Team').
+
     Parameters:
     df (pd.DataFrame): The DataFrame containing player statistics (e.g., goals).
-    duplicated_player_names (pd.DataFrame): A DataFrame containing duplicated player names with columns 'Player', 'Team', 'Season', and 'Rename'.
+    duplicated_player_names (list or pd.Series): Entries with 'Player', 'Team' and 'Rename' keys, or a lookup built once with `build_rename_lookup`.
 
     Returns:
     pd.DataFrame: The modified DataFrame with updated player names.
     """
-    for player_info in duplicated_player_names:
-        # Apply conditions to match 'Player', 'Team', and 'Season'
-        condition = (df["Player"] == player_info["Player"]) & (
-            df["Team"] == player_info["Team"]
-        )
+    if isinstance(duplicated_player_names, pd.Series):
+        rename_lookup = duplicated_player_names
+    else:
+        rename_lookup = build_rename_lookup(duplicated_player_names)
 
-        # Replace player name with 'Rename' if conditions match
-        df.loc[condition, "Player"] = player_info["Rename"]
+    if rename_lookup.empty:
+        return df
+
+    # Position of each row's (Player, Team) in the lookup, -1 if not renamed
+    positions = rename_lookup.index.get_indexer(
+        pd.MultiIndex.from_arrays([df["Player"], df["Team"]])
+    )
+    matched = positions >= 0
+
+    # Replace player name with 'Rename' if conditions match
+    if matched.any():
+        df.loc[matched, "Player"] = rename_lookup.to_numpy()[positions[matched]]
 
     return df
 
 
 import pandas as pd
 
+# Dtypes of the combined data in compact mode: low cardinality text columns
+# as categoricals, counts and season starts as nullable small integers
+COMPACT_DTYPES = {
+    "Country": "category",
+    "Team": "category",
+    "Season": "category",
+    "Assists": "Int16",
+    "Goals": "Int16",
+    "season_start": "Int16",
+}
+
+
+def read_combined_csv(file_path, compact=False):
+    """
+    Read a league metric's combined CSV.
+
+    Parameters
+    ----------
+    file_path : str
+        Path of the combined CSV.
+    compact : bool, optional
+        Parse the columns in `COMPACT_DTYPES` straight into categoricals and
+        nullable small integers, so no object column is built for them
+        (default is False).
+
+    Returns
+    -------
+    pd.DataFrame
+        The combined data.
+    """
+    if compact:
+        return pd.read_csv(file_path, dtype=COMPACT_DTYPES)
+    return pd.read_csv(file_path)
+
+
+def compact_dtypes(df):
+    """
+    Convert the columns in `COMPACT_DTYPES` to their compact dtype.
+
+    This is for data that was not read in compact mode, such as a compact
+    Parquet read, whose Season is text and counts are non-nullable.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The combined data of a league metric.
+
+    Returns
+    -------
+    pd.DataFrame
+        The DataFrame with compact dtypes.
+    """
+    for column, dtype in COMPACT_DTYPES.items():
+        if column in df.columns and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def unify_categories(frames):
+    """
+    Give each categorical column the same sorted categories in every DataFrame.
+
+    Merges and concatenations only keep a column categorical if both sides
+    have the same categories, and sorted categories make groupbys order
+    groups as they would the strings. Only the codes are recomputed.
+
+    Parameters
+    ----------
+    frames : list
+        DataFrames that are merged or concatenated together, changed in place.
+
+    Returns
+    -------
+    list
+        The DataFrames with unified categories.
+    """
+    columns = dict.fromkeys(
+        column
+        for df in frames
+        for column, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+    )
+    for column in columns:
+        values = [df[column] for df in frames if column in df.columns]
+        categories = pd.Index(
+            pd.unique(
+                np.concatenate(
+                    [
+                        (
+                            value.cat.categories.to_numpy(dtype=object)
+                            if isinstance(value.dtype, pd.CategoricalDtype)
+                            else value.dropna().unique().astype(object)
+                        )
+                        for value in values
+                    ]
+                )
+            )
+        ).sort_values()
+        dtype = pd.CategoricalDtype(categories)
+        for df in frames:
+            if column in df.columns and df[column].dtype != dtype:
+                df[column] = df[column].astype(dtype)
+    return frames
+
 
 def fill_missing_values(merged_df):
     """
@@ -44,16 +199,87 @@ def fill_missing_values(merged_df):
     """
     merged_df["Assists"] = merged_df["Assists"].fillna(0)
     merged_df["Goals"] = merged_df["Goals"].fillna(0)
-    merged_df["Team"] = (
-        merged_df["Team"].fillna("Unknown").astype(str)
-    )  # Ensure all entries are strings
+    if isinstance(merged_df["Team"].dtype, pd.CategoricalDtype):
+        # Only the categories are converted to strings, in sorted order
+        teams = merged_df["Team"]
+        categories = teams.cat.categories.astype(str)
+        teams = teams.cat.rename_categories(categories)
+        if teams.hasnans:
+            teams = teams.cat.set_categories(categories.union(["Unknown"]))
+            teams = teams.fillna("Unknown")
+        merged_df["Team"] = teams.cat.reorder_categories(
+            teams.cat.categories.sort_values()
+        )
+    else:
+        merged_df["Team"] = (
+            merged_df["Team"].fillna("Unknown").astype(str)
+        )  # Ensure all entries are strings
     return merged_df
 
 
+def join_group_labels(group_ids, labels, n_groups, separator=" / "):
+    """
+    Join the sorted distinct labels of each group into a single string per group.
+
+    This gives the same result as `separator.join(sorted(set(x)))` for each
+    group, but works on integer label codes: the (group, code) pairs are
+    de-duplicated and sorted in one pass, then labels are concatenated one
+    rank at a time, so only groups with several labels do any string work.
+
+    Parameters
+    ----------
+    group_ids : np.ndarray
+        Group number of each row, from 0 to `n_groups` - 1. Rows with a negative
+        group number are ignored.
+    labels : pd.Series
+        Label of each row.
+    n_groups : int
+        Number of groups.
+    separator : str, optional
+        String placed between labels (default is " / ").
+
+    Returns
+    -------
+    np.ndarray
+        Object array of the joined labels, indexed by group number.
+    """
+    # Codes are assigned in sorted label order
+    codes, uniques = pd.factorize(labels, sort=True)
+    n_codes = max(len(uniques), 1)
+
+    included = group_ids >= 0
+    pairs = np.unique(group_ids[included].astype(np.int64) * n_codes + codes[included])
+
+    joined = np.empty(n_groups, dtype=object)
+    if len(pairs) == 0:
+        return joined
+
+    pair_groups = pairs // n_codes
+    pair_labels = uniques.to_numpy(dtype=object)[pairs % n_codes]
+
+    # Rank of each distinct label within its group
+    starts = np.flatnonzero(np.r_[True, pair_groups[1:] != pair_groups[:-1]])
+    ranks = np.arange(len(pairs)) - np.repeat(
+        starts, np.diff(np.r_[starts, len(pairs)])
+    )
+
+    joined[pair_groups[starts]] = pair_labels[starts]
+    for rank in range(1, ranks.max() + 1):
+        at_rank = ranks == rank
+        groups = pair_groups[at_rank]
+        joined[groups] = joined[groups] + separator + pair_labels[at_rank]
+
+    return joined
+
+
+@stage("group")
 def group_data(merged_df):
     """
     Group the DataFrame by Player, Season, Country, and season_start.
 
+    Assists and Goals are summed and the distinct teams of each group are
+    joined in sorted order with " / ".
+
     Parameters
     ----------
     merged_df : pd.DataFrame
@@ -64,20 +290,172 @@ def group_data(merged_df):
     pd.DataFrame
         The grouped DataFrame with aggregated Assists and Goals.
     """
-    return (
-        merged_df.groupby(["Player", "Season", "Country", "season_start"])
-        .agg(
-            {
-                "Team": lambda x: " / ".join(sorted(set(x))),
-                "Assists": "sum",
-                "Goals": "sum",
-            }
+    keys = ["Player", "Season", "Country", "season_start"]
+    grouped = merged_df.groupby(keys, observed=True)
+
+    grouped_df = grouped[["Assists", "Goals"]].sum().reset_index()
+
+    # Rows with a missing key are not in any group
+    group_ids = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    grouped_df.insert(
+        len(keys),
+        "Team",
+        join_group_labels(group_ids, merged_df["Team"], grouped.ngroups),
+    )
+    return grouped_df
+
+
+def merge_by_player_id(goals_df, assists_df, player_ids):
+    """
+    Outer merge goals and assists on integer keys instead of their string columns.
+
+    Player and Country are replaced by their ID in `player_ids`, and Team,
+    Season and season_start by codes. The four are combined into one int64
+    key, so the merge matches the same rows as merging on ('Player',
+    'Country', 'Team', 'Season', 'season_start') with a single integer join.
+
+    Parameters
+    ----------
+    goals_df : pd.DataFrame
+        DataFrame containing players' goals data.
+    assists_df : pd.DataFrame
+        DataFrame containing players' assists data.
+    player_ids : PlayerIds
+        Dictionary of player IDs, extended with any new players.
+
+    Returns
+    -------
+    tuple
+        The merged DataFrame with 'player_id', 'team_code', 'season_code',
+        'season_start', 'Assists' and 'Goals' columns, the Team label of each
+        team code (missing teams filled as in `fill_missing_values`) and the
+        Season of each season code. Season codes are in sorted order.
+    """
+    code_columns = {}
+    for column, sort in [("Team", False), ("Season", True), ("season_start", False)]:
+        values = pd.concat([assists_df[column], goals_df[column]], ignore_index=True)
+        code_columns[column] = pd.factorize(values, sort=sort, use_na_sentinel=False)
+
+    def encode(df, start, metric):
+        key = player_ids.encode(df["Player"], df["Country"])
+        for codes, uniques in code_columns.values():
+            key = key * len(uniques) + codes[start : start + len(df)]
+        return pd.DataFrame({"key": key, metric: df[metric].array})
+
+    merged_df = pd.merge(
+        encode(assists_df, 0, "Assists"),
+        encode(goals_df, len(assists_df), "Goals"),
+        on="key",
+        how="outer",
+    )
+
+    # Split the key back into its parts
+    key = merged_df.pop("key").to_numpy()
+    parts = {}
+    for column, (_, uniques) in reversed(code_columns.items()):
+        key, parts[column] = np.divmod(key, len(uniques))
+    team_uniques = code_columns["Team"][1]
+    season_uniques = code_columns["Season"][1]
+    season_starts = code_columns["season_start"][1]
+
+    merged_df = pd.DataFrame(
+        {
+            "player_id": key,
+            "team_code": parts["Team"],
+            "season_code": parts["Season"],
+            "season_start": season_starts.take(parts["season_start"]),
+            "Assists": merged_df["Assists"].fillna(0).array,
+            "Goals": merged_df["Goals"].fillna(0).array,
+        }
+    )
+
+    team_labels = pd.Series(team_uniques, dtype=object).fillna("Unknown").astype(str)
+    return merged_df, team_labels, pd.Index(season_uniques)
+
+
+@stage("group")
+def group_by_player_id(merged_df, team_labels, seasons, player_ids):
+    """
+    Group the output of `merge_by_player_id` by player and season, as `group_data` does.
+
+    Groups are formed on integer ranks of Player, Season, Country and
+    season_start, so they come out in the same order as grouping the string
+    columns, and the names are attached only to the grouped rows.
+
+    Parameters
+    ----------
+    merged_df : pd.DataFrame
+        The merged DataFrame from `merge_by_player_id`.
+    team_labels : pd.Series
+        Team label of each team code.
+    seasons : pd.Index
+        Season of each season code, in sorted order.
+    player_ids : PlayerIds
+        Dictionary of player IDs.
+
+    Returns
+    -------
+    pd.DataFrame
+        The same columns and rows as `group_data`, followed by 'player_id'.
+    """
+    player_rank, country_rank = player_ids.ranks()
+    ids = merged_df["player_id"].to_numpy()
+    season_codes = merged_df["season_code"].to_numpy().astype(np.int64)
+    start_codes, starts = pd.factorize(merged_df["season_start"], sort=True)
+
+    def key_ranks():
+        # Rank of each key column in sorted order, -1 if missing, and the number of ranks
+        yield player_rank[ids], len(player_rank)
+        yield np.where(seasons.isna()[season_codes], -1, season_codes), len(seasons)
+        yield country_rank[ids], len(country_rank)
+        yield start_codes.astype(np.int64), len(starts)
+
+    # Rows with a missing key are not in any group, as with groupby
+    included = np.ones(len(merged_df), dtype=bool)
+    key = np.zeros(len(merged_df), dtype=np.int64)
+    for rank, size in key_ranks():
+        included &= rank >= 0
+        key = key * max(size, 1) + rank
+
+    _, first_rows, group_ids = np.unique(
+        key[included], return_index=True, return_inverse=True
+    )
+    first_rows = np.flatnonzero(included)[first_rows]
+    n_groups = len(first_rows)
+
+    # Teams as a categorical with sorted categories, so labels are not hashed again
+    label_codes, label_uniques = pd.factorize(team_labels)
+    order = np.argsort(label_uniques.to_numpy(dtype=object), kind="stable")
+    sorted_codes = np.empty(len(order), dtype=np.int64)
+    sorted_codes[order] = np.arange(len(order))
+    teams = pd.Series(
+        pd.Categorical.from_codes(
+            sorted_codes[label_codes][merged_df["team_code"].to_numpy()],
+            categories=label_uniques[order],
         )
-        .reset_index()
     )
+    all_group_ids = np.full(len(merged_df), -1, dtype=np.int64)
+    all_group_ids[included] = group_ids
+
+    grouped_ids = ids[first_rows]
+    grouped_df = pd.DataFrame(
+        {
+            "Player": player_ids.players[grouped_ids],
+            "Season": seasons.to_numpy(dtype=object)[season_codes[first_rows]],
+            "Country": player_ids.countries[grouped_ids],
+            "season_start": merged_df["season_start"].to_numpy()[first_rows],
+            "Team": join_group_labels(all_group_ids, teams, n_groups),
+        }
+    )
+    for column in ["Assists", "Goals"]:
+        values = merged_df[column].to_numpy(dtype=np.float64)
+        sums = np.bincount(group_ids, weights=values[included], minlength=n_groups)
+        grouped_df[column] = pd.Series(sums).astype(merged_df[column].dtype)
+    grouped_df["player_id"] = grouped_ids
+    return grouped_df
 
 
-def process_league_data(goals_df, assists_df, duplicated_player_names):
+def process_league_data(goals_df, assists_df, duplicated_player_names, player_ids=None):
     """
     Process and merge league goals and assists data.
 
@@ -87,8 +465,13 @@ def process_league_data(goals_df, assists_df, duplicated_player_names):
         DataFrame containing players' goals data.
     assists_df : pd.DataFrame
         DataFrame containing players' assists data.
-    duplicated_player_names : list
-        List of names of duplicated players to rename.
+    duplicated_player_names : list or pd.Series
+        List of names of duplicated players to rename, or a lookup built once
+        with `build_rename_lookup`.
+    player_ids : PlayerIds, optional
+        Dictionary of player IDs. If given, the merge and groupby run on
+        integer keys and a 'player_id' column is added to the result, which
+        is otherwise unchanged.
 
     Returns
     -------
@@ -96,7 +479,12 @@ def process_league_data(goals_df, assists_df, duplicated_player_names):
         A processed DataFrame containing merged and aggregated data for players.
     """
 
+    # Categoricals in compact mode share their categories across both frames
+    goals_df, assists_df = unify_categories([goals_df, assists_df])
+
     # Rename duplicate player names
+    if not isinstance(duplicated_player_names, pd.Series):
+        duplicated_player_names = build_rename_lookup(duplicated_player_names)
     goals_df = rename_duplicated_players(
         df=goals_df, duplicated_player_names=duplicated_player_names
     )
@@ -104,21 +492,32 @@ def process_league_data(goals_df, assists_df, duplicated_player_names):
         df=assists_df, duplicated_player_names=duplicated_player_names
     )
 
+    if player_ids is not None:
+        # Merge and group on integer keys
+        with stage("merge", rows_in=len(assists_df) + len(goals_df)) as current:
+            merged_df, team_labels, seasons = merge_by_player_id(
+                goals_df, assists_df, player_ids
+            )
+            current.rows_out = len(merged_df)
+        return group_by_player_id(merged_df, team_labels, seasons, player_ids)
+
     # Merge goals and assists DataFrames
-    merged_df = pd.merge(
-        assists_df,
-        goals_df,
-        on=["Player", "Country", "Team", "Season", "season_start"],
-        how="outer",
-    )
+    with stage("merge", rows_in=len(assists_df) + len(goals_df)) as current:
+        merged_df = pd.merge(
+            assists_df,
+            goals_df,
+            on=["Player", "Country", "Team", "Season", "season_start"],
+            how="outer",
+        )
 
-    # Fill missing values
-    merged_df = fill_missing_values(merged_df)
+        # Fill missing values
+        merged_df = fill_missing_values(merged_df)
 
-    # Select final columns
-    merged_df = merged_df[
-        ["Player", "Country", "Team", "Assists", "Season", "season_start", "Goals"]
-    ]
+        # Select final columns
+        merged_df = merged_df[
+            ["Player", "Country", "Team", "Assists", "Season", "season_start", "Goals"]
+        ]
+        current.rows_out = len(merged_df)
 
     # Group data
     merged_df = group_data(merged_df)
@@ -126,78 +525,164 @@ def process_league_data(goals_df, assists_df, duplicated_player_names):
     return merged_df
 
 
-def merge_dataframes(pl_df, champ_df):
+# Spacing between player identities in the (Player, Country, season_start) keys
+SEASON_KEY_STRIDE = 10_000
+
+
+def build_league_indexes(leagues):
     """
-    Merges the Premier League and Championship DataFrames on specified columns.
+    Builds a (Player, Country, season_start) key index for each league.
+
+    Players are identified by the same integer code in every league, so a key
+    shifted by a lag can be looked up directly in another league's index. If
+    every league has a 'player_id' column, it is used as the code.
 
     Parameters
     ----------
-    pl_df : pd.DataFrame
-        DataFrame containing Premier League data.
-    champ_df : pd.DataFrame
-        DataFrame containing Championship data.
+    leagues
+        Dictionary of league name (e.g., "premier_league") to processed DataFrame.
 
     Returns
     -------
-    pd.DataFrame
-        Merged DataFrame with the `lagged_season_start` column dropped.
+        Dictionary of league name to a dictionary with the league's DataFrame
+        ('df'), its integer keys ('keys') and the keys as a pd.Index ('index').
     """
-    merged_df = pd.merge(
-        pl_df,
-        champ_df,
-        left_on=["Player", "Country", "season_start"],
-        right_on=["Player", "Country", "lagged_season_start"],
-        suffixes=("_premier_league", "_championship"),
-        how="inner",
-    )
-    return merged_df.drop(columns=["lagged_season_start"])
-
-
-import pandas as pd
-import numpy as np
-
-
-def create_lagged_season(champ_df):
+    names = list(leagues)
+    frames = [leagues[name] for name in names]
+    seasons = np.concatenate([df["season_start"].to_numpy() for df in frames])
+
+    if all("player_id" in df.columns for df in frames):
+        # Already identified by the player ID dictionary
+        identities = np.concatenate(
+            [df["player_id"].to_numpy(dtype=np.int64) for df in frames]
+        )
+    else:
+        players = pd.concat([df["Player"] for df in frames], ignore_index=True)
+        countries = pd.concat([df["Country"] for df in frames], ignore_index=True)
+        player_codes, _ = pd.factorize(players, use_na_sentinel=False)
+        country_codes, country_uniques = pd.factorize(countries, use_na_sentinel=False)
+        identities = (
+            player_codes.astype(np.int64) * len(country_uniques) + country_codes
+        )
+    keys = identities * SEASON_KEY_STRIDE + seasons.astype(np.int64)
+
+    league_indexes = {}
+    start = 0
+    for name, df in zip(names, frames):
+        league_keys = keys[start : start + len(df)]
+        league_indexes[name] = {
+            "df": df,
+            "keys": league_keys,
+            "index": pd.Index(league_keys),
+        }
+        start += len(df)
+    return league_indexes
+
+
+def join_transition(league_indexes, source, destination, lag=1, suffixes=None):
     """
-    Creates a lagged season_start column in the Championship DataFrame.
+    Joins players in a destination league season to the same players in a source league `lag` seasons earlier.
+
+    The result has the same rows and columns as an inner `pd.merge` of the
+    destination (left) and source (right) on Player, Country and season_start,
+    with the source season lagged, e.g. Championship to Premier League with
+    a lag of 1.
 
     Parameters
     ----------
-    champ_df
-        DataFrame containing Championship data.
+    league_indexes
+        Output of `build_league_indexes`.
+    source
+        Name of the league players move from (e.g., "championship").
+    destination
+        Name of the league players move to (e.g., "premier_league").
+    lag
+        Number of seasons between the source and destination seasons.
+    suffixes
+        Suffixes for overlapping destination and source columns
+        (default is ("_<destination>", "_<source>")).
 
     Returns
     -------
-        Championship DataFrame with the lagged_season_start column added.
+        DataFrame with one row per matching (destination, source) pair.
     """
-    champ_df["lagged_season_start"] = champ_df["season_start"] + 1
-    return champ_df
+    if suffixes is None:
+        suffixes = (f"_{destination}", f"_{source}")
+        if source == destination:
+            suffixes = (f"_{destination}", f"_{source}_lag_{lag}")
+
+    source_index = league_indexes[source]
+    destination_index = league_indexes[destination]
+    lookup_keys = destination_index["keys"] - lag
+
+    if source_index["index"].is_unique:
+        positions = source_index["index"].get_indexer(lookup_keys)
+        destination_positions = np.flatnonzero(positions >= 0)
+        source_positions = positions[destination_positions]
+    else:
+        # Players listed twice in a source season, so fall back to a merge of the keys
+        pairs = pd.merge(
+            pd.DataFrame({"key": lookup_keys, "left": np.arange(len(lookup_keys))}),
+            pd.DataFrame(
+                {
+                    "key": source_index["keys"],
+                    "right": np.arange(len(source_index["keys"])),
+                }
+            ),
+            on="key",
+            how="inner",
+        )
+        destination_positions = pairs["left"].to_numpy()
+        source_positions = pairs["right"].to_numpy()
+
+    left = destination_index["df"]
+    right = source_index["df"].drop(
+        columns=[
+            column
+            for column in ["Player", "Country", "player_id"]
+            if column in source_index["df"].columns
+        ]
+    )
+    overlapping = set(left.columns) & set(right.columns)
+
+    left = left.take(destination_positions).reset_index(drop=True)
+    right = right.take(source_positions).reset_index(drop=True)
+    left.columns = [
+        f"{column}{suffixes[0]}" if column in overlapping else column
+        for column in left.columns
+    ]
+    right.columns = [
+        f"{column}{suffixes[1]}" if column in overlapping else column
+        for column in right.columns
+    ]
+    return pd.concat([left, right], axis=1)
 
 
-def merge_dataframes(pl_df, champ_df):
+def join_transitions(leagues, transitions):
     """
-    Merges the Premier League and Championship DataFrames on specified columns.
+    Computes several league transitions from one set of key indexes.
 
     Parameters
     ----------
-    pl_df
-        DataFrame containing Premier League data.
-    champ_df
-        DataFrame containing Championship data.
+    leagues
+        Dictionary of league name (e.g., "premier_league") to processed DataFrame.
+    transitions
+        List of (source, destination, lags) tuples, where lags is an int or a
+        list of ints, e.g. [("championship", "premier_league", 1),
+        ("premier_league", "championship", [1, 2])].
 
     Returns
     -------
-        Merged DataFrame with the `lagged_season_start` column dropped.
+        Dictionary of (source, destination, lag) to the joined DataFrame.
     """
-    merged_df = pd.merge(
-        pl_df,
-        champ_df,
-        left_on=["Player", "Country", "season_start"],
-        right_on=["Player", "Country", "lagged_season_start"],
-        suffixes=("_premier_league", "_championship"),
-        how="inner",
-    )
-    return merged_df.drop(columns=["lagged_season_start"])
+    league_indexes = build_league_indexes(leagues)
+    joined = {}
+    for source, destination, lags in transitions:
+        for lag in np.atleast_1d(lags):
+            joined[(source, destination, int(lag))] = join_transition(
+                league_indexes, source, destination, lag=int(lag)
+            )
+    return joined
 
 
 def rename_columns(df):
@@ -211,9 +696,9 @@ def rename_columns(df):
 
     Returns
     -------
-        DataFrame with renamed columns.
+        DataFrame with renamed columns, sharing the data of `df`.
     """
-    df.rename(
+    return df.rename(
         columns={
             "Season_premier_league": "Season (PL)",
             "season_start_premier_league": "Season Start (PL)",
@@ -227,9 +712,8 @@ def rename_columns(df):
             "Goals_championship": "Goals (Champ.)",
             "same_team": "With Promoted Team",
         },
-        inplace=True,
+        copy=False,
     )
-    return df
 
 
 def add_same_team_column(df):
@@ -249,6 +733,7 @@ def add_same_team_column(df):
     return df
 
 
+@stage("join")
 def join_pl_champ_data(pl_df, champ_df):
     """
     Main function to process Premier League and Championship DataFrames.
@@ -264,8 +749,12 @@ def join_pl_champ_data(pl_df, champ_df):
     -------
         Final processed DataFrame after merging, renaming, and adding columns.
     """
-    champ_df_with_lag = create_lagged_season(champ_df)  # Create lagged season
-    merged_df = merge_dataframes(pl_df, champ_df_with_lag)  # Merge DataFrames
+    # Championship season N to Premier League season N + 1
+    merged_df = join_transitions(
+        {"premier_league": pl_df, "championship": champ_df},
+        [("championship", "premier_league", 1)],
+    )[("championship", "premier_league", 1)]
+    merged_df = merged_df.drop(columns=["player_id"], errors="ignore")
     renamed_df = rename_columns(merged_df)  # Rename columns
     final_df = add_same_team_column(renamed_df)  # Add same team column
     return final_df
@@ -309,9 +798,111 @@ def format_season(season):
     return f"{start_year}/{end_year[-2:]}"  # Get last two digits of the years
 
 
-import pandas as pd
+def map_distinct_values(values, func):
+    """
+    Apply a column-level function once per distinct value and map the results back.
+
+    Parameters
+    ----------
+    values : pd.Series
+        The column to transform.
+    func : function
+        Takes a Series of the distinct values and returns a Series of the same length.
+
+    Returns
+    -------
+    pd.Series
+        The transformed column, with the index and name of `values`.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    results = func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(results[codes], index=values.index, name=values.name)
+
+
+def format_season_column(seasons):
+    """
+    Format a column of seasons, the column-level version of `format_season`.
+
+    The distinct seasons, of which a column holds only a few, are split
+    into their years with `.str` operations.
+
+    Parameters
+    ----------
+    seasons : pd.Series
+        Seasons in the format "YYYY-YYYY".
+
+    Returns
+    -------
+    pd.Series
+        Seasons in the format "YYYY/YY".
+    """
+
+    def format_distinct(distinct):
+        years = distinct.str.split("-")
+        return years.str[0] + "/" + years.str[1].str[-2:]
+
+    return map_distinct_values(seasons, format_distinct)
+
+
+def format_player_season_column(players, seasons):
+    """
+    Format player names and seasons, the column-level version of `format_player_season`.
 
+    Names are processed once per distinct name with `.str` regex operations:
+    whitespace is collapsed as `str.split` does, then the first name is removed
+    if there are two or more names.
 
+    Parameters
+    ----------
+    players : pd.Series
+        Player names.
+    seasons : pd.Series
+        Formatted seasons (e.g., 'Season (PL)').
+
+    Returns
+    -------
+    pd.Series
+        Strings in the format "LastName (YY/YY)".
+    """
+    last_names = map_distinct_values(
+        players,
+        lambda names: names.str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.replace(r"^\S+ (?=\S)", "", n=1, regex=True),
+    )
+    return last_names.rename(None) + " (" + seasons + ")"
+
+
+def expand_output_dtypes(df):
+    """
+    Convert compact dtypes back to the dtypes of the joined data in the default mode.
+
+    Categoricals become object strings, counts become float64 (the default
+    mode's outer merge of goals and assists leaves them with missing values)
+    and other small integers become int64, so the written output is the same.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined and formatted DataFrame.
+
+    Returns
+    -------
+    pd.DataFrame
+        The DataFrame with expanded dtypes.
+    """
+    for column, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+        elif pd.api.types.is_integer_dtype(dtype) and dtype != np.int64:
+            if column.startswith(("Assists", "Goals")):
+                df[column] = df[column].astype(np.float64)
+            else:
+                df[column] = df[column].astype(np.int64)
+    return df
+
+
+@stage("format")
 def format_joined_data(pl_champ_merged):
     """
     Format the provided DataFrames for player statistics in the Championship and Premier League.
@@ -355,26 +946,29 @@ def format_joined_data(pl_champ_merged):
     ] = None
 
     # Shorten season name
-    pl_champ_merged["Season (PL)"] = pl_champ_merged["Season (PL)"].apply(format_season)
-    pl_champ_merged["Season (Champ.)"] = pl_champ_merged["Season (Champ.)"].apply(
-        format_season
+    pl_champ_merged["Season (PL)"] = format_season_column(
+        pl_champ_merged["Season (PL)"]
+    )
+    pl_champ_merged["Season (Champ.)"] = format_season_column(
+        pl_champ_merged["Season (Champ.)"]
     )
 
     # Concat Name and Season
     pl_champ_merged["Player (PL Season) - Full Name"] = (
         pl_champ_merged["Player"] + " (" + pl_champ_merged["Season (PL)"] + ")"
     )
-    pl_champ_merged["Player (PL Season)"] = pl_champ_merged.apply(
-        format_player_season, axis=1
+    pl_champ_merged["Player (PL Season)"] = format_player_season_column(
+        pl_champ_merged["Player"], pl_champ_merged["Season (PL)"]
     )
 
     # Sort
     pl_champ_merged = pl_champ_merged.sort_values(["Season Start (PL)", "Player"])
 
     # Remove " FC" from end of team names
-    pl_champ_merged["Team (PL)"] = pl_champ_merged["Team (PL)"].str.rstrip(" FC")
-    pl_champ_merged["Team (Champ.)"] = pl_champ_merged["Team (Champ.)"].str.rstrip(
-        " FC"
-    )
+    for column in ["Team (PL)", "Team (Champ.)"]:
+        pl_champ_merged[column] = map_distinct_values(
+            pl_champ_merged[column], lambda teams: teams.str.rstrip(" FC")
+        )
 
-    return pl_champ_merged
+    # Compact dtypes are only used until the output
+    return expand_output_dtypes(pl_champ_merged)
@@ -1,11 +1,242 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import os
+import re
+import json
+import hashlib
+import datetime
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from contextlib import contextmanager, nullcontext
+from html.entities import html5 as html5_entities
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
 
+from src.data_preperation.instrumentation import stage
+from src.data_preperation.validation import (
+    check_season_continuity,
+    combined_checks,
+    merge_checks,
+)
 
-def fetch_html(url):
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to rate limit requests.
+
+    Tokens are added continuously at `rate` per second up to `capacity`. Each
+    call to `acquire` consumes one token, blocking until one is available.
+
+    Parameters
+    ----------
+    rate : float
+        Number of tokens added per second.
+    capacity : float, optional
+        Maximum number of tokens held at once, i.e. the allowed burst size
+        (default is `rate`, with a minimum of 1).
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available and consume it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_time = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_time)
+
+
+class HostRateLimiter:
+    """
+    Per-host rate limiter combining a token bucket with a cap on in-flight requests.
+
+    Parameters
+    ----------
+    requests_per_second : float, optional
+        Sustained request rate allowed per host (default is 10).
+    burst : float, optional
+        Token bucket capacity per host (default is `requests_per_second`).
+    max_in_flight : int, optional
+        Maximum number of concurrent requests per host (default is 4).
+    """
+
+    def __init__(self, requests_per_second=10.0, burst=None, max_in_flight=4):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def _get_host_limits(self, host):
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = (
+                    TokenBucket(rate=self.requests_per_second, capacity=self.burst),
+                    threading.BoundedSemaphore(self.max_in_flight),
+                )
+            return self.hosts[host]
+
+    @contextmanager
+    def limit(self, url):
+        """
+        Context manager holding an in-flight slot and a rate token for the URL's host.
+
+        Parameters
+        ----------
+        url : str
+            The URL about to be requested.
+        """
+        bucket, semaphore = self._get_host_limits(urlsplit(url).netloc)
+        with semaphore:
+            bucket.acquire()
+            yield
+
+
+# Server errors and throttling that are worth another attempt; other 4xx are not
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    """
+    Bounded retries with jittered exponential backoff.
+
+    The wait before retry `n` (from 0) is drawn uniformly between 0 and
+    `base_delay * 2**n`, capped at `max_delay`, so workers that failed at the
+    same time do not all retry at the same time.
+
+    Parameters
+    ----------
+    retries : int, optional
+        Attempts made after the first one fails (default is 3).
+    base_delay : float, optional
+        Upper bound of the first wait, in seconds (default is 0.5).
+    max_delay : float, optional
+        Upper bound of any wait, in seconds, including one asked for in a
+        Retry-After header (default is 30).
+    seed : int, optional
+        Seed of the jitter, for reproducible waits.
+    """
+
+    def __init__(self, retries=3, base_delay=0.5, max_delay=30.0, seed=None):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.random = random.Random(seed)
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Seconds to wait before a retry.
+
+        Parameters
+        ----------
+        attempt : int
+            Number of the retry, 0 for the first.
+        retry_after : float, optional
+            Seconds the server asked to wait, used as a minimum.
+
+        Returns
+        -------
+        float
+            The wait, at most `max_delay`.
+        """
+        delay = self.random.uniform(
+            0, min(self.max_delay, self.base_delay * 2**attempt)
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.max_delay)
+
+
+def retry_after_seconds(response):
+    """
+    Seconds given in a response's Retry-After header, or None if it is missing or a date.
+    """
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def create_session(pool_maxsize=10):
+    """
+    Creates a requests Session with a connection pool sized for concurrent fetching.
+
+    Parameters
+    ----------
+    pool_maxsize : int, optional
+        Maximum number of pooled connections kept per host (default is 10).
+
+    Returns
+    -------
+    requests.Session
+        A session that reuses connections across requests.
+    """
+    # Imported here, so reading and combining local data does not import requests
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def is_season_closed(season, today=None):
+    """
+    Checks whether a season has finished, so its pages will no longer change.
+
+    Seasons are treated as closed from 1 July of their end year.
+
+    Parameters
+    ----------
+    season : str
+        Season string in the format "YYYY-YYYY".
+    today : datetime.date, optional
+        The date to check against (default is today).
+
+    Returns
+    -------
+    bool
+        True if the season has finished.
+    """
+    if today is None:
+        today = datetime.date.today()
+    end_year = int(season.split("-")[1])
+    return today >= datetime.date(end_year, 7, 1)
+
+
+@stage("fetch")
+def fetch_html(
+    url,
+    session=None,
+    cache=None,
+    permanent=False,
+    rate_limiter=None,
+    retry=None,
+    timeout=None,
+):
     """
     Fetches the HTML content from the given URL.
 
@@ -13,25 +244,292 @@ def fetch_html(url):
     ----------
     url : str
         The URL of the webpage to fetch.
+    session : requests.Session, optional
+        Session to send the request with, reusing its pooled connections.
+        A one-off request is made if not provided.
+    cache : HTTPCache, optional
+        On-disk cache to serve and store the page. Permanent entries are returned
+        without a request; other cached entries are revalidated with a conditional request.
+    permanent : bool, optional
+        Whether the page will never change (e.g. a closed season), so once cached
+        it is never requested again (default is False).
+    rate_limiter : HostRateLimiter, optional
+        Limiter applied to every request sent, retries included. Cache hits do not consume it.
+    retry : RetryPolicy, optional
+        Retries after timeouts, connection errors and the status codes in
+        `RETRY_STATUS_CODES`, with jittered exponential backoff. Only one
+        attempt is made if not provided.
+    timeout : float, optional
+        Seconds to wait for the server to connect or send data (default is no limit).
 
     Returns
     -------
     str
         The HTML content of the webpage. Returns None if the request fails.
     """
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching URL {url}: {e}")
-        return None
+    import requests
+
+    headers = {}
+    if cache is not None:
+        entry = cache.lookup(url)
+        if entry is not None and entry["permanent"]:
+            html = cache.read(url)
+            if html is not None:
+                return html
+            # Evicted by another thread since the lookup
+            entry = None
+        headers = cache.conditional_headers(entry)
+
+    get = session.get if session is not None else requests.get
+    retries = retry.retries if retry is not None else 0
+    for attempt in range(retries + 1):
+        limit = rate_limiter.limit(url) if rate_limiter is not None else nullcontext()
+        try:
+            with limit:
+                response = get(url, headers=headers, timeout=timeout)
+
+            if cache is not None and response.status_code == 304 and headers:
+                html = cache.read(url, permanent=permanent, revalidated=True)
+                if html is not None:
+                    return html
+                # Evicted by another thread since the lookup, so request the whole page
+                headers = {}
+                limit = (
+                    rate_limiter.limit(url)
+                    if rate_limiter is not None
+                    else nullcontext()
+                )
+                with limit:
+                    response = get(url, headers=headers, timeout=timeout)
+
+            response.raise_for_status()
+
+            if cache is not None:
+                cache.store(
+                    url,
+                    response.text,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    permanent=permanent,
+                )
+            return response.text
+        except requests.RequestException as e:
+            response = e.response
+            transient = isinstance(
+                e,
+                (
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError,
+                ),
+            ) or (response is not None and response.status_code in RETRY_STATUS_CODES)
+            if not transient or attempt == retries:
+                print(f"Error fetching URL {url} after {attempt + 1} attempt(s): {e}")
+                return None
+
+            retry_after = (
+                retry_after_seconds(response) if response is not None else None
+            )
+            delay = retry.delay(attempt, retry_after=retry_after)
+            print(f"Retrying {url} in {delay:.2f}s after: {e}")
+        time.sleep(delay)
+
+
+class StandardTableParser(HTMLParser):
+    """
+    Streaming parser collecting the cell text of a single `standard_tabelle` table.
+
+    The parser is fed HTML starting at the table's opening tag and sets `done`
+    once that table closes, ignoring anything after it. Each `<tr>` becomes a row and each `<td>` a cell
+    holding the last line of its stripped text, matching
+    `col.text.strip().split("\\n")[-1]` on the BeautifulSoup tree. Script and
+    style content is ignored and character references are resolved the way
+    BeautifulSoup's html.parser builder resolves them.
+
+    Markup whose tree BeautifulSoup builds differently from flat rows of
+    cells, such as a nested table, a row or cell that is not closed, or a
+    cell outside a row, sets `irregular`, and the table should then be
+    parsed with `parse_table_soup` instead.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.rows = []
+        self.table_depth = 0
+        self.in_row = False
+        self.cell = None
+        self.skip_depth = 0
+        self.done = False
+        self.irregular = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self.table_depth += 1
+            if self.table_depth > 1:
+                self.irregular = True
+        elif tag == "tr":
+            if self.in_row or self.cell is not None:
+                self.irregular = True
+            self.rows.append([])
+            self.in_row = True
+        elif tag == "td" and self.rows:
+            if not self.in_row or self.cell is not None:
+                self.irregular = True
+            self.cell = []
+        elif tag in ("script", "style"):
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == "table":
+            self.table_depth -= 1
+            if self.table_depth == 0:
+                self.done = True
+            if self.in_row or self.cell is not None:
+                self.irregular = True
+        elif tag == "tr":
+            if self.cell is not None:
+                self.irregular = True
+            self.in_row = False
+        elif tag == "td" and self.cell is not None:
+            self.rows[-1].append("".join(self.cell).strip().split("\n")[-1])
+            self.cell = None
+        elif tag in ("script", "style"):
+            self.skip_depth -= 1
+
+    def close(self):
+        super().close()
+        if not self.done:
+            # The table, and so its last row or cell, was never closed
+            self.irregular = True
+
+    def handle_data(self, data):
+        if self.cell is not None and not self.skip_depth and not self.done:
+            self.cell.append(data)
+
+    def handle_charref(self, name):
+        if name.startswith("x"):
+            codepoint = int(name.lstrip("x"), 16)
+        elif name.startswith("X"):
+            codepoint = int(name.lstrip("X"), 16)
+        else:
+            codepoint = int(name)
+
+        # Low code points are read as windows-1252, as BeautifulSoup does
+        data = None
+        if codepoint < 256:
+            try:
+                data = bytes([codepoint]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(codepoint)
+            except (ValueError, OverflowError):
+                pass
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        character = html5_entities.get(f"{name};")
+        self.handle_data(character if character is not None else f"&{name}")
+
+
+TABLE_TAG_PATTERN = re.compile(r"<(/?)table\b[^>]*>", re.IGNORECASE)
+CLASS_ATTRIBUTE_PATTERN = re.compile(
+    r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE
+)
+
+
+def find_table_span(html, table_class="standard_tabelle"):
+    """
+    Finds the start and end positions of the first table with the given class.
+
+    Only the table tags of the page are scanned, so no other markup is parsed.
+
+    Parameters
+    ----------
+    html : str
+        The HTML content of the webpage.
+    table_class : str, optional
+        Class the table must have (default is "standard_tabelle").
+
+    Returns
+    -------
+    tuple
+        The index of the table's opening tag and the index just after its
+        closing tag (the end of the page if it is never closed), or None if
+        no such table exists.
+    """
+    start = None
+    depth = 0
+    for match in TABLE_TAG_PATTERN.finditer(html):
+        is_end_tag = match.group(1) == "/"
+
+        if start is not None:
+            depth += -1 if is_end_tag else 1
+            if depth == 0:
+                return start, match.end()
+        elif not is_end_tag:
+            class_match = CLASS_ATTRIBUTE_PATTERN.search(match.group(0))
+            if class_match:
+                classes = next(g for g in class_match.groups() if g is not None)
+                if table_class in classes.split():
+                    start = match.start()
+                    depth = 1
+
+    if start is not None:
+        return start, len(html)
+    return None
 
 
 def parse_table(html, headers):
     """
     General function to parse HTML table content and return it as a DataFrame.
 
+    The page is not parsed as a whole: the first `standard_tabelle` table is
+    located by scanning the raw HTML for table tags, then only that table is
+    streamed through `StandardTableParser`. The result is the same as
+    `parse_table_soup`, which parses the page instead when the table's
+    markup is irregular, e.g. it holds a nested table or an unclosed cell.
+
+    Parameters
+    ----------
+    html : str
+        The HTML content of the webpage.
+    headers : list
+        List of column headers for the table.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame containing the table data. Returns an empty DataFrame if no table is found.
+    """
+    span = find_table_span(html)
+
+    if span is None:
+        print("Table not found on the page.")
+        return pd.DataFrame()
+
+    parser = StandardTableParser()
+    parser.feed(html[span[0] : span[1]])
+    parser.close()
+    if parser.irregular:
+        return parse_table_soup(html, headers)
+
+    # Skip the header row
+    return pd.DataFrame(parser.rows[1:], columns=headers)
+
+
+def parse_table_soup(html, headers):
+    """
+    Parses HTML table content into a DataFrame by building a full BeautifulSoup tree.
+
+    This is the original implementation of `parse_table`, kept as a reference
+    for checking and benchmarking the streaming parser.
+
     Parameters
     ----------
     html : str
@@ -44,6 +542,8 @@ def parse_table(html, headers):
     pd.DataFrame
         A DataFrame containing the table data. Returns an empty DataFrame if no table is found.
     """
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
     table = soup.find("table", {"class": "standard_tabelle"})
 
@@ -127,7 +627,9 @@ def parse_assists_table(html):
     return parse_table(html=html, headers=headers)
 
 
-def get_season_data(url, season, metric, sleep_time=0.5):
+def get_season_data(
+    url, season, metric, sleep_time=0.5, cache=None, archive=None, league=None
+):
     """
     Gets data (goals or assists) for a specific season from the given URL.
 
@@ -141,16 +643,51 @@ def get_season_data(url, season, metric, sleep_time=0.5):
         Either 'goals' or 'assists' to determine which table to parse.
     sleep_time : float, optional
         Time to sleep between requests to avoid overloading the server (default is 0.5 seconds).
+    cache : HTTPCache, optional
+        On-disk cache for the page. Closed seasons are cached permanently.
+    archive : HTMLArchive, optional
+        Archive the fetched page is appended to, under `league`.
+    league : str, optional
+        The league the page relates to, required with `archive`.
 
     Returns
     -------
     pd.DataFrame
         A DataFrame containing the data for the given season. Returns an empty DataFrame if getting data fails.
     """
-    html = fetch_html(url=url)
+    html = fetch_html(url=url, cache=cache, permanent=is_season_closed(season))
     if html is None:
         return pd.DataFrame()
+    if archive is not None:
+        archive.append(league, metric, season, url, html)
 
+    df = parse_season_html(html=html, season=season, metric=metric)
+
+    # Sleep to avoid overloading the server
+    time.sleep(sleep_time)
+
+    return df
+
+
+@stage("parse")
+def parse_season_html(html, season, metric):
+    """
+    Parses the goals or assists table for a season from the page HTML.
+
+    Parameters
+    ----------
+    html : str
+        The HTML content of the webpage.
+    season : str
+        The season the page relates to.
+    metric : str
+        Either 'goals' or 'assists' to determine which table to parse.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame containing the data for the given season.
+    """
     if metric == "goals":
         df = parse_goals_table(html=html)
     elif metric == "assists":
@@ -163,13 +700,46 @@ def get_season_data(url, season, metric, sleep_time=0.5):
     # Drop unnecessary columns
     df = df.drop(columns=["#", ""], errors="ignore")
 
-    # Sleep to avoid overloading the server
-    time.sleep(sleep_time)
-
     return df
 
 
-def get_all_season_data(seasons, league, metric, sleep_time=0.5):
+@stage("write")
+def save_season_data(season_data, league, metric, season):
+    """
+    Writes a season's data to its individual CSV file.
+
+    Parameters
+    ----------
+    season_data : pd.DataFrame
+        The data for the season.
+    league : str
+        The league the data relates to (e.g., "premier_league").
+    metric : str
+        Either 'goals' or 'assists'.
+    season : str
+        The season the data relates to.
+
+    Returns
+    -------
+    str
+        The path of the CSV written, or None if there was no data to write.
+    """
+    if not season_data.empty:
+        # Define file path
+        file_path = f"data/{league}_{metric}/{season}.csv"
+
+        # Save each season's data to a separate CSV file
+        season_data.to_csv(file_path, index=False)
+        print(f"Data for season {season} saved to {file_path}.")
+        return file_path
+    else:
+        print(f"No data available for season {season}.")
+        return None
+
+
+def get_all_season_data(
+    seasons, league, metric, sleep_time=0.5, cache=None, archive=None
+):
     """
     Gets data (goals or assists) for multiple seasons and writes them as individual CSVs.
 
@@ -181,6 +751,11 @@ def get_all_season_data(seasons, league, metric, sleep_time=0.5):
         Either 'goals' or 'assists' to determine which data to get.
     sleep_time : float, optional
         Time to sleep between requests to avoid overloading the server (default is 0.5 seconds).
+    cache : HTTPCache, optional
+        On-disk cache for the season pages. Closed seasons are cached permanently.
+    archive : HTMLArchive, optional
+        Archive each fetched page is appended to, so the CSVs can be rebuilt
+        from it without the network.
     """
     # Ensure the data directory exists
     os.makedirs("data", exist_ok=True)
@@ -190,18 +765,134 @@ def get_all_season_data(seasons, league, metric, sleep_time=0.5):
 
         # Fetch data for the current season
         season_data = get_season_data(
-            url=url, season=season, metric=metric, sleep_time=sleep_time
+            url=url,
+            season=season,
+            metric=metric,
+            sleep_time=sleep_time,
+            cache=cache,
+            archive=archive,
+            league=league,
         )
 
-        if not season_data.empty:
-            # Define file path
-            file_path = f"data/{league}_{metric}/{season}.csv"
+        save_season_data(
+            season_data=season_data, league=league, metric=metric, season=season
+        )
 
-            # Save each season's data to a separate CSV file
-            season_data.to_csv(file_path, index=False)
-            print(f"Data for season {season} saved to {file_path}.")
-        else:
-            print(f"No data available for season {season}.")
+
+def get_all_season_data_concurrent(
+    seasons,
+    league,
+    metric,
+    session=None,
+    rate_limiter=None,
+    max_workers=8,
+    cache=None,
+    retry=None,
+    timeout=30,
+    checkpoint=None,
+    resume=False,
+    archive=None,
+):
+    """
+    Gets data (goals or assists) for multiple seasons concurrently and writes them as individual CSVs.
+
+    Pages are fetched on a thread pool sharing one pooled session. Requests are
+    paced by a per-host token bucket rather than fixed sleeps, and the number of
+    in-flight requests per host is capped. Timeouts, connection errors and
+    server errors are retried with jittered exponential backoff. The CSV
+    output is the same as `get_all_season_data`.
+
+    Parameters
+    ----------
+    seasons : dict
+        A dictionary where keys are season strings and values are URLs to get data from for those seasons.
+    league : str
+        The league the data relates to (e.g., "premier_league").
+    metric : str
+        Either 'goals' or 'assists' to determine which data to get.
+    session : requests.Session, optional
+        Session to share across requests. Pass the same session (and rate limiter)
+        to several calls to reuse connections between leagues and metrics.
+    rate_limiter : HostRateLimiter, optional
+        Limiter applied to every request (default is a new `HostRateLimiter`).
+    max_workers : int, optional
+        Number of worker threads (default is 8).
+    cache : HTTPCache, optional
+        On-disk cache for the season pages. Closed seasons are cached permanently
+        and served without a request or a rate limit token.
+    retry : RetryPolicy, optional
+        Retries of failed requests (default is a new `RetryPolicy`).
+    timeout : float, optional
+        Seconds to wait for the server to connect or send data before retrying (default is 30).
+    checkpoint : ScrapeCheckpoint, optional
+        Checkpoint recording each season saved.
+    resume : bool, optional
+        Only fetch the seasons the checkpoint does not have (default is False).
+    archive : HTMLArchive, optional
+        Archive each fetched page is appended to, so the CSVs can be rebuilt
+        from it without the network.
+
+    Returns
+    -------
+    list
+        The seasons that were not saved, because their page could not be
+        fetched or had no data, in season order.
+    """
+    # Ensure the data directory exists
+    os.makedirs("data", exist_ok=True)
+
+    if session is None:
+        session = create_session(pool_maxsize=max_workers)
+    if rate_limiter is None:
+        rate_limiter = HostRateLimiter()
+    if retry is None:
+        retry = RetryPolicy()
+    if resume and checkpoint is not None:
+        missing = checkpoint.missing(league, metric, seasons)
+        print(
+            f"Resuming {league} {metric}: {len(seasons) - len(missing)} of "
+            f"{len(seasons)} seasons already saved."
+        )
+        seasons = missing
+
+    def get_season(season, url):
+        html = fetch_html(
+            url=url,
+            session=session,
+            cache=cache,
+            permanent=is_season_closed(season),
+            rate_limiter=rate_limiter,
+            retry=retry,
+            timeout=timeout,
+        )
+        if html is None:
+            return pd.DataFrame()
+        if archive is not None:
+            archive.append(league, metric, season, url, html)
+        return parse_season_html(html=html, season=season, metric=metric)
+
+    not_saved = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            season: executor.submit(get_season, season, url)
+            for season, url in seasons.items()
+        }
+
+        # Save in season order so output and logging are deterministic
+        for season, future in futures.items():
+            print(f"Getting {metric} data for season {season}...")
+            season_data = future.result()
+            file_path = save_season_data(
+                season_data=season_data,
+                league=league,
+                metric=metric,
+                season=season,
+            )
+            if file_path is None:
+                not_saved.append(season)
+            elif checkpoint is not None:
+                checkpoint.record(league, metric, season, file_path, len(season_data))
+    return not_saved
 
 
 def generate_urls(league_name, stat_type, start_season, end_season):
@@ -234,14 +925,109 @@ def generate_urls(league_name, stat_type, start_season, end_season):
     return urls
 
 
-def combine_csvs(directory_path):
+def league_metric_urls(end_season=2024):
+    """
+    Season URLs for each league metric, from the first season scraped for each.
+
+    Parameters
+    ----------
+    end_season : int, optional
+        The season after the last season to scrape (default is 2024).
+
+    Returns
+    -------
+    dict
+        League metric names mapped to dictionaries of season strings to URLs.
+    """
+    return {
+        "premier_league_goals": generate_urls(
+            "eng-premier-league", "goalgetter", 2000, end_season
+        ),
+        "premier_league_assists": generate_urls(
+            "eng-premier-league", "assists", 2000, end_season
+        ),
+        "championship_goals": generate_urls(
+            "eng-championship", "goalgetter", 2000, end_season
+        ),
+        "championship_assists": generate_urls(
+            "eng-championship", "assists", 2014, end_season
+        ),
+    }
+
+
+def season_csv_paths(directory_path):
+    """
+    Paths of the season CSVs in a directory, in season order.
+
+    Season files are named after their season (e.g., "2023-2024.csv"), so
+    sorting the names gives the same order on every machine, unlike
+    `os.listdir`.
+
+    Parameters
+    ----------
+    directory_path : str
+        The path to the directory containing the CSV files.
+
+    Returns
+    -------
+    list
+        The CSV file paths, sorted by name.
+    """
+    return [
+        os.path.join(directory_path, filename)
+        for filename in sorted(os.listdir(directory_path))
+        if filename.endswith(".csv")
+    ]
+
+
+def read_csvs(file_paths, read=pd.read_csv, max_workers=4):
+    """
+    Read CSV files on a thread pool and yield them in the given order.
+
+    At most `max_workers` files are read ahead of the one being consumed, so
+    only a few files are held in memory at a time however many there are.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the CSV files.
+    read : function, optional
+        Reads a file path, into a DataFrame by default (default is `pd.read_csv`).
+    max_workers : int, optional
+        Number of files read at the same time (default is 4).
+
+    Yields
+    ------
+    tuple
+        Each file path and what `read` returned for it.
+    """
+    file_paths = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(
+            (file_path, executor.submit(read, file_path))
+            for file_path in islice(file_paths, max_workers)
+        )
+        while pending:
+            file_path, future = pending.popleft()
+            df = future.result()
+            for next_path in islice(file_paths, 1):
+                pending.append((next_path, executor.submit(read, next_path)))
+            yield file_path, df
+
+
+@stage("combine")
+def combine_csvs(directory_path, max_workers=4):
     """
     Combine all CSV files in a specified directory into a single DataFrame.
 
+    Files are read in parallel and combined in season order.
+
     Parameters
     ----------
     directory_path : str
         The path to the directory containing the CSV files to be combined.
+    max_workers : int, optional
+        Number of files read at the same time (default is 4).
 
     Returns
     -------
@@ -250,16 +1036,13 @@ def combine_csvs(directory_path):
         Additionally, a new column 'season_start' is added, representing the start year
         extracted from the 'Season' column.
     """
-    # List to store DataFrames
-    data_frames = []
-
-    # Loop through all files in the directory
-    for filename in os.listdir(directory_path):
-        if filename.endswith(".csv"):
-            file_path = os.path.join(directory_path, filename)
-            # Read the CSV file into a DataFrame and append to the list
-            df = pd.read_csv(file_path)
-            data_frames.append(df)
+    # Read the CSV files in season order
+    data_frames = [
+        df
+        for _, df in read_csvs(
+            season_csv_paths(directory_path), max_workers=max_workers
+        )
+    ]
 
     # Concatenate all DataFrames into a single DataFrame
     combined_df = pd.concat(data_frames, ignore_index=True)
@@ -270,7 +1053,229 @@ def combine_csvs(directory_path):
     return combined_df
 
 
-def combine_save_csvs(league_metric):
+def season_file_starts(file_paths):
+    """
+    Start years of the season CSVs, from their names (e.g., "2023-2024.csv").
+    """
+    return [int(os.path.basename(file_path)[:4]) for file_path in file_paths]
+
+
+def column_types(df):
+    """
+    Column names and dtypes of a DataFrame, as recorded in a combine manifest.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        A season's data.
+
+    Returns
+    -------
+    tuple
+        "column:dtype" strings in column order.
+    """
+    return tuple(f"{column}:{dtype}" for column, dtype in df.dtypes.items())
+
+
+# Season files are read in chunks of about this many bytes when combined
+COMBINE_CHUNK_SIZE = 1024**2
+
+
+def season_chunks(file_paths, chunk_size=0):
+    """
+    Group consecutive season CSVs into chunks of about `chunk_size` bytes.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the season CSVs, in order.
+    chunk_size : int, optional
+        Size in bytes at which a chunk is closed (default is 0, one file per chunk).
+
+    Returns
+    -------
+    list
+        Tuples of consecutive file paths.
+    """
+    chunks = []
+    chunk, size = [], 0
+    for file_path in file_paths:
+        chunk.append(file_path)
+        size += os.path.getsize(file_path)
+        if size >= chunk_size:
+            chunks.append(tuple(chunk))
+            chunk, size = [], 0
+    if chunk:
+        chunks.append(tuple(chunk))
+    return chunks
+
+
+def render_season_csvs(file_paths):
+    """
+    Read consecutive season CSVs as `read_season_csv` does, check them and render them as rows of the combined CSV.
+
+    Parameters
+    ----------
+    file_paths : tuple
+        Paths of the season CSV files, in order.
+
+    Returns
+    -------
+    tuple
+        The seasons' column types from `column_types`, or None if they
+        differ between the files, their number of rows, the header line,
+        the rows as CSV text and the results of `combined_checks`.
+    """
+    data_frames = [pd.read_csv(file_path) for file_path in file_paths]
+    if len({column_types(df) for df in data_frames}) > 1:
+        return None, 0, "", "", []
+    df = pd.concat(data_frames, ignore_index=True)
+    df["season_start"] = df["Season"].str[:4].astype(int)
+    return (
+        column_types(df),
+        len(df),
+        df.iloc[:0].to_csv(index=False),
+        df.to_csv(index=False, header=False),
+        combined_checks(df),
+    )
+
+
+def write_seasons(file_paths, file, expected_types=None, max_workers=4, chunk_size=0):
+    """
+    Append season CSVs to an open combined file one chunk of seasons at a time, in order.
+
+    Chunks are read, checked and rendered as CSV text in parallel with
+    `read_csvs`, and each is written as soon as the chunks before it are, so
+    the combined data is never held in memory. Writing stops at the first season whose
+    column types differ from `expected_types`, or from the first season's if
+    not given, as concatenating them would change how the earlier seasons
+    are written.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the season CSVs, in order.
+    file : file object
+        The combined file, opened for writing in text mode with newline="".
+        The header is written if it is empty.
+    expected_types : tuple, optional
+        Column types every season must have, from `column_types`.
+    max_workers : int, optional
+        Number of chunks read at the same time (default is 4).
+    chunk_size : int, optional
+        Size in bytes of the chunks, see `season_chunks` (default is 0, one
+        season per chunk).
+
+    Returns
+    -------
+    tuple
+        A dictionary of the first file path of each written chunk to its
+        'rows', byte 'offset' in the combined file and the results of
+        `combined_checks` as 'checks', or None if a season's column types
+        differed, and the column types of the seasons.
+    """
+    written = {}
+    for chunk, (types, rows, header, text, checks) in read_csvs(
+        season_chunks(file_paths, chunk_size),
+        read=render_season_csvs,
+        max_workers=max_workers,
+    ):
+        if expected_types is None:
+            expected_types = types
+        if types is None or types != expected_types:
+            return None, expected_types
+        written[chunk[0]] = {"rows": rows, "offset": file.tell(), "checks": checks}
+        if file.tell() == 0:
+            file.write(header)
+        file.write(text)
+    return written, expected_types
+
+
+def combine_result(file_paths, rows, checks, seasons_changed=None):
+    """
+    What a combine wrote, with the checks run on the seasons as they were written.
+
+    Parameters
+    ----------
+    file_paths : list
+        Paths of the season CSVs combined, in order.
+    rows : int
+        Rows of the combined file.
+    checks : list
+        Results of `combined_checks` over every season.
+    seasons_changed : list, optional
+        The seasons whose data was new or changed, for an incremental combine.
+
+    Returns
+    -------
+    dict
+        'seasons_changed', 'rows' and 'checks', which adds the season
+        continuity of the files and is saved by `validate_league_metric`.
+    """
+    return {
+        "seasons_changed": seasons_changed,
+        "rows": int(rows),
+        "checks": checks + [check_season_continuity(season_file_starts(file_paths))],
+    }
+
+
+@stage("combine")
+def write_combined_csv(
+    directory_path, csv_save_path, max_workers=4, chunk_size=COMBINE_CHUNK_SIZE
+):
+    """
+    Combine the season CSVs in a directory into a CSV file, streaming a chunk of seasons at a time.
+
+    The output is the same as writing `combine_csvs(directory_path)` to CSV.
+    It is written to a temporary file that replaces `csv_save_path` once
+    complete. If the seasons disagree on column types, they are combined in
+    one DataFrame instead, as `combine_csvs` does. Each chunk is checked
+    with `combined_checks` while it is in memory, so the checks do not read
+    the data again.
+
+    Parameters
+    ----------
+    directory_path : str
+        The path to the directory containing the per-season CSV files.
+    csv_save_path : str
+        The path of the combined CSV file.
+    max_workers : int, optional
+        Number of chunks of seasons read at the same time (default is 4).
+    chunk_size : int, optional
+        Size in bytes of the chunks of season files read together (default
+        is `COMBINE_CHUNK_SIZE`). Small files are read in chunks so their
+        per-file overhead is paid once per chunk.
+
+    Returns
+    -------
+    dict
+        The rows written and the results of the checks, from `combine_result`.
+    """
+    file_paths = season_csv_paths(directory_path)
+    if not file_paths:
+        raise ValueError(f"No season CSVs to combine in {directory_path}.")
+
+    temp_path = f"{csv_save_path}.tmp"
+    try:
+        with open(temp_path, "w", newline="") as file:
+            written, _ = write_seasons(
+                file_paths, file, max_workers=max_workers, chunk_size=chunk_size
+            )
+        if written is None:
+            combined_df = combine_csvs(directory_path, max_workers=max_workers)
+            combined_df.to_csv(temp_path, index=False)
+            rows, checks = len(combined_df), combined_checks(combined_df)
+        else:
+            rows = sum(entry["rows"] for entry in written.values())
+            checks = merge_checks([entry["checks"] for entry in written.values()])
+    except Exception:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, csv_save_path)
+    return combine_result(file_paths, rows, checks)
+
+
+def combine_save_csvs(league_metric, incremental=False, max_workers=4):
     """
     Combine CSV files for a specified league metric and save the result to a new CSV file.
 
@@ -279,14 +1284,237 @@ def combine_save_csvs(league_metric):
     league_metric : str
         The metric associated with the league (e.g., "premier-league-goals")
         which defines the directory for input CSV files and the output file name.
+    incremental : bool, optional
+        Only rewrite the seasons that changed since the last combine, tracked in
+        a manifest next to the combined file (default is False). See
+        `update_combined_csv`.
+    max_workers : int, optional
+        Number of season files read at the same time (default is 4).
 
     Returns
     -------
-    None
-        The function does not return a value. It saves the combined DataFrame
-        to a CSV file in a specified directory.
+    dict
+        'seasons_changed', the seasons whose data was new or changed when
+        `incremental` is True and otherwise None, 'rows' and 'checks', the
+        results of the checks run on the seasons as they were combined, to
+        be reported with `validate_league_metric`. The combined DataFrame is
+        saved to a CSV file in a specified directory.
     """
     directory_path = f"data/{league_metric}"
     csv_save_path = f"{directory_path}/combined_seasons/{league_metric}.csv"
-    premier_league_goals = combine_csvs(directory_path)
-    premier_league_goals.to_csv(csv_save_path, index=False)
+
+    if incremental:
+        manifest_path = f"{directory_path}/combined_seasons/manifest.json"
+        return update_combined_csv(
+            directory_path, csv_save_path, manifest_path, max_workers=max_workers
+        )
+
+    return write_combined_csv(directory_path, csv_save_path, max_workers=max_workers)
+
+
+def file_sha256(file_path):
+    """
+    Compute the SHA-256 hash of a file's contents.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file.
+
+    Returns
+    -------
+    str
+        The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_season_csv(file_path):
+    """
+    Read a single season CSV and add the 'season_start' column, as `combine_csvs` does.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the season CSV file.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The season data with the 'season_start' column added.
+    """
+    df = pd.read_csv(file_path)
+    df["season_start"] = df["Season"].str[:4].astype(int)
+    return df
+
+
+@stage("combine")
+def update_combined_csv(directory_path, csv_save_path, manifest_path, max_workers=4):
+    """
+    Incrementally update a combined CSV from the per-season CSVs in a directory.
+
+    The combined file holds the seasons in filename order. A manifest records
+    each season file's SHA-256 hash, row count, size and mtime, along with the
+    byte offset of its rows in the combined file. Files whose size and mtime are
+    unchanged are not read; others are hashed. The combined file is truncated
+    at the first season that was added, changed or removed and only the
+    seasons from there on are appended again, so a change to the latest
+    season rewrites only that season. Nothing is written if no season changed.
+
+    Seasons are read in parallel and streamed to the file in order with
+    `write_seasons`. A full rebuild is done when there is no manifest or a
+    rewritten season's column types differ from the recorded ones. If the
+    season files disagree on types with each other, they are combined in one
+    DataFrame as `combine_csvs` does and no offsets are recorded, so the next
+    update is a full rebuild too.
+
+    The rewritten seasons are checked with `combined_checks` as they are
+    written, and the results kept in the manifest, so the checks of the
+    seasons that were kept are reused and every season is reported.
+
+    Parameters
+    ----------
+    directory_path : str
+        The path to the directory containing the per-season CSV files.
+    csv_save_path : str
+        The path of the combined CSV file.
+    manifest_path : str
+        The path of the JSON manifest.
+    max_workers : int, optional
+        Number of seasons read at the same time (default is 4).
+
+    Returns
+    -------
+    dict
+        The seasons whose data was new or changed, the rows of the combined
+        file and the results of the checks, from `combine_result`.
+    """
+    filenames = sorted(
+        filename for filename in os.listdir(directory_path) if filename.endswith(".csv")
+    )
+
+    manifest = None
+    if os.path.exists(manifest_path) and os.path.exists(csv_save_path):
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+        if manifest["combined_size"] != os.path.getsize(csv_save_path):
+            # The combined file was modified outside of this function
+            manifest = None
+
+    old_entries = manifest["seasons"] if manifest is not None else {}
+    old_filenames = list(old_entries)
+
+    # Hash the season files whose size or mtime moved to find real changes
+    entries = {}
+    changed = []
+    for filename in filenames:
+        file_path = os.path.join(directory_path, filename)
+        stat = os.stat(file_path)
+        entry = old_entries.get(filename)
+
+        if (
+            entry is None
+            or entry["size"] != stat.st_size
+            or entry["mtime"] != stat.st_mtime
+        ):
+            sha256 = file_sha256(file_path)
+            if entry is None or entry["sha256"] != sha256:
+                changed.append(filename)
+                entry = {"sha256": sha256, "rows": None, "offset": None}
+            entry = dict(entry, size=stat.st_size, mtime=stat.st_mtime)
+        entries[filename] = entry
+    seasons_changed = [filename[: -len(".csv")] for filename in changed]
+
+    # Keep the leading seasons that are unchanged and still in the same place
+    keep = 0
+    if manifest is not None and manifest["offsets"]:
+        for old_filename, filename in zip(old_filenames, filenames):
+            if (
+                old_filename != filename
+                or filename in changed
+                or "checks" not in entries[filename]
+            ):
+                break
+            keep += 1
+
+    file_paths = [os.path.join(directory_path, filename) for filename in filenames]
+    if manifest is not None and keep == len(old_filenames) == len(filenames):
+        manifest["seasons"] = entries
+        save_manifest(manifest, manifest_path)
+        print(f"No changes to combine in {directory_path}.")
+        return combine_result(
+            file_paths,
+            sum(entry["rows"] for entry in entries.values()),
+            merge_checks([entry["checks"] for entry in entries.values()]),
+            seasons_changed,
+        )
+
+    if keep > 0:
+        if keep < len(old_filenames):
+            truncate_at = old_entries[old_filenames[keep]]["offset"]
+        else:
+            truncate_at = manifest["combined_size"]
+        with open(csv_save_path, "r+b") as file:
+            file.truncate(truncate_at)
+        with open(csv_save_path, "a", newline="") as file:
+            written, dtypes = write_seasons(
+                file_paths[keep:], file, tuple(manifest["dtypes"]), max_workers
+            )
+        if written is None:
+            # Earlier seasons would be written differently, so rebuild everything
+            keep = 0
+    if keep == 0:
+        with open(csv_save_path, "w", newline="") as file:
+            written, dtypes = write_seasons(file_paths, file, max_workers=max_workers)
+
+    if written is None:
+        # The season files disagree on types, so combine them in one DataFrame
+        frames = {
+            file_path: df
+            for file_path, df in read_csvs(
+                file_paths, read=read_season_csv, max_workers=max_workers
+            )
+        }
+        combined_df = pd.concat(list(frames.values()), ignore_index=True)
+        combined_df.to_csv(csv_save_path, index=False)
+        for filename, df in zip(filenames, frames.values()):
+            entries[filename].update(rows=len(df), offset=None)
+        manifest = {"offsets": False, "dtypes": [], "seasons": entries}
+        written = frames
+        checks = combined_checks(combined_df)
+    else:
+        for file_path, entry in written.items():
+            entries[os.path.basename(file_path)].update(entry)
+        manifest = {"offsets": True, "dtypes": list(dtypes or []), "seasons": entries}
+        checks = merge_checks([entry["checks"] for entry in entries.values()])
+
+    manifest["combined_size"] = os.path.getsize(csv_save_path)
+    save_manifest(manifest, manifest_path)
+    print(f"Combined {len(written)} of {len(filenames)} seasons into {csv_save_path}.")
+    return combine_result(
+        file_paths,
+        sum(entry["rows"] for entry in entries.values()),
+        checks,
+        seasons_changed,
+    )
+
+
+def save_manifest(manifest, manifest_path):
+    """
+    Atomically write a manifest to a JSON file.
+
+    Parameters
+    ----------
+    manifest : dict
+        The manifest to save.
+    manifest_path : str
+        The path of the JSON file.
+    """
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temp_path, manifest_path)
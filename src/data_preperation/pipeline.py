@@ -0,0 +1,533 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+import yaml
+
+from src.data_preperation.columnar_storage import (
+    read_league_metric,
+    write_joined_parquet,
+    write_league_metric_parquet,
+)
+from src.data_preperation.html_archive import HTMLArchive
+from src.data_preperation.http_cache import HTTPCache
+from src.data_preperation.instrumentation import stage
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    compact_dtypes,
+    format_joined_data,
+    join_pl_champ_data,
+    process_league_data,
+    read_combined_csv,
+    rename_duplicated_players,
+)
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    RetryPolicy,
+    combine_save_csvs,
+    create_session,
+    get_all_season_data_concurrent,
+    league_metric_urls,
+)
+from src.data_preperation.player_ids import PlayerIds
+from src.data_preperation.scrape_checkpoint import ScrapeCheckpoint
+from src.data_preperation.validation import validate_joined, validate_league_metric
+
+LEAGUE_METRICS = [
+    "premier_league_goals",
+    "premier_league_assists",
+    "championship_goals",
+    "championship_assists",
+]
+JOINED_PATH = "data/premier_league_championship_joined.csv"
+UNFORMATTED_PATH = "data/premier_league_championship_unformatted.parquet"
+
+
+class Pipeline:
+    """
+    A graph of tasks, run with independent tasks in parallel on a thread pool.
+
+    Each task is a function whose keyword arguments can be the results of
+    other tasks. A task starts as soon as every task it depends on has
+    finished.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+
+    def add(self, name, func, inputs=None, after=(), **kwargs):
+        """
+        Add a task to the pipeline.
+
+        Parameters
+        ----------
+        name : str
+            Unique name of the task.
+        func : callable
+            Function run by the task.
+        inputs : dict, optional
+            Keyword argument names mapped to the names of the tasks whose results are passed.
+        after : iterable, optional
+            Names of tasks that must finish first without passing their results.
+        **kwargs
+            Fixed keyword arguments of `func`.
+        """
+        if name in self.tasks:
+            raise ValueError(f"Task {name} is already in the pipeline.")
+        inputs = dict(inputs or {})
+        self.tasks[name] = {
+            "func": func,
+            "inputs": inputs,
+            "dependencies": list(dict.fromkeys([*inputs.values(), *after])),
+            "kwargs": kwargs,
+        }
+
+    def required_tasks(self, targets=None):
+        """
+        Names of the tasks needed to produce the targets, in the order they were added.
+
+        Parameters
+        ----------
+        targets : list, optional
+            Names of the tasks to run (default is every task).
+
+        Returns
+        -------
+        list
+            The targets and every task they depend on.
+        """
+        targets = list(self.tasks) if targets is None else targets
+        required = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.tasks:
+                raise ValueError(f"Unknown task {name}.")
+            if name not in required:
+                required.add(name)
+                stack.extend(self.tasks[name]["dependencies"])
+        return [name for name in self.tasks if name in required]
+
+    def run(self, targets=None, workers=4):
+        """
+        Run the tasks needed for the targets, starting each as soon as its dependencies finish.
+
+        Parameters
+        ----------
+        targets : list, optional
+            Names of the tasks to run (default is every task).
+        workers : int, optional
+            Number of tasks run at the same time (default is 4). One worker
+            runs the tasks in the order they were added.
+
+        Returns
+        -------
+        dict
+            Task names mapped to their results.
+        """
+        names = self.required_tasks(targets)
+
+        remaining = {name: set(self.tasks[name]["dependencies"]) for name in names}
+        dependents = {name: [] for name in names}
+        for name in names:
+            for dependency in remaining[name]:
+                dependents[dependency].append(name)
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        results = {}
+        running = {}
+        started = {}
+        ready = [name for name in names if not remaining[name]]
+        try:
+            while ready or running:
+                # Start ready tasks in the order they were added, up to the worker count
+                while ready and len(running) < workers:
+                    name = ready.pop(0)
+                    task = self.tasks[name]
+                    kwargs = dict(task["kwargs"])
+                    for argument, dependency in task["inputs"].items():
+                        kwargs[argument] = results[dependency]
+                    running[pool.submit(task["func"], **kwargs)] = name
+                    started[name] = time.perf_counter()
+
+                if not running:
+                    raise ValueError(f"Tasks {sorted(remaining)} depend on each other.")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    del remaining[name]
+                    print(
+                        f"Task {name} finished in {time.perf_counter() - started[name]:.2f}s."
+                    )
+                    for dependent in dependents[name]:
+                        remaining[dependent].discard(name)
+                        if not remaining[dependent]:
+                            ready.append(dependent)
+                ready.sort(key=names.index)
+        finally:
+            pool.shutdown(cancel_futures=True)
+        return results
+
+
+def scrape_clients(max_workers=8, requests_per_second=10, max_in_flight=4):
+    """
+    Create the session, per-host rate limiter, HTTP cache, checkpoint and archive shared by scrape tasks.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Seasons fetched at the same time by each scrape, used to size the
+        session's connection pool (default is 8).
+    requests_per_second : float, optional
+        Requests per second allowed to each host (default is 10).
+    max_in_flight : int, optional
+        Concurrent requests allowed to each host (default is 4).
+
+    Returns
+    -------
+    dict
+        'session', 'rate_limiter', 'cache', 'checkpoint' and 'archive', the
+        keyword arguments of `scrape_league_metric`.
+    """
+    return {
+        "session": create_session(pool_maxsize=max_workers),
+        "rate_limiter": HostRateLimiter(
+            requests_per_second=requests_per_second, max_in_flight=max_in_flight
+        ),
+        "cache": HTTPCache(cache_dir="data/http_cache"),
+        "checkpoint": ScrapeCheckpoint("data/scrape_checkpoint.json"),
+        "archive": HTMLArchive("data/html_archive"),
+    }
+
+
+def scrape_league_metric(
+    league_metric,
+    urls,
+    session,
+    rate_limiter,
+    cache,
+    checkpoint=None,
+    archive=None,
+    max_workers=8,
+    retries=3,
+    timeout=30,
+    resume=False,
+):
+    """
+    Scrape every season of a league metric and write the per-season CSVs.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    urls : dict
+        Season strings mapped to URLs.
+    session : requests.Session
+        Session shared by all scrape tasks.
+    rate_limiter : HostRateLimiter
+        Per-host rate limiter shared by all scrape tasks.
+    cache : HTTPCache
+        HTTP cache shared by all scrape tasks.
+    checkpoint : ScrapeCheckpoint, optional
+        Record of the seasons saved, shared by all scrape tasks.
+    archive : HTMLArchive, optional
+        Archive the fetched pages are appended to.
+    max_workers : int, optional
+        Number of seasons fetched at the same time (default is 8).
+    retries : int, optional
+        Retries of a request after a timeout or server error (default is 3).
+    timeout : float, optional
+        Seconds to wait for the server before retrying (default is 30).
+    resume : bool, optional
+        Only fetch the seasons not yet in the checkpoint (default is False).
+
+    Returns
+    -------
+    list
+        The seasons that were not saved.
+    """
+    league, metric = league_metric.rsplit("_", 1)
+    not_saved = get_all_season_data_concurrent(
+        seasons=urls,
+        league=league,
+        metric=metric,
+        session=session,
+        rate_limiter=rate_limiter,
+        max_workers=max_workers,
+        cache=cache,
+        retry=RetryPolicy(retries=retries),
+        timeout=timeout,
+        checkpoint=checkpoint,
+        resume=resume,
+        archive=archive,
+    )
+    cache.flush()
+    return not_saved
+
+
+def read_combined(league_metric, storage="csv", compact=False):
+    """
+    Read a league metric's combined data.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    storage : str, optional
+        "csv" for the combined CSV or "parquet" for the Parquet dataset (default is "csv").
+    compact : bool, optional
+        Read Team, Country and Season as categoricals and counts and season
+        starts as nullable small integers (default is False).
+
+    Returns
+    -------
+    pd.DataFrame
+        The combined data.
+    """
+    if storage == "parquet":
+        df = read_league_metric(league_metric, compact=compact)
+        return compact_dtypes(df) if compact else df
+    return read_combined_csv(
+        f"data/{league_metric}/combined_seasons/{league_metric}.csv", compact=compact
+    )
+
+
+def register_players(player_ids, duplicated_player_names, **league_metrics):
+    """
+    Add the renamed players of every league metric to the dictionary of player IDs.
+
+    Players are added in the order processing the leagues one after the
+    other would add them, so when the leagues are then processed at the same
+    time no new ID is assigned and the IDs do not depend on which finishes
+    first.
+
+    Parameters
+    ----------
+    player_ids : PlayerIds
+        Dictionary of player IDs.
+    duplicated_player_names : pd.Series
+        Lookup of the player renames from `build_rename_lookup`.
+    **league_metrics
+        League metric names mapped to their combined data.
+    """
+    for league in ["premier_league", "championship"]:
+        for metric in ["assists", "goals"]:
+            df = league_metrics[f"{league}_{metric}"]
+            players = rename_duplicated_players(
+                df[["Player", "Team"]].copy(), duplicated_player_names
+            )["Player"]
+            player_ids.encode(players, df["Country"])
+
+
+def write_joined(df, storage="csv"):
+    """
+    Write the joined dataset to CSV, and to Parquet if that is the storage used.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined and formatted DataFrame.
+    storage : str, optional
+        "csv" or "parquet" (default is "csv").
+    """
+    with stage("write", rows_in=len(df)):
+        # Renamed over the previous file once complete, so readers such as the
+        # query service never see it half written
+        df.to_csv(f"{JOINED_PATH}.tmp", index=False)
+        os.replace(f"{JOINED_PATH}.tmp", JOINED_PATH)
+        if storage == "parquet":
+            write_joined_parquet(df)
+
+
+def write_unformatted(df, file_path=UNFORMATTED_PATH):
+    """
+    Save the joined data before it is formatted, for the format step to read.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data from `join_pl_champ_data`.
+    file_path : str, optional
+        Path of the Parquet file (default is UNFORMATTED_PATH).
+    """
+    with stage("write", rows_in=len(df)):
+        df.to_parquet(f"{file_path}.tmp", index=False)
+        os.replace(f"{file_path}.tmp", file_path)
+
+
+def read_unformatted(file_path=UNFORMATTED_PATH):
+    """
+    Read the joined data saved by `write_unformatted`.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Path of the Parquet file (default is UNFORMATTED_PATH).
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined data, with the dtypes it was saved with.
+    """
+    return pd.read_parquet(file_path)
+
+
+def build_pipeline(
+    stages=("load", "join"),
+    urls=None,
+    storage="csv",
+    compact=False,
+    requests_per_second=10,
+    max_in_flight=4,
+    max_workers=8,
+    resume=False,
+    duplicated_player_names_path="conf/duplicated_player_names.yaml",
+):
+    """
+    Declare the load and join scripts as one task graph.
+
+    The load stage scrapes each league metric, then combines it, checks it
+    and writes its Parquet dataset, and the join stage reads the four
+    combined files, processes each league, then joins, checks, formats and
+    writes them. The four scrapes run at the same time,
+    sharing one session, HTTP cache, checkpoint and per-host rate limiter,
+    and each league metric is combined and read as soon as it is scraped.
+    The two leagues are processed at the same time, once every player has
+    an ID.
+
+    Parameters
+    ----------
+    stages : tuple, optional
+        "load", "join" or both (default is both).
+    urls : dict, optional
+        League metric names mapped to season URLs (default is `league_metric_urls()`).
+    storage : str, optional
+        "csv" or "parquet" input for the join stage (default is "csv").
+    compact : bool, optional
+        Join with categorical text and small integer counts to cut peak
+        memory, with the same output (default is False).
+    requests_per_second : float, optional
+        Requests per second allowed to each host (default is 10).
+    max_in_flight : int, optional
+        Concurrent requests allowed to each host (default is 4).
+    max_workers : int, optional
+        Seasons fetched at the same time by each scrape task (default is 8).
+    resume : bool, optional
+        Only scrape the seasons not in "data/scrape_checkpoint.json" from a
+        previous run (default is False).
+    duplicated_player_names_path : str, optional
+        Path of the duplicated player names config (default is "conf/duplicated_player_names.yaml").
+
+    Returns
+    -------
+    Pipeline
+        The task graph.
+    """
+    pipeline = Pipeline()
+
+    if "load" in stages:
+        urls = league_metric_urls() if urls is None else urls
+        clients = scrape_clients(
+            max_workers=max_workers,
+            requests_per_second=requests_per_second,
+            max_in_flight=max_in_flight,
+        )
+        for league_metric in LEAGUE_METRICS:
+            pipeline.add(
+                f"scrape_{league_metric}",
+                scrape_league_metric,
+                league_metric=league_metric,
+                urls=urls[league_metric],
+                max_workers=max_workers,
+                resume=resume,
+                **clients,
+            )
+        for league_metric in LEAGUE_METRICS:
+            pipeline.add(
+                f"combine_{league_metric}",
+                combine_save_csvs,
+                after=[f"scrape_{league_metric}"],
+                league_metric=league_metric,
+                incremental=True,
+            )
+            pipeline.add(
+                f"validate_{league_metric}",
+                validate_league_metric,
+                inputs={"combined": f"combine_{league_metric}"},
+                league_metric=league_metric,
+            )
+            pipeline.add(
+                f"parquet_{league_metric}",
+                write_league_metric_parquet,
+                after=[f"validate_{league_metric}"],
+                league_metric=league_metric,
+            )
+
+    if "join" in stages:
+        with open(duplicated_player_names_path, "r") as file:
+            rename_lookup = build_rename_lookup(yaml.safe_load(file))
+        player_ids = PlayerIds("data/player_ids.csv")
+
+        for league_metric in LEAGUE_METRICS:
+            pipeline.add(
+                f"read_{league_metric}",
+                read_combined,
+                after=[f"parquet_{league_metric}"] if "load" in stages else [],
+                league_metric=league_metric,
+                storage=storage,
+                compact=compact,
+            )
+        pipeline.add(
+            "register_players",
+            register_players,
+            inputs={
+                league_metric: f"read_{league_metric}"
+                for league_metric in LEAGUE_METRICS
+            },
+            player_ids=player_ids,
+            duplicated_player_names=rename_lookup,
+        )
+        for league in ["premier_league", "championship"]:
+            pipeline.add(
+                f"process_{league}",
+                process_league_data,
+                inputs={
+                    "goals_df": f"read_{league}_goals",
+                    "assists_df": f"read_{league}_assists",
+                },
+                after=["register_players"],
+                duplicated_player_names=rename_lookup,
+                player_ids=player_ids,
+            )
+        pipeline.add(
+            "save_player_ids",
+            player_ids.save,
+            after=["process_premier_league", "process_championship"],
+        )
+        pipeline.add(
+            "join",
+            join_pl_champ_data,
+            inputs={
+                "pl_df": "process_premier_league",
+                "champ_df": "process_championship",
+            },
+        )
+        pipeline.add("validate", validate_joined, inputs={"df": "join"})
+        pipeline.add(
+            "format",
+            format_joined_data,
+            inputs={"pl_champ_merged": "join"},
+            after=["validate"],
+        )
+        pipeline.add(
+            "write",
+            write_joined,
+            inputs={"df": "format"},
+            after=["save_player_ids"],
+            storage=storage,
+        )
+
+    return pipeline
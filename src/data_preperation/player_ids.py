@@ -0,0 +1,195 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class PlayerIds:
+    """
+    Dictionary of stable integer IDs for (Player, Country) identities, saved between runs.
+
+    IDs are assigned in the order identities are first seen, starting from 0,
+    and never change once saved, so merges and groupbys can use integer keys
+    and attach the names again only at output.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Path of the CSV holding the dictionary (default is "data/player_ids.csv").
+    """
+
+    def __init__(self, file_path="data/player_ids.csv"):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self._ranks = None
+
+        if os.path.exists(file_path):
+            # Only empty fields are missing, so names such as "NA" stay strings
+            table = pd.read_csv(
+                file_path,
+                keep_default_na=False,
+                na_values=[""],
+                dtype={"Player": str, "Country": str},
+            )
+            if not (table["player_id"].to_numpy() == np.arange(len(table))).all():
+                raise ValueError(
+                    f"Player IDs in {file_path} are not 0 to {len(table) - 1}."
+                )
+            players = table["Player"].to_numpy(dtype=object)
+            countries = table["Country"].to_numpy(dtype=object)
+        else:
+            players = np.empty(0, dtype=object)
+            countries = np.empty(0, dtype=object)
+        self._set_names(players, countries)
+
+    def _set_names(self, players, countries):
+        self.players = players
+        self.countries = countries
+
+        # Each identity is keyed on the codes of its Player and Country names
+        player_codes, player_levels = pd.factorize(players, use_na_sentinel=False)
+        country_codes, country_levels = pd.factorize(countries, use_na_sentinel=False)
+        self._player_levels = pd.Index(player_levels, dtype=object)
+        self._country_levels = pd.Index(country_levels, dtype=object)
+        self._keys = pd.Index(self._identity_keys(player_codes, country_codes))
+        self._ranks = None
+
+    @staticmethod
+    def _identity_keys(player_codes, country_codes):
+        return (player_codes.astype(np.int64) << 32) | country_codes.astype(np.int64)
+
+    @staticmethod
+    def _level_codes(levels, values):
+        # Codes of values in levels, extending the levels with unseen values
+        codes = levels.get_indexer(values)
+        unseen = codes < 0
+        if unseen.any():
+            levels = levels.append(pd.Index(pd.unique(values[unseen]), dtype=object))
+            codes[unseen] = levels.get_indexer(values[unseen])
+        return levels, codes
+
+    def __len__(self):
+        return len(self.players)
+
+    def encode(self, players, countries):
+        """
+        Return the ID of each (Player, Country) pair, adding unseen identities to the dictionary.
+
+        Each name is hashed once against the distinct names already seen, and
+        the pair is then looked up by integer key.
+
+        Parameters
+        ----------
+        players : pd.Series
+            Player names.
+        countries : pd.Series
+            Countries of the players.
+
+        Returns
+        -------
+        np.ndarray
+            The int64 ID of each pair.
+        """
+        players = np.asarray(players, dtype=object)
+        countries = np.asarray(countries, dtype=object)
+        with self.lock:
+            self._player_levels, player_codes = self._level_codes(
+                self._player_levels, players
+            )
+            self._country_levels, country_codes = self._level_codes(
+                self._country_levels, countries
+            )
+            keys = self._identity_keys(player_codes, country_codes)
+
+            ids = self._keys.get_indexer(keys).astype(np.int64)
+            unseen = ids < 0
+            if unseen.any():
+                new_keys = pd.unique(keys[unseen])
+                self.players = np.concatenate(
+                    [self.players, self._player_levels.to_numpy()[new_keys >> 32]]
+                )
+                self.countries = np.concatenate(
+                    [
+                        self.countries,
+                        self._country_levels.to_numpy()[new_keys & 0xFFFFFFFF],
+                    ]
+                )
+                self._keys = self._keys.append(pd.Index(new_keys))
+                self._ranks = None
+                ids[unseen] = self._keys.get_indexer(keys[unseen])
+        return ids
+
+    def matches(self, df):
+        """
+        Whether the 'player_id' of every row is the ID of its Player and Country in this dictionary.
+
+        Used to check frames saved by an earlier run, e.g. after the
+        dictionary's file was deleted.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame with 'player_id', 'Player' and 'Country' columns.
+
+        Returns
+        -------
+        bool
+            True if every ID is known and names the same identity.
+        """
+        ids = df["player_id"].to_numpy()
+        with self.lock:
+            if len(ids) and (ids.min() < 0 or ids.max() >= len(self.players)):
+                return False
+            return bool(
+                (self.players[ids] == df["Player"].to_numpy(dtype=object)).all()
+                and pd.Series(self.countries[ids]).equals(
+                    pd.Series(df["Country"].to_numpy(dtype=object))
+                )
+            )
+
+    @staticmethod
+    def _sorted_ranks(levels):
+        # Rank of each distinct value in sorted order, -1 where missing
+        values = levels.to_numpy()
+        ranks = np.full(len(values), -1, dtype=np.int64)
+        present = np.flatnonzero(pd.notna(values))
+        if pd.api.types.infer_dtype(values[present]) == "string":
+            # Fixed width strings sort in the same order as Python strings, much faster
+            order = np.argsort(values[present].astype(str), kind="stable")
+            ranks[present[order]] = np.arange(len(order))
+        else:
+            ranks[present] = pd.factorize(values[present], sort=True)[0]
+        return ranks
+
+    def ranks(self):
+        """
+        Rank of each ID's Player and Country in sorted order, as used by a sorted groupby.
+
+        Returns
+        -------
+        tuple
+            Two int64 arrays indexed by ID: the rank of the Player name and the
+            rank of the Country, with -1 where the value is missing.
+        """
+        with self.lock:
+            if self._ranks is None:
+                keys = self._keys.to_numpy()
+                self._ranks = (
+                    self._sorted_ranks(self._player_levels)[keys >> 32],
+                    self._sorted_ranks(self._country_levels)[keys & 0xFFFFFFFF],
+                )
+            return self._ranks
+
+    def save(self):
+        """
+        Write the dictionary to its CSV file.
+        """
+        with self.lock:
+            pd.DataFrame(
+                {
+                    "player_id": np.arange(len(self.players)),
+                    "Player": self.players,
+                    "Country": self.countries,
+                }
+            ).to_csv(self.file_path, index=False)
@@ -0,0 +1,391 @@
+import polars as pl
+import pandas as pd
+
+from src.data_preperation.columnar_storage import league_metric_dataset_path
+from src.data_preperation.instrumentation import stage
+
+LEAGUE_METRICS = [
+    "premier_league_goals",
+    "premier_league_assists",
+    "championship_goals",
+    "championship_assists",
+]
+
+# Read the combined CSVs with the same dtypes and missing value markers as `pd.read_csv`
+COMBINED_SCHEMA = {
+    "Player": pl.String,
+    "Country": pl.String,
+    "Team": pl.String,
+    "Goals": pl.Int64,
+    "Assists": pl.Int64,
+    "Season": pl.String,
+    "season_start": pl.Int64,
+}
+PANDAS_NULL_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+KEYS = ["Player", "Season", "Country", "season_start"]
+
+
+def scan_league_metric(league_metric, storage="csv", data_dir="data"):
+    """
+    Lazily scan a league metric's combined data, without reading it.
+
+    Only the columns and seasons used by the query built on the scan are
+    read when it is collected.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric name (e.g., "premier_league_goals").
+    storage : str, optional
+        "csv" for the combined CSV or "parquet" for the Parquet dataset (default is "csv").
+    data_dir : str, optional
+        Root directory of the data (default is "data").
+
+    Returns
+    -------
+    pl.LazyFrame
+        The combined data, with the dtypes of `COMBINED_SCHEMA`.
+    """
+    if storage == "parquet":
+        dataset_path = league_metric_dataset_path(
+            league_metric, root=f"{data_dir}/parquet"
+        )
+        lf = pl.scan_parquet(
+            dataset_path,
+            hive_partitioning=True,
+            hive_schema={"season_start": pl.Int16},
+        )
+    else:
+        lf = pl.scan_csv(
+            f"{data_dir}/{league_metric}/combined_seasons/{league_metric}.csv",
+            schema_overrides=COMBINED_SCHEMA,
+            null_values=PANDAS_NULL_VALUES,
+        )
+    return lazy_frame(lf)
+
+
+def lazy_frame(df):
+    """
+    Convert a pandas DataFrame or a LazyFrame to a LazyFrame with the dtypes of `COMBINED_SCHEMA`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or pl.LazyFrame
+        Combined data of a league metric, including compact dtypes.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The data as a LazyFrame.
+    """
+    if isinstance(df, pd.DataFrame):
+        df = pl.from_pandas(df).lazy()
+    columns = df.collect_schema().names()
+    return df.with_columns(
+        pl.col(column).cast(dtype)
+        for column, dtype in COMBINED_SCHEMA.items()
+        if column in columns
+    )
+
+
+def rename_duplicated_players(lf, rename_lookup):
+    """
+    Rename players based on duplicated player names, the lazy version of `rename_duplicated_players`.
+
+    Parameters
+    ----------
+    lf : pl.LazyFrame
+        The data of a league metric.
+    rename_lookup : pd.Series
+        Final player names indexed by the original ('Player', 'Team'), from `build_rename_lookup`.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The data with updated player names.
+    """
+    if rename_lookup.empty:
+        return lf
+    renames = pl.LazyFrame(
+        {
+            "Player": rename_lookup.index.get_level_values("Player").astype(str),
+            "Team": rename_lookup.index.get_level_values("Team").astype(str),
+            "Rename": rename_lookup.to_numpy().astype(str),
+        }
+    )
+    return (
+        lf.join(renames, on=["Player", "Team"], how="left", maintain_order="left")
+        .with_columns(pl.coalesce("Rename", "Player").alias("Player"))
+        .drop("Rename")
+    )
+
+
+def process_league_data(goals, assists, rename_lookup):
+    """
+    Merge and group a league's goals and assists, the lazy version of `process_league_data`.
+
+    The outer merge matches missing keys to each other as `pd.merge` does,
+    and the groups come out in the sorted order of a pandas groupby.
+
+    Parameters
+    ----------
+    goals : pl.LazyFrame
+        The league's goals data.
+    assists : pl.LazyFrame
+        The league's assists data.
+    rename_lookup : pd.Series
+        Lookup built with `build_rename_lookup`.
+
+    Returns
+    -------
+    pl.LazyFrame
+        One row per player and season, with the columns of `group_data`.
+    """
+    merged = rename_duplicated_players(assists, rename_lookup).join(
+        rename_duplicated_players(goals, rename_lookup),
+        on=["Player", "Country", "Team", "Season", "season_start"],
+        how="full",
+        nulls_equal=True,
+        coalesce=True,
+    )
+    # Counts are floats after the pandas outer merge, which leaves them missing
+    return (
+        merged.with_columns(
+            pl.col("Assists", "Goals").fill_null(0).cast(pl.Float64),
+            pl.col("Team").fill_null("Unknown"),
+        )
+        .drop_nulls(KEYS)
+        # Sorted once, so groups come out in key order with their teams sorted
+        .sort([*KEYS, "Team"])
+        .group_by(KEYS, maintain_order=True)
+        .agg(
+            pl.col("Team").unique(maintain_order=True).str.join(" / "),
+            pl.col("Assists").sum(),
+            pl.col("Goals").sum(),
+        )
+    )
+
+
+def join_pl_champ_data(pl_lf, champ_lf):
+    """
+    Join Championship season N players to the same players in Premier League season N + 1.
+
+    The lazy version of `join_pl_champ_data`, with the same columns.
+
+    Parameters
+    ----------
+    pl_lf : pl.LazyFrame
+        Processed Premier League data.
+    champ_lf : pl.LazyFrame
+        Processed Championship data.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The joined data, in Premier League row order.
+    """
+    values = ["Season", "season_start", "Team", "Assists", "Goals"]
+    pl_names = {
+        "Season": "Season (PL)",
+        "season_start": "Season Start (PL)",
+        "Team": "Team (PL)",
+        "Assists": "Assists (PL)",
+        "Goals": "Goals (PL)",
+    }
+    champ_names = {
+        "Season": "Season (Champ.)",
+        "season_start": "Season Start (Champ.)",
+        "Team": "Team (Champ.)",
+        "Assists": "Assists (Champ.)",
+        "Goals": "Goals (Champ.)",
+    }
+    champ_lf = champ_lf.select(
+        "Player",
+        "Country",
+        (pl.col("season_start") + 1).alias("lagged_season_start"),
+        *[pl.col(column).alias(champ_names[column]) for column in values],
+    )
+    joined = pl_lf.rename(pl_names).join(
+        champ_lf,
+        left_on=["Player", "Country", "Season Start (PL)"],
+        right_on=["Player", "Country", "lagged_season_start"],
+        how="inner",
+        maintain_order="left",
+    )
+    return joined.with_columns(
+        (pl.col("Team (PL)") == pl.col("Team (Champ.)"))
+        .cast(pl.Int64)
+        .alias("same_team")
+    )
+
+
+def format_season(column):
+    """
+    Format a season column from "YYYY-YYYY" to "YYYY/YY", as `format_season` does.
+
+    Parameters
+    ----------
+    column : str
+        Name of the season column.
+
+    Returns
+    -------
+    pl.Expr
+        The formatted seasons.
+    """
+    parts = pl.col(column).str.split("-")
+    return pl.concat_str(
+        parts.list.get(0), pl.lit("/"), parts.list.get(1).str.slice(-2)
+    ).alias(column)
+
+
+def format_joined_data(lf):
+    """
+    Format the joined data, the lazy version of `format_joined_data`.
+
+    Parameters
+    ----------
+    lf : pl.LazyFrame
+        Output of `join_pl_champ_data`.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The formatted data, sorted by season start and player name.
+    """
+    # The stable pandas sort keeps ties in the grouped order of Season then Country
+    lf = lf.sort(
+        ["Season Start (PL)", "Player", "Season (PL)", "Country"], maintain_order=True
+    )
+    lf = lf.with_columns(
+        pl.when(pl.col("Season Start (Champ.)") < 2014)
+        .then(None)
+        .otherwise(pl.col("Assists (Champ.)"))
+        .alias("Assists (Champ.)"),
+        format_season("Season (PL)"),
+        format_season("Season (Champ.)"),
+    )
+
+    # Whitespace is collapsed as `str.split` does, then the first name is removed
+    last_names = (
+        pl.col("Player")
+        .str.strip_chars()
+        .str.replace_all(r"\s+", " ")
+        .str.replace(r"^\S+ ", "")
+    )
+    return lf.with_columns(
+        pl.concat_str("Player", pl.lit(" ("), "Season (PL)", pl.lit(")")).alias(
+            "Player (PL Season) - Full Name"
+        ),
+        pl.concat_str(last_names, pl.lit(" ("), "Season (PL)", pl.lit(")")).alias(
+            "Player (PL Season)"
+        ),
+        pl.col("Team (PL)", "Team (Champ.)").str.strip_chars_end(" FC"),
+    )
+
+
+def build_query(leagues, rename_lookup, seasons=None):
+    """
+    Build the whole join as one lazy query plan.
+
+    Parameters
+    ----------
+    leagues : dict
+        League metric names mapped to their data, as LazyFrames or pandas DataFrames.
+    rename_lookup : pd.Series
+        Lookup built with `build_rename_lookup`.
+    seasons : tuple, optional
+        Inclusive (first, last) range of Premier League 'season_start' years
+        to join (default is all seasons). The filter is pushed down to the
+        scans, so other seasons are not read.
+
+    Returns
+    -------
+    pl.LazyFrame
+        The joined and formatted data.
+    """
+    leagues = {name: lazy_frame(df) for name, df in leagues.items()}
+    if seasons is not None:
+        first, last = seasons
+        for name, lag in [("premier_league", 0), ("championship", 1)]:
+            for metric in ["goals", "assists"]:
+                leagues[f"{name}_{metric}"] = leagues[f"{name}_{metric}"].filter(
+                    pl.col("season_start").is_between(first - lag, last - lag)
+                )
+
+    processed = {
+        league: process_league_data(
+            leagues[f"{league}_goals"], leagues[f"{league}_assists"], rename_lookup
+        )
+        for league in ["premier_league", "championship"]
+    }
+    joined = join_pl_champ_data(processed["premier_league"], processed["championship"])
+    return format_joined_data(joined)
+
+
+@stage("polars")
+def collect_joined(lf):
+    """
+    Run a query built with `build_query` on the multi-threaded engine.
+
+    Parameters
+    ----------
+    lf : pl.LazyFrame
+        The query.
+
+    Returns
+    -------
+    pd.DataFrame
+        The same columns, dtypes and rows as `format_joined_data` on the pandas path.
+    """
+    return lf.collect().to_pandas()
+
+
+def join_league_metrics(rename_lookup, storage="csv", seasons=None, data_dir="data"):
+    """
+    Scan the four combined datasets and join them with the Polars backend.
+
+    Parameters
+    ----------
+    rename_lookup : pd.Series
+        Lookup built with `build_rename_lookup`.
+    storage : str, optional
+        "csv" or "parquet" (default is "csv").
+    seasons : tuple, optional
+        Inclusive (first, last) range of Premier League seasons to join (default is all seasons).
+    data_dir : str, optional
+        Root directory of the data (default is "data").
+
+    Returns
+    -------
+    pd.DataFrame
+        The joined and formatted data.
+    """
+    leagues = {
+        league_metric: scan_league_metric(
+            league_metric, storage=storage, data_dir=data_dir
+        )
+        for league_metric in LEAGUE_METRICS
+    }
+    return collect_joined(build_query(leagues, rename_lookup, seasons=seasons))
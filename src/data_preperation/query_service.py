@@ -0,0 +1,427 @@
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+JOINED_PATH = "data/premier_league_championship_joined.csv"
+
+# Players who played for several teams in a season have them joined by `group_data`
+TEAM_SEPARATOR = " / "
+
+LEAGUE_COLUMNS = {
+    "pl": ("Team (PL)", "Season Start (PL)"),
+    "champ": ("Team (Champ.)", "Season Start (Champ.)"),
+}
+
+
+def key_index(values, separator=None):
+    """
+    Map each distinct key to the positions of the rows holding it.
+
+    Parameters
+    ----------
+    values : pd.Series
+        Key of each row. Missing keys are left out.
+    separator : str, optional
+        If given, each value is split on it and the row is indexed under every part.
+
+    Returns
+    -------
+    dict
+        Keys mapped to NumPy arrays of row positions, in row order.
+    """
+    keys = pd.Series(values.to_numpy(), index=np.arange(len(values)))
+    if separator is not None:
+        keys = keys.str.split(separator).explode()
+    keys = keys.dropna()
+    return {
+        key: positions.to_numpy()
+        for key, positions in keys.index.to_series().groupby(keys.to_numpy())
+    }
+
+
+class JoinedIndex:
+    """
+    The joined data with indexes for point and range queries.
+
+    Rows are kept as JSON ready records, with missing values as None, and
+    every query looks up row positions in an index and returns the records at
+    those positions, so no query scans the data.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data, as written by the join script.
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.records = df.astype(object).where(df.notna(), None).to_dict("records")
+        self.numeric = {
+            column: df[column].to_numpy(dtype=np.float64)
+            for column in df.select_dtypes("number").columns
+        }
+
+        self.players = key_index(df["Player"])
+        self.teams = {
+            league: key_index(df[team_column], separator=TEAM_SEPARATOR)
+            for league, (team_column, _) in LEAGUE_COLUMNS.items()
+        }
+
+        # Positions sorted by season start, stable so rows keep the file order within a season
+        self.seasons = {}
+        for league, (_, season_column) in LEAGUE_COLUMNS.items():
+            order = np.argsort(df[season_column].to_numpy(), kind="stable")
+            self.seasons[league] = (df[season_column].to_numpy()[order], order)
+
+        # Numeric columns in Championship season order, so a season range is a slice
+        champ_order = self.seasons["champ"][1]
+        self.champ_values = {
+            column: values[champ_order] for column, values in self.numeric.items()
+        }
+
+    def __len__(self):
+        return len(self.records)
+
+    def rows(self, positions):
+        return [self.records[position] for position in positions]
+
+    def season_slice(self, first, last, league="pl"):
+        starts, _ = self.seasons[league]
+        return slice(
+            np.searchsorted(starts, first, side="left"),
+            np.searchsorted(starts, last, side="right"),
+        )
+
+    def season_positions(self, first, last, league="pl"):
+        return self.seasons[league][1][self.season_slice(first, last, league)]
+
+    def player(self, name):
+        """
+        Every Premier League season of a player, with the Championship season before it.
+
+        Parameters
+        ----------
+        name : str
+            Full player name, as in the 'Player' column.
+
+        Returns
+        -------
+        list
+            The player's rows as dictionaries, in season order.
+        """
+        return self.rows(self.players.get(name, ()))
+
+    def team(self, name, league="pl"):
+        """
+        Players who played for a team, in the Premier League or in the Championship season before.
+
+        With `league="champ"` these are the players promoted with, or signed
+        from, the team.
+
+        Parameters
+        ----------
+        name : str
+            Team name, as in the 'Team (PL)' and 'Team (Champ.)' columns.
+        league : str, optional
+            "pl" or "champ" (default is "pl").
+
+        Returns
+        -------
+        list
+            The rows as dictionaries, in file order.
+        """
+        return self.rows(self.teams[league].get(name, ()))
+
+    def seasons_between(self, first, last, league="pl"):
+        """
+        Rows whose season starts between two years, in the Premier League or the Championship.
+
+        Parameters
+        ----------
+        first : int
+            First season start year, inclusive.
+        last : int
+            Last season start year, inclusive.
+        league : str, optional
+            "pl" or "champ" (default is "pl").
+
+        Returns
+        -------
+        list
+            The rows as dictionaries, in season order.
+        """
+        return self.rows(self.season_positions(first, last, league))
+
+    def top(self, first, last, column="Goals (Champ.)", n=10):
+        """
+        Rows with the highest values of a column among Championship seasons between two years.
+
+        Parameters
+        ----------
+        first : int
+            First Championship season start year, inclusive.
+        last : int
+            Last Championship season start year, inclusive.
+        column : str, optional
+            Numeric column to rank by (default is "Goals (Champ.)"). Rows where
+            it is missing are left out.
+        n : int, optional
+            Number of rows returned (default is 10).
+
+        Returns
+        -------
+        list
+            The rows as dictionaries, highest first and in file order for ties.
+        """
+        if column not in self.champ_values:
+            raise ValueError(f"{column!r} is not a numeric column.")
+        if n < 1:
+            raise ValueError("n must be at least 1.")
+        seasons = self.season_slice(first, last, league="champ")
+        values = self.champ_values[column][seasons]
+        candidates = np.flatnonzero(~np.isnan(values))
+        if len(candidates) > n:
+            # Only values from the n-th highest up need sorting
+            threshold = np.partition(values[candidates], len(candidates) - n)[
+                len(candidates) - n
+            ]
+            candidates = candidates[values[candidates] >= threshold]
+        ranked = candidates[np.argsort(-values[candidates], kind="stable")[:n]]
+        return self.rows(self.seasons["champ"][1][seasons][ranked])
+
+
+class QueryService:
+    """
+    Answer queries on the joined data from indexes held in memory, reloading them when the file changes.
+
+    A reload builds a new `JoinedIndex` and swaps it in, so queries running
+    at the same time keep using the previous one.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Path of the joined CSV (default is "data/premier_league_championship_joined.csv").
+    """
+
+    def __init__(self, file_path=JOINED_PATH):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.load()
+
+    def file_stamp(self):
+        stat = os.stat(self.file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """
+        Read the joined CSV and build its indexes.
+        """
+        with self.lock:
+            stamp = self.file_stamp()
+            index = JoinedIndex(pd.read_csv(self.file_path))
+            self.index, self.stamp, self.loaded_at = index, stamp, time.time()
+        print(f"Loaded {len(index)} rows from {self.file_path}.")
+
+    def reload_if_changed(self):
+        """
+        Reload the data if the file's size or modification time changed.
+
+        The join writes a new file and renames it over the old one, so a
+        changed file is always complete. If it cannot be read, the previous
+        data is kept.
+
+        Returns
+        -------
+        bool
+            Whether the data was reloaded.
+        """
+        try:
+            stamp = self.file_stamp()
+        except FileNotFoundError:
+            return False
+        if stamp == self.stamp:
+            return False
+
+        try:
+            self.load()
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, KeyError) as e:
+            print(f"Keeping the previous data, {self.file_path} could not be read: {e}")
+            self.stamp = stamp
+            return False
+        return True
+
+    def watch(self, interval=1.0):
+        """
+        Check the file for changes every `interval` seconds on a background thread.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between checks (default is 1.0). A new file is picked up
+            within an interval of being written.
+
+        Returns
+        -------
+        threading.Thread
+            The watching thread. Call `close()` to stop it.
+        """
+
+        def run():
+            while not self.stop_event.wait(interval):
+                self.reload_if_changed()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self.stop_event.set()
+
+    def player(self, name):
+        return self.index.player(name)
+
+    def team(self, name, league="pl"):
+        return self.index.team(name, league)
+
+    def seasons_between(self, first, last, league="pl"):
+        return self.index.seasons_between(first, last, league)
+
+    def top(self, first, last, column="Goals (Champ.)", n=10):
+        return self.index.top(first, last, column, n)
+
+
+def league_param(params):
+    league = params.get("league", "pl")
+    if league not in LEAGUE_COLUMNS:
+        raise ValueError(f"league must be one of {', '.join(LEAGUE_COLUMNS)}.")
+    return league
+
+
+ROUTES = {
+    "/player": lambda service, params: service.player(params["name"]),
+    "/team": lambda service, params: service.team(params["name"], league_param(params)),
+    "/seasons": lambda service, params: service.seasons_between(
+        int(params["first"]), int(params["last"]), league_param(params)
+    ),
+    "/top": lambda service, params: service.top(
+        int(params["first"]),
+        int(params["last"]),
+        params.get("column", "Goals (Champ.)"),
+        int(params.get("n", 10)),
+    ),
+}
+
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """
+    Create an HTTP server answering queries with JSON.
+
+    Endpoints, all GET with query string parameters:
+
+    - /player?name=NAME
+    - /team?name=TEAM&league=pl|champ
+    - /seasons?first=YEAR&last=YEAR&league=pl|champ
+    - /top?first=YEAR&last=YEAR&column=COLUMN&n=N
+    - /health, the number of rows and when they were loaded
+
+    Query responses are a JSON object with the matching 'rows'. Missing or
+    invalid parameters get a 400 and unknown paths a 404. Connections are
+    kept alive between requests.
+
+    Parameters
+    ----------
+    service : QueryService
+        The service answering the queries.
+    host : str, optional
+        Address to listen on (default is "127.0.0.1").
+    port : int, optional
+        Port to listen on, 0 for any free port (default is 8000).
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The server, not yet started. Call `serve_forever()` to start it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # The headers and body are written separately, which Nagle's algorithm would delay
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if url.path == "/health":
+                self.send_json(
+                    200,
+                    {"rows": len(service.index), "loaded_at": service.loaded_at},
+                )
+                return
+            route = ROUTES.get(url.path)
+            if route is None:
+                self.send_json(404, {"error": f"Unknown path {url.path}"})
+                return
+            try:
+                rows = route(service, params)
+            except KeyError as e:
+                self.send_json(400, {"error": f"Missing parameter {e}"})
+                return
+            except ValueError as e:
+                self.send_json(400, {"error": str(e)})
+                return
+            self.send_json(200, {"rows": rows})
+
+        def send_json(self, status, payload):
+            content = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve queries on the joined data over HTTP."
+    )
+    parser.add_argument("--file", default=JOINED_PATH, help="Joined CSV to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks for a new joined file",
+    )
+    args = parser.parse_args()
+
+    service = QueryService(args.file)
+    service.watch(args.interval)
+    server = make_server(service, args.host, args.port)
+    print(f"Serving queries on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+
+
+class ScrapeCheckpoint:
+    """
+    Record of the season pages already fetched, parsed and saved, so an interrupted scrape can resume.
+
+    Each (league, metric, season) page is recorded once its CSV has been
+    written, with the number of rows and the path of the file, and the record
+    is saved to disk straight away, so a scrape stopped part way through
+    keeps everything it finished. A page counts as done only while its CSV
+    still exists.
+
+    Parameters
+    ----------
+    file_path : str, optional
+        Path of the JSON checkpoint (default is "data/scrape_checkpoint.json").
+    """
+
+    def __init__(self, file_path="data/scrape_checkpoint.json"):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        if os.path.exists(file_path):
+            with open(file_path, "r") as file:
+                self.pages = json.load(file)
+        else:
+            self.pages = {}
+
+    @staticmethod
+    def key(league, metric, season):
+        return f"{league}/{metric}/{season}"
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.pages, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.file_path)
+
+    def is_done(self, league, metric, season):
+        """
+        Whether a season page has been saved and its CSV is still on disk.
+
+        Parameters
+        ----------
+        league : str
+            The league (e.g., "premier_league").
+        metric : str
+            Either 'goals' or 'assists'.
+        season : str
+            Season string in the format "YYYY-YYYY".
+
+        Returns
+        -------
+        bool
+            True if the page does not need fetching again.
+        """
+        with self.lock:
+            entry = self.pages.get(self.key(league, metric, season))
+        return entry is not None and os.path.exists(entry["file_path"])
+
+    def record(self, league, metric, season, file_path, rows):
+        """
+        Record a saved season page and write the checkpoint to disk.
+
+        Parameters
+        ----------
+        league : str
+            The league (e.g., "premier_league").
+        metric : str
+            Either 'goals' or 'assists'.
+        season : str
+            Season string in the format "YYYY-YYYY".
+        file_path : str
+            Path of the season's CSV.
+        rows : int
+            Number of rows saved.
+        """
+        with self.lock:
+            self.pages[self.key(league, metric, season)] = {
+                "file_path": file_path,
+                "rows": rows,
+                "saved_at": time.time(),
+            }
+            self._save()
+
+    def missing(self, league, metric, seasons):
+        """
+        The seasons of a league metric that are not done, in the order given.
+
+        Parameters
+        ----------
+        league : str
+            The league (e.g., "premier_league").
+        metric : str
+            Either 'goals' or 'assists'.
+        seasons : dict
+            Season strings mapped to URLs.
+
+        Returns
+        -------
+        dict
+            The seasons to fetch, mapped to their URLs.
+        """
+        return {
+            season: url
+            for season, url in seasons.items()
+            if not self.is_done(league, metric, season)
+        }
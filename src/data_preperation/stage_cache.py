@@ -0,0 +1,287 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+import pyarrow as pa
+
+from src.data_preperation.instrumentation import stage
+from src.data_preperation.load_pl_championship_data import file_sha256
+
+
+def inputs_digest(paths):
+    """
+    Hash the contents of input files, and of every file under input directories.
+
+    Parameters
+    ----------
+    paths : list
+        Paths of files or directories, such as a combined CSV or a Parquet dataset.
+
+    Returns
+    -------
+    str
+        The hex digest of the paths and contents, in the order given.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths = sorted(
+                os.path.join(root, file_name)
+                for root, _, file_names in os.walk(path)
+                for file_name in file_names
+            )
+        else:
+            file_paths = [path]
+        for file_path in file_paths:
+            digest.update(f"{file_path}\0{file_sha256(file_path)}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def source_digest(*objects):
+    """
+    Hash the source of every module a stage depends on, so cached results are not used after the code changes.
+
+    The modules defining the given functions or classes are hashed along with
+    every module of the same top-level package they import, followed
+    transitively. Modules imported inside functions are not followed, so
+    pass an object from each of them too.
+
+    Parameters
+    ----------
+    *objects : callable
+        Functions or classes the stage runs, e.g. `process_league_data`.
+
+    Returns
+    -------
+    str
+        The hex digest of the module names and source files.
+    """
+
+    def module_name(module):
+        # The imported name of a module run as a script with `python -m`
+        spec = getattr(module, "__spec__", None)
+        return spec.name if spec is not None else module.__name__
+
+    pending = [sys.modules[obj.__module__] for obj in objects]
+    package = module_name(pending[0]).split(".")[0]
+    modules = {}
+    while pending:
+        module = pending.pop()
+        if module_name(module) in modules:
+            continue
+        modules[module_name(module)] = module
+        for value in vars(module).values():
+            name = value.__name__ if inspect.ismodule(value) else None
+            if name is None:
+                name = getattr(value, "__module__", None)
+            if (
+                isinstance(name, str)
+                and name.split(".")[0] == package
+                and name in sys.modules
+                # A package's attributes are whichever submodules happen to be imported
+                and not hasattr(sys.modules[name], "__path__")
+            ):
+                pending.append(sys.modules[name])
+
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        source = file_sha256(inspect.getsourcefile(modules[name]))
+        digest.update(f"{name}\0{source}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    On-disk cache of the DataFrames returned by pipeline stages, keyed by their inputs.
+
+    Each result is stored as an uncompressed Arrow IPC (Feather) file and
+    read back through a memory map, so a cached stage costs little more
+    than copying its columns into pandas. An index maps each key to the
+    stage that produced it, its size and when it was last used, and the
+    least recently used entries are evicted once the files exceed
+    `max_bytes`.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory holding the cache (default is "data/stage_cache").
+    max_bytes : int, optional
+        Maximum total size of the stored results (default is 512 MB).
+    """
+
+    def __init__(self, cache_dir="data/stage_cache", max_bytes=512 * 1024**2):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+
+        # Counters for the lifetime of this cache object
+        self.hits = 0
+        self.misses = 0
+        self.invalid = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as file:
+                self.entries = json.load(file)
+        else:
+            self.entries = {}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.arrow")
+
+    def _save_index(self):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.index_path)
+
+    def _evict(self, keep_key):
+        while (
+            sum(entry["size"] for entry in self.entries.values()) > self.max_bytes
+            and len(self.entries) > 1
+        ):
+            key = min(
+                (key for key in self.entries if key != keep_key),
+                key=lambda key: self.entries[key]["last_access"],
+            )
+            del self.entries[key]
+            os.remove(self._path(key))
+            self.evictions += 1
+
+    @staticmethod
+    def key(stage_name, *parts):
+        """
+        Build the key of a stage's result from everything the result depends on.
+
+        Parameters
+        ----------
+        stage_name : str
+            Name of the stage.
+        *parts
+            Input digests, other keys and options, hashed by their `repr`.
+
+        Returns
+        -------
+        str
+            The hex digest identifying the result.
+        """
+        return hashlib.sha256(repr((stage_name, *parts)).encode("utf-8")).hexdigest()
+
+    def load(self, key):
+        """
+        Read a cached result, or return None if the key is not cached.
+
+        Parameters
+        ----------
+        key : str
+            Key built with `key`.
+
+        Returns
+        -------
+        pd.DataFrame
+            The result, with the dtypes and index it was stored with.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and not os.path.exists(self._path(key)):
+                # The file was removed from disk, so treat the key as uncached
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["last_access"] = time.time()
+            self.hits += 1
+            self._save_index()
+
+        with stage("cache") as current:
+            with pa.memory_map(self._path(key), "r") as source:
+                df = pa.ipc.open_file(source).read_all().to_pandas()
+            current.rows_out = len(df)
+        return df
+
+    def store(self, key, df, stage_name=None):
+        """
+        Store a result, evicting least recently used entries if over the size cap.
+
+        Parameters
+        ----------
+        key : str
+            Key built with `key`.
+        df : pd.DataFrame
+            The result.
+        stage_name : str, optional
+            Name of the stage, kept in the index for inspection.
+        """
+        table = pa.Table.from_pandas(df)
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.entries[key] = {
+                "stage": stage_name,
+                "size": os.path.getsize(path),
+                "last_access": time.time(),
+            }
+            self._evict(keep_key=key)
+            self._save_index()
+
+    def memoize(self, key, func, *args, valid=None, **kwargs):
+        """
+        Return the cached result of a stage, or run it and cache the result.
+
+        Parameters
+        ----------
+        key : str
+            Key built with `key` from everything the result depends on.
+        func : callable
+            The stage, returning a DataFrame.
+        *args, **kwargs
+            Arguments of `func`.
+        valid : callable, optional
+            Check of a cached result, which is recomputed if it returns False.
+
+        Returns
+        -------
+        pd.DataFrame
+            The result of `func`.
+        """
+        df = self.load(key)
+        if df is not None:
+            if valid is None or valid(df):
+                return df
+            with self.lock:
+                self.invalid += 1
+        df = func(*args, **kwargs)
+        self.store(key, df, stage_name=func.__name__)
+        return df
+
+    def stats(self):
+        """
+        Return counters and the current size of the cache.
+
+        Returns
+        -------
+        dict
+            'hits', 'misses', 'invalid' (hits recomputed as their check
+            failed), 'evictions', 'entries' and 'bytes'.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalid": self.invalid,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": sum(entry["size"] for entry in self.entries.values()),
+            }
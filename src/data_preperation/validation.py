@@ -0,0 +1,540 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_preperation.instrumentation import stage
+
+REPORT_DIR = "data/validation"
+JOINED_NAME = "premier_league_championship_joined"
+
+# Clubs promoted from the Championship to the Premier League each season
+PROMOTED_TEAMS_PER_SEASON = 3
+
+# Failing rows or values kept in a check's report
+MAX_EXAMPLES = 5
+
+COMBINED_SCHEMA = {
+    "Player": "string",
+    "Country": "string",
+    "Team": "string",
+    "Season": "string",
+    "season_start": "integer",
+}
+COUNT_COLUMNS = ["Goals", "Assists"]
+JOINED_SCHEMA = {
+    "Player": "string",
+    "Country": "string",
+    "Season Start (PL)": "integer",
+    "Team (PL)": "string",
+    "Assists (PL)": "number",
+    "Goals (PL)": "number",
+    "Season Start (Champ.)": "integer",
+    "Team (Champ.)": "string",
+    "Assists (Champ.)": "number",
+    "Goals (Champ.)": "number",
+    "same_team": "integer",
+}
+JOINED_KEYS = ["Player", "Country", "Season Start (PL)"]
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a dataset fails a check, carrying the report of every check run.
+
+    Parameters
+    ----------
+    report : dict
+        The report from `build_report`.
+    """
+
+    def __init__(self, report):
+        self.report = report
+        failed = [check["check"] for check in report["checks"] if not check["passed"]]
+        super().__init__(
+            f"{report['dataset']} failed validation: {', '.join(failed)}. "
+            f"See {report.get('path', 'the report')}."
+        )
+
+
+def check_result(name, failures, examples=None, cpu_seconds=0.0):
+    """
+    The result of one check, as kept in a report.
+
+    Parameters
+    ----------
+    name : str
+        Name of the check.
+    failures : int
+        Number of failing rows or values.
+    examples : list, optional
+        Some of the failing rows or values.
+    cpu_seconds : float, optional
+        CPU time the check took, which unlike wall time is not inflated
+        when chunks are checked on several threads.
+
+    Returns
+    -------
+    dict
+        'check', 'passed', 'failures', 'examples' and 'cpu_seconds'.
+    """
+    return {
+        "check": name,
+        "passed": int(failures) == 0,
+        "failures": int(failures),
+        "examples": (examples or [])[:MAX_EXAMPLES],
+        "cpu_seconds": cpu_seconds,
+    }
+
+
+def records(df):
+    # JSON safe rows, with missing values as null
+    return json.loads(df.head(MAX_EXAMPLES).to_json(orient="records"))
+
+
+def is_kind(dtype, kind):
+    if kind == "string":
+        if isinstance(dtype, pd.CategoricalDtype):
+            return is_kind(dtype.categories.dtype, kind)
+        return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(
+            dtype
+        )
+    if kind == "integer":
+        return pd.api.types.is_integer_dtype(dtype)
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+        dtype
+    )
+
+
+def check_schema(df, schema):
+    """
+    Check that the columns of a schema are present with the expected kind of dtype.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The data.
+    schema : dict
+        Column names mapped to "string" (object, string or categorical of
+        strings), "integer" (numpy or nullable integers) or "number".
+
+    Returns
+    -------
+    dict
+        The check result, with the wrong columns as examples.
+    """
+    start = time.thread_time()
+    wrong = [
+        {
+            "column": column,
+            "expected": kind,
+            "dtype": str(df[column].dtype) if column in df else "missing",
+        }
+        for column, kind in schema.items()
+        if column not in df or not is_kind(df[column].dtype, kind)
+    ]
+    return check_result("schema", len(wrong), wrong, time.thread_time() - start)
+
+
+def check_unique(df, keys):
+    """
+    Check that no two rows have the same key.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The data.
+    keys : list
+        Columns making up the key.
+
+    Returns
+    -------
+    dict
+        The check result, counting the rows repeating an earlier key.
+    """
+    start = time.thread_time()
+    failures = df.duplicated(keys).sum()
+    examples = None
+    if failures:
+        examples = records(df.loc[df.duplicated(keys, keep=False), keys])
+    return check_result("unique_keys", failures, examples, time.thread_time() - start)
+
+
+def check_non_negative(df, columns):
+    """
+    Check that counts are not negative, ignoring missing values.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The data.
+    columns : list
+        The count columns present in `df`.
+
+    Returns
+    -------
+    dict
+        The check result, counting the rows with a negative count.
+    """
+    start = time.thread_time()
+    negative = np.zeros(len(df), dtype=bool)
+    for column in columns:
+        negative |= (df[column] < 0).to_numpy(dtype=bool, na_value=False)
+    failures = negative.sum()
+    examples = records(df.loc[negative, columns]) if failures else None
+    return check_result(
+        "non_negative_counts", failures, examples, time.thread_time() - start
+    )
+
+
+def check_season_labels(df, season_column="Season", start_column="season_start"):
+    """
+    Check that each season label reads "YYYY-YYYY" for consecutive years starting at its start year.
+
+    Each distinct label is parsed once, so the cost is one factorize of the labels.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The data.
+    season_column : str, optional
+        Column of season labels (default is "Season").
+    start_column : str, optional
+        Column of season start years (default is "season_start").
+
+    Returns
+    -------
+    dict
+        The check result, counting the rows whose label is malformed or
+        does not match their start year.
+    """
+    start = time.thread_time()
+    codes, labels = pd.factorize(df[season_column])
+    label_starts = np.full(len(labels) + 1, -1, dtype=np.int64)
+    for position, label in enumerate(labels):
+        first, _, second = str(label).partition("-")
+        if first.isdigit() and second.isdigit() and int(second) == int(first) + 1:
+            label_starts[position] = int(first)
+    # Missing labels have code -1, which picks the last, unmatched entry
+    wrong = label_starts[codes] != df[start_column].to_numpy(dtype=np.int64)
+    failures = wrong.sum()
+    examples = (
+        records(df.loc[wrong, [season_column, start_column]].drop_duplicates())
+        if failures
+        else None
+    )
+    return check_result("season_labels", failures, examples, time.thread_time() - start)
+
+
+def check_season_continuity(season_starts):
+    """
+    Check that no season is missing between the first and last season.
+
+    Parameters
+    ----------
+    season_starts : array-like
+        Season start years, repeated or not.
+
+    Returns
+    -------
+    dict
+        The check result, with the missing seasons as examples.
+    """
+    start = time.thread_time()
+    seasons = np.unique(np.asarray(season_starts, dtype=np.int64))
+    missing = (
+        np.setdiff1d(np.arange(seasons[0], seasons[-1] + 1), seasons).tolist()
+        if len(seasons)
+        else []
+    )
+    return check_result(
+        "season_continuity", len(missing), missing, time.thread_time() - start
+    )
+
+
+def check_season_lag(df):
+    """
+    Check that each joined Premier League season follows its Championship season.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data.
+
+    Returns
+    -------
+    dict
+        The check result, counting the rows of other pairs of seasons.
+    """
+    start = time.thread_time()
+    columns = ["Season Start (Champ.)", "Season Start (PL)"]
+    wrong = (df[columns[0]].to_numpy(dtype=np.int64) + 1) != df[columns[1]].to_numpy(
+        dtype=np.int64
+    )
+    failures = wrong.sum()
+    examples = records(df.loc[wrong, ["Player", *columns]]) if failures else None
+    return check_result("season_lag", failures, examples, time.thread_time() - start)
+
+
+def check_promoted_teams(df, promoted_teams=PROMOTED_TEAMS_PER_SEASON):
+    """
+    Check the promoted team flag and the number of promoted teams in each season.
+
+    A row is flagged when the player's Premier League team is their
+    Championship team of the season before, so flagged rows must have the
+    same team in both leagues and come from at most `promoted_teams`
+    Championship teams per season. Fewer is possible, as a promoted club
+    may have no player in both leagues' tables.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data.
+    promoted_teams : int, optional
+        Teams promoted each season (default is 3).
+
+    Returns
+    -------
+    dict
+        The check result, counting the rows whose flag disagrees with their
+        teams and the seasons with too many promoted teams.
+    """
+    start = time.thread_time()
+    same_team = df["Team (PL)"].to_numpy(dtype=object) == df["Team (Champ.)"].to_numpy(
+        dtype=object
+    )
+    flagged = df["same_team"].to_numpy() == 1
+    wrong_flag = same_team != flagged
+    teams = (
+        df.loc[flagged, ["Season Start (Champ.)", "Team (Champ.)"]]
+        .astype({"Team (Champ.)": object})
+        .groupby("Season Start (Champ.)", observed=True)["Team (Champ.)"]
+        .nunique()
+    )
+    too_many = teams[teams > promoted_teams]
+    failures = wrong_flag.sum() + len(too_many)
+    examples = None
+    if failures:
+        examples = [
+            {"Season Start (Champ.)": int(season), "promoted_teams": int(count)}
+            for season, count in too_many.items()
+        ] + records(
+            df.loc[wrong_flag, ["Player", "Team (PL)", "Team (Champ.)", "same_team"]]
+        )
+    return check_result(
+        "promoted_teams", failures, examples, time.thread_time() - start
+    )
+
+
+def combined_checks(df):
+    """
+    The checks of combined league metric data that hold for any subset of its seasons.
+
+    Run on each chunk of seasons as the combined file is written, and
+    reported by `validate_league_metric`, or on the whole data by
+    `validate_combined`, which both add the season continuity.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Combined data, or some of its seasons, with the 'season_start' column.
+
+    Returns
+    -------
+    list
+        Results of the schema, unique key, non-negative count and season label checks.
+    """
+    with stage("validate", rows_in=len(df)):
+        counts = [column for column in COUNT_COLUMNS if column in df]
+        schema = dict(COMBINED_SCHEMA, **{column: "integer" for column in counts})
+        if not counts:
+            schema["Goals"] = "integer"
+        checks = [check_schema(df, schema)]
+        if not checks[0]["passed"]:
+            # Later checks need the columns, so stop at the first failure
+            return checks
+        return checks + [
+            check_unique(df, ["Player", "Country", "Team", "season_start"]),
+            check_non_negative(df, counts),
+            check_season_labels(df),
+        ]
+
+
+def merge_checks(check_lists):
+    """
+    Merge the results of the same checks run on several chunks of a dataset.
+
+    Parameters
+    ----------
+    check_lists : list
+        Lists of check results, one per chunk.
+
+    Returns
+    -------
+    list
+        One result per check, summing failures and CPU time and keeping the
+        first examples.
+    """
+    merged = {}
+    for checks in check_lists:
+        for check in checks:
+            total = merged.setdefault(check["check"], check_result(check["check"], 0))
+            total["failures"] += check["failures"]
+            total["passed"] = total["failures"] == 0
+            total["examples"] = (total["examples"] + check["examples"])[:MAX_EXAMPLES]
+            total["cpu_seconds"] += check["cpu_seconds"]
+    return list(merged.values())
+
+
+def build_report(dataset, rows, checks, report_dir=REPORT_DIR):
+    """
+    Save the report of a dataset's checks as JSON, and raise if any check failed.
+
+    The report is written before raising, so it holds the failures that
+    stopped the pipeline.
+
+    Parameters
+    ----------
+    dataset : str
+        Name of the dataset (e.g., "premier_league_goals").
+    rows : int
+        Rows checked.
+    checks : list
+        Check results.
+    report_dir : str, optional
+        Directory of the reports (default is "data/validation"), or None to not save it.
+
+    Returns
+    -------
+    dict
+        'dataset', 'rows', 'passed', 'cpu_seconds', 'checks' and 'path'.
+
+    Raises
+    ------
+    ValidationError
+        If any check failed.
+    """
+    report = {
+        "dataset": dataset,
+        "rows": int(rows),
+        "passed": all(check["passed"] for check in checks),
+        "cpu_seconds": sum(check["cpu_seconds"] for check in checks),
+        "checks": checks,
+        "path": None,
+    }
+    if report_dir is not None:
+        os.makedirs(report_dir, exist_ok=True)
+        report["path"] = os.path.join(report_dir, f"{dataset}.json")
+        temp_path = f"{report['path']}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(report, file, indent=2)
+        os.replace(temp_path, report["path"])
+    if not report["passed"]:
+        raise ValidationError(report)
+    return report
+
+
+def validate_combined(df, dataset, report_dir=REPORT_DIR):
+    """
+    Check a league metric's combined data and save the report.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Combined data with the 'season_start' column, as returned by `combine_csvs`.
+    dataset : str
+        Name of the league metric (e.g., "premier_league_goals").
+    report_dir : str, optional
+        Directory of the reports (default is "data/validation"), or None to not save it.
+
+    Returns
+    -------
+    dict
+        The report from `build_report`.
+
+    Raises
+    ------
+    ValidationError
+        If any check failed.
+    """
+    checks = combined_checks(df)
+    if "season_start" in df:
+        checks.append(check_season_continuity(df["season_start"]))
+    return build_report(dataset, len(df), checks, report_dir)
+
+
+def validate_league_metric(league_metric, combined, report_dir=REPORT_DIR):
+    """
+    Save the report of the checks run on a league metric's seasons as they were combined.
+
+    The combine checks each chunk of seasons while it is in memory, so this
+    stage reports on the combined data without reading it again.
+
+    Parameters
+    ----------
+    league_metric : str
+        Name of the league metric (e.g., "premier_league_goals").
+    combined : dict
+        The 'rows' and 'checks' returned by `combine_save_csvs`.
+    report_dir : str, optional
+        Directory of the reports (default is "data/validation"), or None to not save it.
+
+    Returns
+    -------
+    dict
+        The report from `build_report`.
+
+    Raises
+    ------
+    ValidationError
+        If any check failed.
+    """
+    return build_report(league_metric, combined["rows"], combined["checks"], report_dir)
+
+
+def validate_joined(df, dataset=JOINED_NAME, report_dir=REPORT_DIR):
+    """
+    Check the joined Premier League and Championship data and save the report.
+
+    Works on the output of `join_pl_champ_data` and on the formatted data,
+    in default or compact dtypes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The joined data.
+    dataset : str, optional
+        Name of the dataset (default is "premier_league_championship_joined").
+    report_dir : str, optional
+        Directory of the reports (default is "data/validation"), or None to not save it.
+
+    Returns
+    -------
+    dict
+        The report from `build_report`.
+
+    Raises
+    ------
+    ValidationError
+        If any check failed.
+    """
+    with stage("validate", rows_in=len(df)):
+        checks = [check_schema(df, JOINED_SCHEMA)]
+        if checks[0]["passed"]:
+            checks += [
+                check_unique(df, JOINED_KEYS),
+                check_non_negative(
+                    df,
+                    [
+                        column
+                        for column, kind in JOINED_SCHEMA.items()
+                        if kind == "number"
+                    ],
+                ),
+                check_season_lag(df),
+                check_season_continuity(df["Season Start (PL)"]),
+                check_promoted_teams(df),
+            ]
+    return build_report(dataset, len(df), checks, report_dir)
@@ -0,0 +1,220 @@
+import functools
+import hashlib
+import html
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def render_season_page(df, metric):
+    """
+    Render a season's data as a worldfootball.net style HTML page.
+
+    The page wraps a `standard_tabelle` table in the navigation, scripts and
+    secondary tables of a real page so parsing cost is representative.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Season data with 'Player', 'Country', 'Team' and 'Goals' or 'Assists' columns.
+    metric : str
+        Either 'goals' or 'assists'.
+
+    Returns
+    -------
+    str
+        The HTML content of the page.
+    """
+    value_header = "Goals (Penalty)" if metric == "goals" else "Assists"
+    value_column = "Goals" if metric == "goals" else "Assists"
+
+    rows = []
+    for position, row in enumerate(df.itertuples(index=False), start=1):
+        player = html.escape(str(row.Player))
+        country = html.escape(str(row.Country))
+        team = html.escape(str(row.Team))
+        value = getattr(row, value_column)
+        if metric == "goals":
+            value = f"{value} ({position % 4})"
+        rows.append(
+            f'<tr>\n<td class="hell"><b>{position}.</b></td>\n'
+            f'<td class="hell"><a href="/player_summary/{position}/" title="{player}">{player}</a></td>\n'
+            f'<td class="hell"><img src="/flags/{position}.png" alt="{country}" /></td>\n'
+            f'<td class="hell">{country}</td>\n'
+            f'<td class="hell"><a href="/teams/{position}/"><img src="/logos/{position}.gif" /></a>\n'
+            f'<a href="/teams/{position}/" title="{team}">{team}</a></td>\n'
+            f'<td class="hell" align="center"><b>{value}</b></td>\n</tr>'
+        )
+
+    navigation = "\n".join(
+        f'<li><a href="/competition/{i}/">Competition {i}</a></li>' for i in range(300)
+    )
+    fixtures = "\n".join(
+        f'<tr><td class="dunkel">{i}</td><td class="dunkel"><a href="/report/{i}/">Home {i}</a></td>'
+        f'<td class="dunkel"><a href="/report/{i}/">Away {i}</a></td><td class="dunkel">{i % 5}:{i % 3}</td></tr>'
+        for i in range(200)
+    )
+    script = "var config = {" + ", ".join(f'"k{i}": {i}' for i in range(500)) + "};"
+
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<title>Top scorers</title>\n"
+        f'<script type="text/javascript">{script}</script>\n</head>\n<body>\n'
+        f'<div id="navi"><ul>{navigation}</ul></div>\n'
+        '<div class="box"><table class="standard_tabelle" cellpadding="3" cellspacing="1">\n'
+        f"<tr>\n<th>#</th><th>Player</th><th></th><th></th><th>Team</th><th>{value_header}</th>\n</tr>\n"
+        + "\n".join(rows)
+        + "\n</table></div>\n"
+        f'<div class="box"><table class="standard_tabelle">{fixtures}</table></div>\n'
+        "</body>\n</html>\n"
+    )
+
+
+def load_season_pages(league_metric, data_dir="data"):
+    """
+    Render a page for every per-season CSV of a league metric.
+
+    Parameters
+    ----------
+    league_metric : str
+        The league metric directory name (e.g., "premier_league_goals").
+    data_dir : str, optional
+        Root data directory (default is "data").
+
+    Returns
+    -------
+    dict
+        Season strings mapped to rendered HTML pages, in season order.
+    """
+    metric = league_metric.rsplit("_", 1)[-1]
+    combined = pd.read_csv(
+        f"{data_dir}/{league_metric}/combined_seasons/{league_metric}.csv"
+    )
+    return {
+        season: render_season_page(season_df, metric)
+        for season, season_df in combined.groupby("Season", sort=True)
+    }
+
+
+def start_stub_server(pages, latency=0.05, faults=None, stall=1.0):
+    """
+    Start a local HTTP server serving pre-rendered pages with a fixed latency.
+
+    Responses carry an ETag and conditional requests with a matching
+    If-None-Match get a 304. The number of requests received is kept in the
+    server's `request_count` attribute, and per path in `path_counts`.
+
+    Parameters
+    ----------
+    pages : dict
+        URL paths mapped to HTML content.
+    latency : float, optional
+        Seconds to wait before each response, simulating a remote server (default is 0.05).
+    faults : dict, optional
+        URL paths mapped to lists of faults injected into their first requests,
+        one per request in order: an HTTP status code to answer with, or
+        "timeout" to stall for `stall` seconds before answering. The list is
+        consumed as requests arrive, so later requests are served normally.
+    stall : float, optional
+        Seconds a "timeout" fault waits before answering (default is 1.0).
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The running server. Call `shutdown()` when finished.
+    """
+    faults = {path: list(path_faults) for path, path_faults in (faults or {}).items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with server.lock:
+                server.request_count += 1
+                server.path_counts[self.path] = server.path_counts.get(self.path, 0) + 1
+                path_faults = faults.get(self.path)
+                fault = path_faults.pop(0) if path_faults else None
+            time.sleep(latency)
+            if fault == "timeout":
+                time.sleep(stall)
+            elif fault is not None:
+                self.send_response(fault)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = pages.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            content = body.encode("utf-8")
+            etag = '"' + hashlib.md5(content).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            try:
+                self.wfile.write(content)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up waiting on a stalled response
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.request_count = 0
+    server.path_counts = {}
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture(scope="session")
+def season_pages():
+    """
+    Pages rendered from the committed combined CSVs, by league metric.
+
+    Returns
+    -------
+    callable
+        Takes a league metric name and returns `load_season_pages` for it,
+        rendered once per test session.
+    """
+    return functools.cache(
+        lambda league_metric: load_season_pages(
+            league_metric, data_dir=os.path.join(ROOT, "data")
+        )
+    )
+
+
+@pytest.fixture
+def stub_server():
+    """
+    Start stub servers with `start_stub_server`, shut down after the test.
+
+    Returns
+    -------
+    callable
+        Takes the arguments of `start_stub_server` and returns the running server.
+    """
+    servers = []
+
+    def start(pages, **kwargs):
+        server = start_stub_server(pages, **kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,60 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pytest
+
+from src.cli import JOINED_PATH, LEAGUE_METRICS, main
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+@pytest.fixture
+def data_copy(tmp_path, monkeypatch):
+    # The config and the combined CSVs, without the player IDs or joined CSV
+    shutil.copytree(os.path.join(ROOT, "conf"), tmp_path / "conf")
+    for league_metric in LEAGUE_METRICS:
+        shutil.copytree(
+            os.path.join(ROOT, "data", league_metric, "combined_seasons"),
+            tmp_path / "data" / league_metric / "combined_seasons",
+        )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run(*argv):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main(list(argv))
+    with open(JOINED_PATH, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("compact", [[], ["--compact"]], ids=["default", "compact"])
+def test_format_subcommand_matches_join(data_copy, compact):
+    with open(os.path.join(ROOT, JOINED_PATH), "rb") as file:
+        expected = file.read()
+
+    assert run("join", *compact) == expected
+    os.remove(JOINED_PATH)
+
+    # The unformatted join is saved without writing the joined CSV
+    with contextlib.redirect_stdout(io.StringIO()):
+        main(["join", "--unformatted", *compact])
+    assert not os.path.exists(JOINED_PATH)
+    assert run("format") == expected
+
+
+def test_join_only_builds_cubes_and_caches_when_asked(data_copy):
+    run("join")
+    assert not os.path.exists("data/aggregates")
+    assert not os.path.exists("data/stage_cache")
+
+    run("join", "--cubes", "--cache")
+    assert os.listdir("data/aggregates")
+    assert os.listdir("data/stage_cache")
+
+
+def test_unformatted_needs_the_pandas_join(data_copy):
+    with pytest.raises(ValueError):
+        main(["join", "--unformatted", "--backend", "polars"])
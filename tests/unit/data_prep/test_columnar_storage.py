@@ -0,0 +1,45 @@
+import os
+import shutil
+
+import pandas as pd
+
+from src.data_preperation.columnar_storage import (
+    league_metric_dataset_path,
+    read_league_metric,
+    write_league_metric_parquet,
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+LEAGUE_METRIC = "championship_assists"
+
+
+def partitions(root):
+    return sorted(os.listdir(league_metric_dataset_path(LEAGUE_METRIC, root=root)))
+
+
+def test_rewrite_drops_removed_seasons_and_skips_empty_ones(tmp_path):
+    data_dir = tmp_path / "data"
+    directory_path = data_dir / LEAGUE_METRIC
+    shutil.copytree(
+        os.path.join(ROOT, "data", LEAGUE_METRIC),
+        directory_path,
+        ignore=shutil.ignore_patterns("combined_seasons"),
+    )
+    root = str(tmp_path / "parquet")
+    write_league_metric_parquet(LEAGUE_METRIC, data_dir=str(data_dir), root=root)
+    seasons = partitions(root)
+    assert len(seasons) == len(os.listdir(directory_path))
+
+    # The first season is removed and the latest has no rows
+    first, *_, latest = sorted(os.listdir(directory_path))
+    os.remove(directory_path / first)
+    pd.read_csv(directory_path / latest).head(0).to_csv(
+        directory_path / latest, index=False
+    )
+    write_league_metric_parquet(LEAGUE_METRIC, data_dir=str(data_dir), root=root)
+
+    assert partitions(root) == seasons[1:-1]
+    df = read_league_metric(LEAGUE_METRIC, compact=False, root=root)
+    assert sorted(df["season_start"].unique()) == [
+        int(season.split("=")[1]) for season in seasons[1:-1]
+    ]
@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+
+from src.data_preperation import html_archive, load_pl_championship_data
+from src.data_preperation.html_archive import HTMLArchive
+from src.data_preperation.load_pl_championship_data import get_all_season_data
+
+PAGE = (
+    '<html><body><table class="standard_tabelle">'
+    "<tr><th>#</th><th>Player</th><th></th><th>Country</th><th>Team</th>"
+    "<th>Goals</th></tr>"
+    "<tr><td>1.</td><td>{player}</td><td></td><td>England</td><td>Leeds</td>"
+    "<td>{goals} (3)</td></tr>"
+    "</table></body></html>"
+)
+
+
+def archive_pages(archive_dir):
+    archive = HTMLArchive(archive_dir)
+    for season, player in [("1999-2000", "Alan Smith"), ("2000-2001", "Mark Viduka")]:
+        # Records several scan chunks long, then a changed page appended again
+        html = PAGE.format(player=player, goals=10) + "<!--" + "x" * 10**5 + "-->"
+        archive.append("premier_league", "goals", season, f"/{season}/", html)
+    archive.append(
+        "premier_league",
+        "goals",
+        "1999-2000",
+        "/1999-2000/",
+        PAGE.format(player="Alan Smith", goals=11),
+    )
+    return archive
+
+
+def test_scan_matches_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_archive, "SCAN_CHUNK_SIZE", 16)
+    archive = archive_pages(tmp_path)
+    assert archive.scan() == archive.entries
+    assert len(archive.pages()) == 2
+
+    # A record cut short and a lost index are recovered by scanning
+    size = os.path.getsize(archive.pages_path)
+    with open(archive.pages_path, "rb") as file:
+        start = file.read(100)
+    with open(archive.pages_path, "ab") as file:
+        file.write(start)
+    os.remove(archive.index_path)
+    reopened = HTMLArchive(tmp_path)
+    assert os.path.getsize(archive.pages_path) == size
+    assert reopened.entries == archive.entries
+    assert "11 (3)" in reopened.read("premier_league", "goals", "1999-2000")
+
+
+def test_sequential_scrape_archives_pages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/premier_league_goals")
+    monkeypatch.setattr(
+        load_pl_championship_data,
+        "fetch_html",
+        lambda url, **kwargs: PAGE.format(player="Alan Smith", goals=10),
+    )
+    archive = HTMLArchive("data/html_archive")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        get_all_season_data(
+            {"1999-2000": "/1999-2000/"},
+            league="premier_league",
+            metric="goals",
+            sleep_time=0,
+            archive=archive,
+        )
+
+    assert [page["season"] for page in archive.pages()] == ["1999-2000"]
+    assert os.path.exists("data/premier_league_goals/1999-2000.csv")
@@ -0,0 +1,26 @@
+import json
+
+from src.data_preperation.http_cache import HTTPCache
+
+
+def test_read_returns_none_for_an_evicted_url(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path), max_bytes=10)
+    cache.store("http://host/a", "<html>a</html>")
+    assert cache.read("http://host/a") == "<html>a</html>"
+
+    # Storing a second page over the size cap evicts the first
+    cache.store("http://host/b", "<html>b</html>")
+    assert cache.read("http://host/a") is None
+    assert cache.read("http://host/b") == "<html>b</html>"
+
+
+def test_hits_are_written_to_the_index_on_flush(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path))
+    cache.store("http://host/a", "<html>a</html>")
+    cache.read("http://host/a", permanent=True)
+
+    with open(cache.index_path, "r") as file:
+        assert not json.load(file)["http://host/a"]["permanent"]
+    cache.flush()
+    with open(cache.index_path, "r") as file:
+        assert json.load(file)["http://host/a"]["permanent"]
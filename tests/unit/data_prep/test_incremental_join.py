@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.cli import JOINED_PATH, LEAGUE_METRICS, combine, join, load_rename_lookup
+from src.data_preperation import incremental_join
+from src.data_preperation.incremental_join import update_joined_data
+from src.data_preperation.player_ids import PlayerIds
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+@pytest.fixture
+def data_copy(tmp_path, monkeypatch):
+    # The config, season CSVs, combined CSVs and joined CSV
+    shutil.copytree(os.path.join(ROOT, "conf"), tmp_path / "conf")
+    for league_metric in LEAGUE_METRICS:
+        shutil.copytree(
+            os.path.join(ROOT, "data", league_metric), tmp_path / "data" / league_metric
+        )
+    shutil.copy(os.path.join(ROOT, JOINED_PATH), tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def edit_season(path, column):
+    season = pd.read_csv(path)
+    season.assign(**{column: season[column] + 1}).to_csv(path, index=False)
+
+
+def test_incremental_join_matches_full_join(data_copy, monkeypatch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        # The first incremental join joins every season and saves the manifest
+        join(incremental=True)
+
+        edit_season("data/premier_league_goals/2010-2011.csv", "Goals")
+        edit_season("data/championship_assists/2015-2016.csv", "Assists")
+        combine(parquet=False)
+
+        affected = []
+        affected_seasons = incremental_join.affected_seasons
+
+        def record(old, new):
+            affected.append(affected_seasons(old, new))
+            return affected[-1]
+
+        monkeypatch.setattr(incremental_join, "affected_seasons", record)
+        df, _ = update_joined_data(
+            load_rename_lookup(), player_ids=PlayerIds("data/player_ids.csv")
+        )
+
+        join(cache=False)
+
+    # The Championship season is joined with the next Premier League season
+    assert affected == [[2010, 2016]]
+    with open(JOINED_PATH, "rb") as file:
+        expected = file.read()
+    assert df.to_csv(index=False).encode("utf-8") == expected
+    with open(os.path.join(ROOT, JOINED_PATH), "rb") as file:
+        assert expected != file.read()
@@ -0,0 +1,46 @@
+import pytest
+
+from src.data_preperation import instrumentation
+from src.data_preperation.instrumentation import stage, summarize, trace_setting
+
+
+@pytest.fixture
+def recording():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "false", "False", "no", "off"])
+def test_trace_setting_off(value):
+    assert trace_setting(value) == (False, None)
+
+
+@pytest.mark.parametrize("value", ["1", "true", "YES", "on"])
+def test_trace_setting_summary_only(value):
+    assert trace_setting(value) == (True, None)
+
+
+def test_trace_setting_path():
+    assert trace_setting("join.trace.json") == (True, "join.trace.json")
+
+
+def test_nested_stage_of_the_same_name_is_counted_once(recording):
+    @stage("combine")
+    def inner():
+        return None
+
+    @stage("combine")
+    def outer():
+        with stage("validate"):
+            inner()
+
+    outer()
+    rows = {row["name"]: row for row in summarize()}
+    assert rows["combine"]["calls"] == 1
+    assert rows["validate"]["calls"] == 1
+    # Every stage is still recorded
+    nested = [record["nested"] for record in instrumentation.records()]
+    assert nested == [True, False, False]
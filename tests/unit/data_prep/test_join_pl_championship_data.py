@@ -0,0 +1,162 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    fill_missing_values,
+    format_joined_data,
+    format_player_season,
+    format_season,
+    group_data,
+    join_pl_champ_data,
+    process_league_data,
+    read_combined_csv,
+    rename_duplicated_players,
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def combined_path(league_metric):
+    return os.path.join(
+        ROOT, "data", league_metric, "combined_seasons", f"{league_metric}.csv"
+    )
+
+
+@pytest.fixture(scope="module")
+def duplicated_player_names():
+    with open(os.path.join(ROOT, "conf", "duplicated_player_names.yaml"), "r") as file:
+        return yaml.safe_load(file)
+
+
+def rename_duplicated_players_loop(df, duplicated_player_names):
+    # The previous rename: one full-column comparison per config entry
+    for player_info in duplicated_player_names:
+        condition = (df["Player"] == player_info["Player"]) & (
+            df["Team"] == player_info["Team"]
+        )
+        df.loc[condition, "Player"] = player_info["Rename"]
+    return df
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["default", "compact"])
+@pytest.mark.parametrize(
+    "league_metric", ["premier_league_goals", "championship_goals"]
+)
+def test_rename_lookup_matches_loop(duplicated_player_names, league_metric, compact):
+    df = read_combined_csv(combined_path(league_metric), compact=compact)
+    # The config, every player of a few teams, and a pair not in the data
+    pairs = df.loc[df["Team"].isin(df["Team"].unique()[:3]), ["Player", "Team"]]
+    renames = duplicated_player_names + [
+        {"Player": player, "Team": team, "Rename": f"{player} ({team})"}
+        for player, team in pairs.drop_duplicates().itertuples(index=False)
+    ]
+    renames.append({"Player": "No Such Player", "Team": "Leeds", "Rename": "Nobody"})
+
+    expected = rename_duplicated_players_loop(df.copy(), renames)
+    for lookup in [renames, build_rename_lookup(renames)]:
+        renamed = rename_duplicated_players(df.copy(), lookup)
+        pd.testing.assert_frame_equal(renamed, expected)
+    assert not expected["Player"].equals(df["Player"])
+
+
+def group_data_lambda(merged_df):
+    # The previous aggregation, joining each group's teams with a Python lambda
+    return (
+        merged_df.groupby(["Player", "Season", "Country", "season_start"])
+        .agg(
+            {
+                "Team": lambda x: " / ".join(sorted(set(x))),
+                "Assists": "sum",
+                "Goals": "sum",
+            }
+        )
+        .reset_index()
+    )
+
+
+@pytest.mark.parametrize("league", ["premier_league", "championship"])
+def test_group_data_matches_lambda(league):
+    goals_df = read_combined_csv(combined_path(f"{league}_goals"))
+    assists_df = read_combined_csv(combined_path(f"{league}_assists"))
+    # Some players also appear for a second team in the same season
+    moved = goals_df.iloc[::50].assign(Team=np.roll(goals_df["Team"].iloc[::50], 1))
+    merged_df = fill_missing_values(
+        pd.merge(
+            pd.concat([goals_df, moved], ignore_index=True),
+            assists_df,
+            on=["Player", "Country", "Team", "Season", "season_start"],
+            how="outer",
+        )
+    )
+
+    expected = group_data_lambda(merged_df)
+    assert expected["Team"].str.contains(" / ").any()
+    pd.testing.assert_frame_equal(group_data(merged_df), expected)
+
+
+def join_leagues(duplicated_player_names, compact):
+    processed = {
+        league: process_league_data(
+            goals_df=read_combined_csv(
+                combined_path(f"{league}_goals"), compact=compact
+            ),
+            assists_df=read_combined_csv(
+                combined_path(f"{league}_assists"), compact=compact
+            ),
+            duplicated_player_names=duplicated_player_names,
+        )
+        for league in ["premier_league", "championship"]
+    }
+    return join_pl_champ_data(
+        pl_df=processed["premier_league"], champ_df=processed["championship"]
+    )
+
+
+def format_joined_data_rowwise(pl_champ_merged):
+    # The previous formatting, with `apply` per element and per row
+    pl_champ_merged.loc[
+        pl_champ_merged["Season Start (Champ.)"] < 2014, "Assists (Champ.)"
+    ] = None
+    pl_champ_merged["Season (PL)"] = pl_champ_merged["Season (PL)"].apply(format_season)
+    pl_champ_merged["Season (Champ.)"] = pl_champ_merged["Season (Champ.)"].apply(
+        format_season
+    )
+    pl_champ_merged["Player (PL Season) - Full Name"] = (
+        pl_champ_merged["Player"] + " (" + pl_champ_merged["Season (PL)"] + ")"
+    )
+    pl_champ_merged["Player (PL Season)"] = pl_champ_merged.apply(
+        format_player_season, axis=1
+    )
+    pl_champ_merged = pl_champ_merged.sort_values(["Season Start (PL)", "Player"])
+    pl_champ_merged["Team (PL)"] = pl_champ_merged["Team (PL)"].str.rstrip(" FC")
+    pl_champ_merged["Team (Champ.)"] = pl_champ_merged["Team (Champ.)"].str.rstrip(
+        " FC"
+    )
+    return pl_champ_merged
+
+
+@pytest.fixture(scope="module")
+def joined(duplicated_player_names):
+    return join_leagues(duplicated_player_names, compact=False)
+
+
+def test_vectorized_format_matches_rowwise(joined):
+    expected = format_joined_data_rowwise(joined.copy())
+    pd.testing.assert_frame_equal(format_joined_data(joined.copy()), expected)
+
+    joined_path = os.path.join(ROOT, "data", "premier_league_championship_joined.csv")
+    with open(joined_path, "r") as file:
+        assert expected.to_csv(index=False) == file.read()
+
+
+def test_compact_join_matches_default(duplicated_player_names, joined):
+    compact = join_leagues(duplicated_player_names, compact=True)
+    # Compact dtypes are expanded again when formatting, for the same output
+    pd.testing.assert_frame_equal(
+        format_joined_data(compact), format_joined_data(joined.copy())
+    )
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from src.data_preperation.load_pl_championship_data import (
+    parse_table,
+    parse_table_soup,
+)
+
+HEADERS = ["#", "Player", "Flag", "Country", "Team", "Goals"]
+
+
+def page(rows):
+    header = "<tr>" + "".join(f"<th>{header}</th>" for header in HEADERS) + "</tr>"
+    return (
+        '<html><body><table class="standard_tabelle">'
+        f"{header}{rows}</table>"
+        '<table class="standard_tabelle"><tr><td>other</td></tr></table>'
+        "</body></html>"
+    )
+
+
+def row(*cells):
+    return "<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>"
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        # A nested table inside a cell
+        page(
+            row(1, "A Player", "", "England", "Team A", 10)[:-5]
+            + "<td><table><tr><td>x</td></tr></table></td></tr>"
+            + row(2, "B Player", "", "Wales", "Team B", 8)
+        ),
+        # A cell that is never closed
+        page(
+            "<tr><td>1</td><td>A Player<td></td><td>England</td><td>Team A</td><td>10</td></tr>"
+            + row(2, "B Player", "", "Wales", "Team B", 8)
+        ),
+        # A row that is never closed
+        page(
+            row(1, "A Player", "", "England", "Team A", 10)[:-5]
+            + row(2, "B Player", "", "Wales", "Team B", 8)
+        ),
+        # A table that is never closed
+        page(row(1, "A Player", "", "England", "Team A", 10)).split("</table>")[0],
+    ],
+    ids=["nested table", "unclosed cell", "unclosed row", "unclosed table"],
+)
+def test_irregular_markup_matches_soup(html):
+    # Without headers, rows of any length are kept as BeautifulSoup finds them
+    pd.testing.assert_frame_equal(parse_table(html, None), parse_table_soup(html, None))
+
+
+@pytest.mark.parametrize(
+    "league_metric",
+    [
+        "premier_league_goals",
+        "premier_league_assists",
+        "championship_goals",
+        "championship_assists",
+    ],
+)
+def test_season_pages_match_soup(season_pages, league_metric):
+    pages = season_pages(league_metric)
+    headers = HEADERS if league_metric.endswith("goals") else HEADERS[:-1] + ["Assists"]
+    for html in list(pages.values())[:3]:
+        pd.testing.assert_frame_equal(
+            parse_table(html, headers), parse_table_soup(html, headers)
+        )
@@ -0,0 +1,56 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pytest
+
+from src.data_preperation.pipeline import JOINED_PATH, LEAGUE_METRICS, build_pipeline
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+@pytest.fixture
+def data_copy(tmp_path, monkeypatch):
+    # The config and the combined CSVs, without the player IDs or joined CSV
+    shutil.copytree(os.path.join(ROOT, "conf"), tmp_path / "conf")
+    for league_metric in LEAGUE_METRICS:
+        shutil.copytree(
+            os.path.join(ROOT, "data", league_metric, "combined_seasons"),
+            tmp_path / "data" / league_metric / "combined_seasons",
+        )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run_join(workers, compact=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_pipeline(stages=("join",), compact=compact).run(workers=workers)
+    outputs = {}
+    for path in [JOINED_PATH, "data/player_ids.csv"]:
+        with open(path, "rb") as file:
+            outputs[path] = file.read()
+        os.remove(path)
+    return outputs
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["default", "compact"])
+def test_parallel_join_matches_one_worker(data_copy, compact):
+    sequential = run_join(workers=1, compact=compact)
+    with open(os.path.join(ROOT, JOINED_PATH), "rb") as file:
+        assert sequential[JOINED_PATH] == file.read()
+
+    # Both leagues are processed at the same time, with the same player IDs
+    assert run_join(workers=4, compact=compact) == sequential
+
+
+def test_pipeline_runs_the_tasks_a_target_needs():
+    pipeline = build_pipeline(stages=("join",))
+    assert pipeline.required_tasks(["process_championship"]) == [
+        "read_premier_league_goals",
+        "read_premier_league_assists",
+        "read_championship_goals",
+        "read_championship_assists",
+        "register_players",
+        "process_championship",
+    ]
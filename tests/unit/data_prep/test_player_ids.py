@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from src.data_preperation.player_ids import PlayerIds
+
+
+def test_saved_ids_round_trip_names_pandas_reads_as_missing(tmp_path):
+    file_path = str(tmp_path / "player_ids.csv")
+    players = pd.Series(["NA", "None", "Nan", "1", "David Beckham"])
+    countries = pd.Series(["Namibia", "NULL", "N/A", "England", np.nan])
+    player_ids = PlayerIds(file_path)
+    ids = player_ids.encode(players, countries)
+    player_ids.save()
+
+    loaded = PlayerIds(file_path)
+    assert list(loaded.players) == list(players)
+    assert pd.isna(loaded.countries[-1])
+    assert list(loaded.countries[:-1]) == list(countries[:-1])
+    # The same identities keep their IDs and no new ones are added
+    assert (loaded.encode(players, countries) == ids).all()
+    assert len(loaded) == len(players)
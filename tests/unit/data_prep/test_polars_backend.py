@@ -0,0 +1,72 @@
+import os
+
+import pandas as pd
+import pytest
+import yaml
+
+from src.data_preperation.join_pl_championship_data import (
+    build_rename_lookup,
+    format_joined_data,
+    join_pl_champ_data,
+    process_league_data,
+    read_combined_csv,
+)
+
+pytest.importorskip("polars")
+
+from src.data_preperation import polars_backend  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+DATA_DIR = os.path.join(ROOT, "data")
+LEAGUE_METRICS = polars_backend.LEAGUE_METRICS
+
+
+@pytest.fixture(scope="module")
+def rename_lookup():
+    with open(os.path.join(ROOT, "conf", "duplicated_player_names.yaml"), "r") as file:
+        return build_rename_lookup(yaml.safe_load(file))
+
+
+def read_leagues(compact):
+    return {
+        league_metric: read_combined_csv(
+            os.path.join(
+                DATA_DIR, league_metric, "combined_seasons", f"{league_metric}.csv"
+            ),
+            compact=compact,
+        )
+        for league_metric in LEAGUE_METRICS
+    }
+
+
+def join_pandas(leagues, rename_lookup):
+    processed = {
+        league: process_league_data(
+            goals_df=leagues[f"{league}_goals"],
+            assists_df=leagues[f"{league}_assists"],
+            duplicated_player_names=rename_lookup,
+        )
+        for league in ["premier_league", "championship"]
+    }
+    joined = join_pl_champ_data(
+        pl_df=processed["premier_league"], champ_df=processed["championship"]
+    )
+    return format_joined_data(joined).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["default", "compact"])
+def test_polars_join_matches_pandas(rename_lookup, compact):
+    leagues = read_leagues(compact)
+    expected = join_pandas(leagues, rename_lookup)
+
+    # The same frames joined as one lazy Polars query
+    polars_df = polars_backend.collect_joined(
+        polars_backend.build_query(read_leagues(compact), rename_lookup)
+    )
+    pd.testing.assert_frame_equal(polars_df, expected)
+
+
+def test_polars_scan_matches_pandas(rename_lookup):
+    expected = join_pandas(read_leagues(compact=False), rename_lookup)
+    polars_df = polars_backend.join_league_metrics(rename_lookup, data_dir=DATA_DIR)
+    pd.testing.assert_frame_equal(polars_df, expected)
@@ -0,0 +1,49 @@
+import contextlib
+import io
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from src.data_preperation.pipeline import JOINED_PATH, write_joined
+from src.data_preperation.query_service import QueryService
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_service_reloads_a_rewritten_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data")
+    shutil.copy(os.path.join(ROOT, JOINED_PATH), JOINED_PATH)
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = QueryService(JOINED_PATH)
+        assert not service.reload_if_changed()
+
+        # An unreadable file is skipped and the previous data kept
+        df = pd.read_csv(JOINED_PATH)
+        open(JOINED_PATH, "w").close()
+        assert not service.reload_if_changed()
+        assert len(service.index) == len(df)
+
+        # The join's write is picked up by the watching thread
+        service.watch(interval=0.01)
+        player = df["Player"].iloc[0]
+        df.loc[df["Player"] == player, "Goals (PL)"] = 99
+        write_joined(df.iloc[:-10])
+        try:
+            assert wait_for(lambda: len(service.index) == len(df) - 10)
+        finally:
+            service.close()
+
+    assert {row["Goals (PL)"] for row in service.player(player)} == {99}
+    assert not os.path.exists(f"{JOINED_PATH}.tmp")
@@ -0,0 +1,191 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    RetryPolicy,
+    create_session,
+    get_all_season_data_concurrent,
+)
+from src.data_preperation.scrape_checkpoint import ScrapeCheckpoint
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+SEASONS = 8
+CHECKPOINT_PATH = "data/scrape_checkpoint.json"
+
+# Scrapes the seasons given as JSON one at a time into the working directory
+SCRAPE_SCRIPT = """
+import json
+import sys
+
+from src.data_preperation.load_pl_championship_data import (
+    HostRateLimiter,
+    create_session,
+    get_all_season_data_concurrent,
+)
+from src.data_preperation.scrape_checkpoint import ScrapeCheckpoint
+
+get_all_season_data_concurrent(
+    seasons=json.loads(sys.argv[1]),
+    league="premier_league",
+    metric="goals",
+    session=create_session(),
+    rate_limiter=HostRateLimiter(requests_per_second=1000),
+    max_workers=1,
+    checkpoint=ScrapeCheckpoint("data/scrape_checkpoint.json"),
+)
+"""
+
+
+@pytest.fixture(scope="module")
+def pages(season_pages):
+    return {
+        f"/{season}/": page
+        for season, page in list(season_pages("premier_league_goals").items())[:SEASONS]
+    }
+
+
+@pytest.fixture
+def serve(pages, stub_server):
+    def start(faults=None, stall=0.5):
+        server = stub_server(pages, latency=0.01, faults=faults, stall=stall)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        seasons = {path.strip("/"): base_url + path for path in pages}
+        return server, seasons
+
+    return start
+
+
+def scrape(seasons, retry=None, resume=False):
+    os.makedirs("data/premier_league_goals", exist_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return get_all_season_data_concurrent(
+            seasons=seasons,
+            league="premier_league",
+            metric="goals",
+            session=create_session(),
+            rate_limiter=HostRateLimiter(requests_per_second=1000),
+            retry=retry,
+            timeout=0.2,
+            checkpoint=ScrapeCheckpoint(CHECKPOINT_PATH),
+            resume=resume,
+        )
+
+
+def season_csvs(data_dir):
+    directory_path = os.path.join(data_dir, "premier_league_goals")
+    csvs = {}
+    for file_name in sorted(os.listdir(directory_path)):
+        with open(os.path.join(directory_path, file_name), "rb") as file:
+            csvs[file_name] = file.read()
+    return csvs
+
+
+@pytest.fixture
+def expected(serve, tmp_path_factory):
+    # The season CSVs scraped from a healthy server
+    _, seasons = serve()
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("healthy"))
+    try:
+        assert scrape(seasons) == []
+        return season_csvs("data")
+    finally:
+        os.chdir(cwd)
+
+
+def test_transient_errors_are_retried(serve, expected, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server, seasons = serve(
+        faults={"/1999-2000/": [503, 500], "/2001-2002/": ["timeout"]}
+    )
+
+    not_saved = scrape(seasons, retry=RetryPolicy(retries=3, base_delay=0.01, seed=0))
+
+    assert not_saved == []
+    assert server.path_counts["/1999-2000/"] == 3
+    assert server.path_counts["/2001-2002/"] == 2
+    assert server.request_count == len(seasons) + 3
+    assert season_csvs("data") == expected
+
+
+def test_killed_scrape_resumes_from_checkpoint(serve, expected, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/premier_league_goals")
+    # The fourth season stalls, so the scrape is killed while waiting for it
+    server, seasons = serve(faults={"/2002-2003/": ["timeout"]}, stall=30)
+    process = subprocess.Popen(
+        [sys.executable, "-c", SCRAPE_SCRIPT, json.dumps(seasons)],
+        env={**os.environ, "PYTHONPATH": ROOT},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while len(ScrapeCheckpoint(CHECKPOINT_PATH).pages) < 3:
+            assert process.poll() is None, "The scrape stopped before it was killed"
+            assert time.monotonic() < deadline, "The scrape saved too few seasons"
+            time.sleep(0.05)
+        while server.path_counts.get("/2002-2003/") is None:
+            assert time.monotonic() < deadline, "The stalled season was not requested"
+            time.sleep(0.05)
+    finally:
+        process.kill()
+        process.wait()
+
+    saved = sorted(ScrapeCheckpoint(CHECKPOINT_PATH).pages)
+    assert saved == [
+        f"premier_league/goals/{season}"
+        for season in ["1999-2000", "2000-2001", "2001-2002"]
+    ]
+
+    counts_before = dict(server.path_counts)
+    assert scrape(seasons, resume=True) == []
+
+    # Only the seasons the killed run did not save are requested again
+    requested = sorted(
+        path
+        for path, count in server.path_counts.items()
+        if count != counts_before.get(path)
+    )
+    assert requested == [f"/{season}/" for season in list(seasons)[3:]]
+    assert len(ScrapeCheckpoint(CHECKPOINT_PATH).pages) == len(seasons)
+    assert season_csvs("data") == expected
+
+
+def test_permanent_failures_are_recorded_not_retried_forever(
+    serve, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    server, seasons = serve(faults={"/2000-2001/": [503] * 10})
+    base_url = seasons["1999-2000"].rsplit("/", 2)[0]
+    seasons["2024-2025"] = f"{base_url}/2024-2025/"
+
+    not_saved = scrape(seasons, retry=RetryPolicy(retries=3, base_delay=0.01, seed=0))
+
+    # A missing page is not retried, and a server error stops after the retries
+    assert not_saved == ["2000-2001", "2024-2025"]
+    assert server.path_counts["/2024-2025/"] == 1
+    assert server.path_counts["/2000-2001/"] == 4
+    checkpoint = ScrapeCheckpoint(CHECKPOINT_PATH)
+    assert not checkpoint.is_done("premier_league", "goals", "2000-2001")
+    assert not checkpoint.is_done("premier_league", "goals", "2024-2025")
+    assert len(checkpoint.pages) == len(seasons) - 2
+
+
+def test_retry_waits_are_bounded_and_jittered():
+    retry = RetryPolicy(retries=6, base_delay=0.5, max_delay=4.0, seed=0)
+    for attempt in range(7):
+        delays = [retry.delay(attempt) for _ in range(1000)]
+        assert 0 <= min(delays) and max(delays) <= min(4.0, 0.5 * 2**attempt)
+        assert len(set(delays)) == len(delays)
+
+    # Retry-After is honoured up to the longest wait
+    assert retry.delay(0, retry_after=2.0) >= 2.0
+    assert retry.delay(0, retry_after=60.0) == 4.0
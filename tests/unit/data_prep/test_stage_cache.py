@@ -0,0 +1,27 @@
+import importlib
+import sys
+
+from src.data_preperation.stage_cache import source_digest
+
+
+def test_source_digest_follows_imported_modules(tmp_path, monkeypatch):
+    package = tmp_path / "stage_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "helpers.py").write_text("def clean(df):\n    return df\n")
+    (package / "stage.py").write_text(
+        "from stage_pkg.helpers import clean\n\n\ndef run(df):\n    return clean(df)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "stage_pkg", raising=False)
+    try:
+        run = importlib.import_module("stage_pkg.stage").run
+        before = source_digest(run)
+        assert source_digest(run) == before
+
+        # Only the helper module the stage imports changes
+        (package / "helpers.py").write_text("def clean(df):\n    return df.dropna()\n")
+        assert source_digest(run) != before
+    finally:
+        for name in ["stage_pkg", "stage_pkg.helpers", "stage_pkg.stage"]:
+            sys.modules.pop(name, None)